@@ -1,27 +1,6 @@
 import sys                            # This allows the user to enter command-line arguments and shuts down the program if things go wrong. 
-import matplotlib                     # I messed up the program playing with (installing) backend services and now I must manually set the backend this way. Whoops.
-from sys import platform
-if (platform == "darwin"):            # This is the operating system MacOS uses. I'm checking to see if the program is being run on a MacBook, since it has its own backend.
-    matplotlib.use("macosx")          # Use the MACOSX backend if run on a MacBook.
-    file_not_found_error = FileNotFoundError
-else:
-    if (sys.version_info[0] == 3):        # If the machine has Python 3 and above, import tkinter; if not, import Tkinter (they changed the name).
-        import tkinter as tk
-        file_not_found_error = FileNotFoundError
-    else:
-        import Tkinter as tk
-        file_not_found_error = IOError    # NOTE: "FileNotFoundError" is written as "IOError" on Python 2, so I define a variable for the error depending on the version.
-    matplotlib.use("tkagg")               # This is an interactive backend used with tkinter.
-import matplotlib.pyplot as plt       # This creates the plots and their characteristics.
-import matplotlib.dates as mdates     # This is used for plotting the x-ticks with datetimes.
-from collections import OrderedDict   # This is necessary for ordering the dataframes chronologically.
-import time                           # This is necessary for pausing the program before continuing its execution (see Part 8).
-import datetime                       # This is necessary for determining whether the files are weather data or sensor data.
-import warnings                       # This is used to disable warning messages, specifically FutureWarning and UserWarning messages.
-warnings.simplefilter(action = "ignore", category = FutureWarning)
-warnings.simplefilter(action = "ignore", category = UserWarning)
-import pandas as pd                   # This creates the dataframes used for plotting and other functionalities.
-import numpy as np                    # This allows me to perform complex calculations on Pandas objects.
+import os                             # This is used for checking that the data files exist before following them.
+from stageProfiler import profiler, profile_option   # This times each stage of the program when it's run with "--profile" (see stageProfiler.py).
 
 ''' ================================================================================================================== '''
 ''' ==================================================== OVERVIEW ==================================================== '''
@@ -70,8 +49,13 @@ stat_end = "2024-06-25 09:00:00"     # Assigned end date for statistics (will ge
 # Updating Statistics
 update_stats = T                     # Boolean telling the program whether to continue printing statistics to the screen (used mainly for updating/non-updating files)
 
+# Inside and Outside Comparison
+compare_weather = F                  # Boolean telling the program whether to print the differences between each sensor and the weather data (needs a weather file)
+weather_tolerance = "5min"           # Sensor measurements are only compared with weather measurements at most this far away in time
+plot_differences = F                 # Boolean telling the program whether to also plot the differences on a third graph under the temperatures (needs "compare_weather")
+
 # Plot Attributes
-n_desired_ticks = 10                              # Sometimes there are 11 ticks shown on the x-axis, but ultimately, we want constant and evenly-spaced ticks
+n_desired_ticks = 10                              # This is the most ticks shown on the x-axis (they're placed at round intervals, so there may be fewer)
 colors = ["cyan", "green", "yellow", "magenta"]   # List of colors for plotting
 markers = ["x", "v", "^", ".", ","]               # List of markers for plotting
 markersize = 3                                    # Size of markers plotted
@@ -120,8 +104,8 @@ def help_func():
     print("\t\tiii) \"stat_start\" cannot come after \"stat_end\"")
     print("\te) \"update_stats\" tells the program whether it should expect an updating dataset")
     print("\t\ti) If the dataset is not updating but \"update_stats\" is set to true, the statistics will be printed to the screen every 10 seconds")
-    print("\tf) \"n_desired_ticks\" is the number of x-ticks the user wants plotted on the graph")
-    print("\t\ti) If there are fewer than \"n_desired_ticks\" points in the dataset, that number of ticks will be used")
+    print("\tf) \"n_desired_ticks\" is the most x-ticks the user wants plotted on the graph")
+    print("\t\ti) The ticks are placed at round intervals (i.e. every hour or every day), so there may be fewer than \"n_desired_ticks\"")
     print("\tg) The lists colors and markers can be added to or changed as desired")
     print("\th) The markersize and linewidth can also be changed as desired, but for optimal presentation, they should be kept as they are")
     print("4) Plotting")
@@ -130,28 +114,29 @@ def help_func():
     print("\tc) Absolute humidities will always be blue with a border color that is the same as its corresponding sensor data values")
     print("\t\ti) For example, relative humidities from sensor 1 will be green while absolute humidities from sensor 1 will be blue with a green border")
     print("5) Exit out of program by closing plot and typing \"Ctrl-c\"")
-    print("\ta) Not closing plot before killing program will cause it to freeze on screen\n") 
+    print("\ta) Not closing plot before killing program will cause it to freeze on screen")
+    print("6) To only save graphs (i.e. on a server), run \"python NEW_READER BATCH [frequency] [datafile1].txt [datafile2].txt ...\"")
+    print("\ta) Saves one graph for every window of length [frequency] (i.e. \"1D\" for every day or \"6h\" for every 6 hours) to the graphs folder, then exits")
+    print("\tb) [frequency] can be left out, in which case there is one graph for every day")
+    print("\tc) Windows without any data are skipped, and \"start_date\" and \"end_date\" still limit the range if they're assigned")
+    print("\td) The graphs are saved on all the cores of the computer at once")
+    print("7) Segment folders (made by sensorData.py or weatherData.py with \"segment_length\" set, or by \"python segmentStore.py [hour or day] [datafile].txt\") can be given in place of data files")
+    print("\ta) Only the segments with data between the assigned dates are loaded")
+    print("\tb) Statistics without assigned dates then cover only the loaded segments")
+    print("8) Data files are also only read between the assigned dates (an index of each file is saved in .reader_cache the first time)")
+    print("9) If \"compare_weather\" is true, the differences between each sensor and the weather data (inside minus outside) are printed with the statistics")
+    print("\ta) Each sensor measurement is compared with the closest weather measurement, if there's one within \"weather_tolerance\"")
+    print("\tb) Absolute humidities for the weather data are calculated the same way as for the sensors")
+    print("\tc) If \"plot_differences\" is also true, the differences are plotted on a third graph under the temperatures (relative humidity and temperature on the left, absolute humidity in blue on the right)")
+    print("10) To only print the statistics (i.e. for huge files), run \"python NEW_READER.py STATS [datafile1].txt [datafile2].txt ...\" (or \"python quickStats.py [datafile1].txt ...\")")
+    print("\ta) Reads the files a piece at a time, so it doesn't need much memory, and exits after printing")
+    print("\tb) With \"STATS,\" the statistics dates from the top of this program are used; quickStats.py has its own at the top of it")
+    print("\tc) Nothing for plotting is imported, so it starts much faster")
+    print("11) To see where the time goes (i.e. if the plot is falling behind), add \"--profile\" anywhere after \"python NEW_READER.py\"")
+    print("\ta) The time spent ingesting, parsing, formatting, calculating statistics, plotting, redrawing, and saving is printed when the program exits, along with the rows ingested, bytes read, and lines rejected")
+    print("\tb) With \"--profile=[metrics file]\" instead, a line of JSON with the times and counts of each refresh is also added to [metrics file] after every refresh\n")
     sys.exit(1)
 
-''' This function is called to format data files that are in the old format. 
-For weather data, this means that a sixth column is included before the date 
-column; for sensor data, this means that an index is still included as the 
-first column and not the port number. The function is always called but 
-won't do anything if the file is already in the correct format. A caveat of 
-this function is that it will only work on specific old sensor-data files, 
-namely those that have an indication in their title about which port number 
-was used. If there is no indication, then it cannot be used on those files. 
-This function was implemented 6/25/2024. '''
-def old_file_formatter(dataframe, infile):
-    if ("-" in str(dataframe.iloc[0][1])):
-        if (len(dataframe.columns) == 6):                                                                                              # Old weather data
-            dataframe.drop(columns = dataframe.columns[0], axis = 1, inplace = True)
-        elif ((dataframe[0].astype(int).tolist()[len(dataframe[0].tolist()) - 1] - dataframe[0].astype(int).tolist()[0]) != 0):        # Old sensor data (good titles)
-            if ((("first" in str(infile)) or ("1st" in str(infile))) and (("sens" in str(infile)) or ("sensor" in str(infile)))):
-                dataframe[0] = dataframe[0].astype(int) - dataframe[0].astype(int)
-            elif ((("second" in str(infile)) or ("2nd" in str(infile))) and (("sens" in str(infile)) or ("sensor" in str(infile)))):
-                dataframe[0] = dataframe[0].astype(int) - dataframe[0].astype(int) + 1
-    
 ''' This function, implemented 6/20/2024, is meant to calculate the absolute 
 humidity in an environment based on the sensor's relative humidity and 
 temperature readings. If we can find the absolute humidity given the relative 
@@ -160,74 +145,14 @@ actually affecting the water levels in the air (i.e. if the absolute humidity
 plot is a straight line). "hum_ser" is the series of relative humidities as 
 percents, first converted to decimals, while "temp_ser" is the series of 
 temperatures, used in the calculation for saturated vapor pressure. Returned 
-is the absolute humidity in g/m^3. '''
-def abs_hum_calc(hum_ser, temp_ser):
-    h = hum_ser.astype(float) / 100
-    t = temp_ser.astype(float)
-    A, B, C = 0.611, 17.502, 240.97                                       # These are constants, where [A] = kPa and [C] = degrees Celsius (B is dimensionless)
-    sat_vapor_press = 1000 * (A * np.exp((B * t) / (C + t)))
-    air_vapor_press = h.astype(float) * sat_vapor_press.astype(float)     # This is the vapor pressure of air
-    m = 18.02                                                             # This is the molar mass of water, given in grams per mole
-    R = 8.314                                                             # This is the universal gas constant, given in terms of Joules per mole-Kelvin
-    T_K = t + 273.15                                                      # This is the temperature in Kelvin
-    H_a = (m / (R * T_K.astype(float))) * air_vapor_press.astype(float)   # This is the absolute humidity
-    return H_a.astype(float)
-
-# This function formats and sorts the columns in a dataframe. I must include "inplace = True" if I want the modifications to save.
-def df_formatter(dataframe):
-    dataframe["Date"] = dataframe["Date"].astype(str) + " " + dataframe["Time"].astype(str)        # Modify elements in "Date" column by combining elements in columns "Date" and "Time"
-    dataframe.rename(columns = {"Date": "Date and Time"}, inplace = True)                          # Rename column "Date" to "Date and Time"
-    dataframe["Date and Time"] = pd.to_datetime(dataframe["Date and Time"], errors = "coerce")     # Change elements in "Date and Time" to Pandas datetime objects
-    dataframe.drop(dataframe[dataframe["Date and Time"].isnull() == True].index, inplace = True)   # Remove any NaT values
-    dataframe.drop("Time", axis = 1, inplace = True)                                               # Remove column "Time"
-    dataframe.sort_values(by = "Date and Time", inplace = True)                                    # Sort datetime objects chronologically
-    dataframe.set_index(["Date and Time"], inplace = True)                                         # Make column "Date and Time" the new index of the dataframe
-    dataframe.dropna(inplace = True)                                                               # Removes any row where NaN appears
-    if ("Port" in dataframe.columns.tolist()):                                                     # Defines a column called "Absolute Humidity" for sensor data only
-        dataframe["Absolute Humidity"] = abs_hum_calc(dataframe["Relative Humidity"], dataframe["Temperature"])
-    dataframe["Relative Humidity"] = dataframe["Relative Humidity"].astype(float)                  # Typecasts all the relative humidity values as floats
-    dataframe["Temperature"] = dataframe["Temperature"].astype(float)                              # Typecasts all the temperature values as floats
-    if ("Precipitation" in dataframe.columns.tolist()):                                            # Defines a column called "Precipitation" for weather data only
-        dataframe["Precipitation"] = dataframe["Precipitation"].astype(float)
-    
-# This function defines the start date for plotting by comparing the corresponding indices in the dataframes in the dictionary.
-def start_func(key_list, dictionary):
-    cur_start = dictionary[key_list[0]].index.tolist()[0]                   # These variables keep track of the first data files given
-    if (len(key_list) == 1):                                                # If there is only one data file given...
-        start = dictionary[key_list[0]].index.tolist()[0]                   # ...start date is the first date in the data file 
-    else:
-        for i in range(len(key_list) - 1):                                  # Check if date in 1st occurs before 2nd
-            if (pd.Timestamp(dictionary[key_list[i]].index.tolist()[0]) < pd.Timestamp(dictionary[key_list[i + 1]].index.tolist()[0])):   
-                if (pd.Timestamp(cur_start) < pd.Timestamp(dictionary[key_list[i]].index.tolist()[0])):
-                    start = cur_start
-                else:
-                    start = dictionary[key_list[i]].index.tolist()[0]
-            else:
-                if (pd.Timestamp(cur_start) < pd.Timestamp(dictionary[key_list[i + 1]].index.tolist()[0])):
-                    start = cur_start
-                else:
-                    start = dictionary[key_list[i + 1]].index.tolist()[0]   # If not, set the other equal to "start"
-    return start                                                            # Return "start" to make this the start date
-
-# This is an analogous function to "start_func," just for the end date for plotting.
-def end_func(key_list, dictionary):
-    cur_end = dictionary[key_list[0]].index.tolist()[len(dictionary[key_list[0]].index.tolist()) - 1]
-    if (len(key_list) == 1):
-        end = dictionary[key_list[0]].index.tolist()[len(dictionary[key_list[0]].index.tolist()) - 1]
-    else:
-        for i in range(len(key_list) - 1):
-            if (pd.Timestamp(dictionary[key_list[i]].index.tolist()[len(dictionary[key_list[i]].index.tolist()) - 1]) > 
-                pd.Timestamp(dictionary[key_list[i + 1]].index.tolist()[len(dictionary[key_list[i + 1]].index.tolist()) - 1])): 
-                if (pd.Timestamp(cur_end) > pd.Timestamp(dictionary[key_list[i + 1]].index.tolist()[len(dictionary[key_list[i + 1]].index.tolist()) - 1])):
-                    end = cur_end
-                else:
-                    end = dictionary[key_list[i]].index.tolist()[len(dictionary[key_list[i]].index.tolist()) - 1]
-            else:
-                if (pd.Timestamp(cur_end) > pd.Timestamp(dictionary[key_list[i + 1]].index.tolist()[len(dictionary[key_list[i + 1]].index.tolist()) - 1])):
-                    end = cur_end
-                else:
-                    end = dictionary[key_list[i + 1]].index.tolist()[len(dictionary[key_list[i + 1]].index.tolist()) - 1]
-    return end
+is the absolute humidity in g/m^3. (10/18/2026 UPDATE: "abs_hum_calc" is 
+replaced by "add_derived" (see psychrometrics.py), which calculates the absolute 
+humidity along with the dew point and vapor pressure deficit in one pass, for 
+the weather data too. It's called in "file_formatter" and "new_line_formatter.") '''
+
+''' 10/18/2026 UPDATE: "old_file_formatter," "df_formatter," "file_formatter," 
+"stat_bounds," "statistics_placer," and "printing_stats" were moved to 
+dataFormatter.py so quickStats.py can use them without importing this program. '''
 
 # This function makes sure that, if there are assigned dates, they are in the correct format.
 def date_formatter(date):
@@ -237,19 +162,19 @@ def date_formatter(date):
         print("Assigned dates must be strings in the form YYYY-MM-DD HH:mm:ss.")
         sys.exit(1)
 
-# This tells the program whether the user wants to assign dates or if they want to use the full range of the dataset.
-def date_assigner(start, end, start_boolean, end_boolean, key_list, dictionary):
+# This tells the program whether the user wants to assign dates or if they want to use the full range of the dataset (found with "time_bounds," see timeBounds.py).
+def date_assigner(start, end, start_boolean, end_boolean, bounds_tracker):
     if ((start_boolean == False) and (end_boolean == False)):    # If both booleans are "False," use the full range
-        starter = start_func(key_list, dictionary)
-        ender = end_func(key_list, dictionary)
+        starter = bounds_tracker.start()
+        ender = bounds_tracker.end()
     elif ((start_boolean == False) and (end_boolean == True)):   # If only start_boolean == False, assign it to the assigned start date
-        starter = start_func(key_list, dictionary)
+        starter = bounds_tracker.start()
         date_formatter(end)
         ender = end
     elif ((start_boolean == True) and (end_boolean == False)):   # If only end_boolean == False, assign it to the assigned end date
         date_formatter(start)
         starter = start
-        ender = end_func(key_list, dictionary)
+        ender = bounds_tracker.end()
     else:                                                        # If both booleans are "True," assign them to their appropriate assigned dates
         date_formatter(start)
         date_formatter(end)
@@ -260,6 +185,23 @@ def date_assigner(start, end, start_boolean, end_boolean, key_list, dictionary):
         sys.exit(1)
     return (starter, ender)
 
+# This function returns the range of dates to load from the data files and segment folders: the assigned plotting dates, widened to include the assigned statistics dates (None for a side without an assigned date).
+def load_window():
+    low, high = None, None
+    if (assigned_start == True):
+        date_formatter(start_date)
+        low = pd.Timestamp(start_date)
+        if (assign_stat_start == True):
+            date_formatter(stat_start)
+            low = min(low, pd.Timestamp(stat_start))
+    if (assigned_end == True):
+        date_formatter(end_date)
+        high = pd.Timestamp(end_date)
+        if (assign_stat_end == True):
+            date_formatter(stat_end)
+            high = max(high, pd.Timestamp(stat_end))
+    return (low, high)
+
 # This function makes sure all the bounds/bound indices are appropriate and lets the user know if they aren't.
 def bound_checker(low, high):
     if (low > high):
@@ -277,12 +219,6 @@ def bounds(start, end):
     end_for_photo = str(end)[:10] + "_at_" + str(end)[(10 + 1):]
     return (start_for_title, end_for_title, start_for_photo, end_for_photo)
 
-# This function defines the bounds to use for titling the displayed statistics.
-def stat_bounds(start, end):
-    title_start = str(start)[:10] + " at " + str(start)[(10 + 1):]
-    title_end = str(end)[:10] + " at " + str(end)[(10 + 1):]
-    return (title_start, title_end)
-
 # This function defines some parameters for the axis on which I plot absolute humidity values.
 def abs_axis(axis):
     axis.yaxis.set_label_position("right")
@@ -290,47 +226,12 @@ def abs_axis(axis):
     axis.tick_params(axis = "y", labelcolor = "b")
     axis.set_ylim([0, None])
 
-# This function corrects the dates given for calculating statistics if those dates weren't given in the range of the dataset.
-def stat_date_formatter(start, end, dataframe):
-    if ((start not in dataframe.index) and (end not in dataframe.index)):   # If the given statistics dates aren't in the dataset...
-        start_indexer = dataframe.index.searchsorted(start)                 # ...search for the closest index to the given date...
-        try:
-            new_start = dataframe.index[start_indexer]                      # ...try to set the start date to be the date at that index
-        except:
-            new_start = dataframe.index[start_indexer - 1]                  # ...if the given date occurs after the final date in the dataframe, assign it to that
-        end_indexer = dataframe.index.searchsorted(end)
-        try:
-            new_end = dataframe.index[end_indexer]
-        except:
-            new_end = dataframe.index[end_indexer - 1]
-    elif (start not in dataframe.index):
-        start_indexer = dataframe.index.searchsorted(start)
-        try:
-            new_start = dataframe.index[start_indexer]
-        except:
-            new_start = dataframe.index[start_indexer - 1]
-        new_end = end
-    elif (end not in dataframe.index):
-        new_start = start
-        end_indexer = dataframe.index.searchsorted(end)
-        try:
-            new_end = dataframe.index[end_indexer]
-        except:
-            new_end = dataframe.index[end_indexer - 1]
-    else:                                                                   # If the dates are in the range, set them to the dates in the range
-        new_start = start
-        new_end = end
-    return (new_start, new_end)
-
-# This function plots the optimal range for humidities.
+# This function plots the optimal range for humidities. The lines are returned so they can be removed when the range of dates changes.
 def line_plotter(axis, line_high, line_low, start, end):
-    axis.hlines(y = line_high, xmin = start, xmax = end, colors = "y", lw = 1)
-    axis.hlines(y = line_low, xmin = start, xmax = end, colors = "y", lw = 1)
+    high_line = axis.hlines(y = line_high, xmin = pd.Timestamp(start), xmax = pd.Timestamp(end), colors = "y", lw = 1)
+    low_line = axis.hlines(y = line_low, xmin = pd.Timestamp(start), xmax = pd.Timestamp(end), colors = "y", lw = 1)
+    return [high_line, low_line]
 
-# This function defines the elements of the statistics dataframe printed to the screen.
-def statistics_placer(stat_df, num, index, series, start, end):
-    stat_df.loc[stat_df.index.tolist()[num], stat_df.columns.tolist()[index]] = str(series[str(start):str(end)].mean().round(4)) + " +/- " + str(series[str(start):str(end)].std().round(4))
-    
 # This function defines some parameters for the axis on which I plot precipitation levels from WTTR.
 def precip_axis(axis):
     axis.yaxis.set_label_position("right")
@@ -345,34 +246,178 @@ def hums_axis(axis, low_hum, high_hum, start, end, title_low_time, title_high_ti
     axis.set_ylabel("Relative Humidity (%)", color = "k")                                                 # Set y-axis label and color
     axis.tick_params(axis = "y", labelcolor = "k")                                                        # Set y-axis ticks and color
     axis.set_ylim([low_hum, high_hum])                                                                    # Set range (values are chosen in Part 5)
-    axis.set_xlim(start, end)                                                                             # Set domain (based on range of dates found in Part 5)
+    axis.set_xlim(pd.Timestamp(start), pd.Timestamp(end))                                                 # Set domain (based on range of dates found in Part 5)
     axis.set_title("Humidities from {0} to {1}".format(title_low_time, title_high_time), fontsize = 10)   # Set title using .format()
 
 # This function defines some parameters for the axis on which I plot temperatures.
-def temps_axis(axis, low_temp, high_temp, start, end, title_low_time, title_high_time, x_list, num_ticks):
+def temps_axis(axis, low_temp, high_temp, start, end, title_low_time, title_high_time, num_ticks):
     axis.set_xlabel("Date and Time")
-    axis.tick_params(axis = "x", labelsize = 8)
-    axis.xaxis.set_major_locator(mdates.SecondLocator(interval = int(len(x_list) / num_ticks)))             # Frequency of x-ticks
+    axis.tick_params(axis = "x", labelsize = 8, labelrotation = 45)
+    axis.figure.subplots_adjust(bottom = 0.2)                                                                # Leave room for the x-tick labels (pandas used to do this for us)
+    axis.xaxis.set_major_locator(mdates.AutoDateLocator(minticks = max(1, num_ticks // 2), maxticks = num_ticks))   # Frequency of x-ticks (picks a round interval like 6 hours or 2 days for the range showing)
     axis.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d\n%H:%M:%S"))                              # Format of x-ticks
     axis.set_ylabel("Temperature (\u00b0C)", color = "k")
     axis.tick_params(axis = "y", labelcolor = "k")
     axis.set_ylim([low_temp, high_temp])    
-    axis.set_xlim(start, end)
+    axis.set_xlim(pd.Timestamp(start), pd.Timestamp(end))
     axis.set_title("Temperatures from {0} to {1}".format(title_low_time, title_high_time), fontsize = 10)   
     axis.legend(loc = "best", prop = {"size": 10})                                                          # Location of legend based on data
 
-# This function simply plots the statistics dataframe. It's included for organizational purposes.
-def printing_stats(dataframe, title_start, title_end):
-    print("Mean and Standard Deviation from {0} to {1}".format(title_start, title_end))
+# This function defines some parameters for the axis on which I plot the differences between the sensors and the weather data. It goes under the temperatures ("above"), so the x-ticks are moved from that axis to this one.
+def diffs_axis(axis, above, start, end, title_low_time, title_high_time, num_ticks):
+    above.set_xlabel("")
+    above.tick_params(axis = "x", bottom = False, labelbottom = False)
+    axis.set_xlabel("Date and Time")
+    axis.tick_params(axis = "x", labelsize = 8, labelrotation = 45)
+    axis.xaxis.set_major_locator(mdates.AutoDateLocator(minticks = max(1, num_ticks // 2), maxticks = num_ticks))
+    axis.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d\n%H:%M:%S"))
+    axis.set_ylabel("RH (%) and T (\u00b0C) Difference", color = "k")
+    axis.tick_params(axis = "y", labelcolor = "k")
+    axis.set_xlim(pd.Timestamp(start), pd.Timestamp(end))
+    axis.set_title("Inside Minus Outside from {0} to {1}".format(title_low_time, title_high_time), fontsize = 10)
+    axis.legend(loc = "best", prop = {"size": 8})
+
+# This function defines some parameters for the axis on which I plot the differences in absolute humidity.
+def abs_diff_axis(axis):
+    axis.yaxis.set_label_position("right")
+    axis.set_ylabel("AH Difference (g/m\u00b3)", color = "b")
+    axis.tick_params(axis = "y", labelcolor = "b")
+
+''' This function turns the lines that were added to a data file since the 
+last refresh into formatted dataframes, one for each key in sorted_df. Every 
+line is used, not just the last one, so no data is lost when more than one line 
+is written between refreshes. Lines without the appropriate number of columns 
+(i.e. there was a timeout) are skipped, as are lines that can't be converted. 
+This function was implemented 10/18/2026. When profiling, splitting the lines 
+and making the dataframes count as the "parse" stage, the rest as the "format" 
+stage, and every line that's skipped is counted as rejected. '''
+def new_line_formatter(lines):
+    rows = {}
+    tables = {}
+    with profiler.stage("parse"):
+        for line in lines:
+            split_line = line.split(" ")
+            if (len(split_line) != 5):                                    # There will no longer be six columns
+                continue
+            if ("-" in split_line[0]):                                    # Weather data
+                key = "df{0}".format(0)
+            else:                                                         # Sensor data
+                try:
+                    key = "df{0}".format(int(split_line[0]) + 1)
+                except ValueError:
+                    continue
+            rows.setdefault(key, []).append(split_line)
+        for key in rows:
+            if (key == "df{0}".format(0)):
+                tables[key] = pd.DataFrame(rows[key], columns = ["Date", "Time", "Relative Humidity", "Temperature", "Precipitation"])
+            else:
+                tables[key] = pd.DataFrame(rows[key], columns = ["Port", "Date", "Time", "Relative Humidity", "Temperature"])
+    frames = {}
+    with profiler.stage("format"):
+        for key in tables:
+            df = tables[key]
+            try:
+                if (key == "df{0}".format(0)):
+                    df["Temperature"] = fahrenheit_to_celsius(df["Temperature"])
+                df_formatter(df)
+                add_derived(df, (measurement_dtype == np.float32))
+            except ValueError:
+                continue
+            frames[key] = df
+    profiler.count("lines rejected", len(lines) - sum([len(frames[key]) for key in frames]))
+    return frames
+
+# This function prints the differences between the sensors and the weather data like "printing_stats."
+def printing_differences(dataframe, title_start, title_end):
+    print("Inside Minus Outside (Sensor Minus Weather) from {0} to {1}".format(title_start, title_end))
     print(dataframe)
     print("=================================================================================")
 
+''' This function fills in the "differences" dataframe (see Part 7): for each
+sensor, the mean and standard deviation of each inside-minus-outside difference
+between the statistics dates, and the number of sensor measurements that had a
+weather measurement within "weather_tolerance" (see weatherAlign.py). This was
+implemented 10/18/2026. The differences come from "aligned," which already 
+keeps them up to date, so nothing is matched again when the statistics are 
+refreshed. '''
+def difference_placer(diff_df):
+    for key in aligned:
+        new_stat_start, new_stat_end = time_bounds.nearest(key, stat_start, stat_end)
+        if (new_stat_start == new_stat_end):
+            continue
+        column = "Sensor {0}".format(key[2:])
+        diff_stats = {name: aligned[key].window(name, new_stat_start, new_stat_end) for name in difference_columns.values()}
+        for j, name in enumerate(difference_columns.values()):
+            diff_df.loc[diff_df.index.tolist()[j], column] = str(np.round(diff_stats[name].average(), 4)) + " +/- " + str(np.round(diff_stats[name].std(), 4))
+        diff_df.loc[diff_df.index.tolist()[3], column] = str(diff_stats[difference_columns["Relative Humidity"]].count)   # Every matched measurement has a relative humidity difference
+
 # This function saves the plot to a PNG.
 def photo_saver(photo_start, photo_end):
-    plt.savefig("graphs/{0}_to_{1}.png".format(photo_start, photo_end))
+    with profiler.stage("save"):
+        plt.savefig("graphs/{0}_to_{1}.png".format(photo_start, photo_end))
     print("Saved to ~/BTL_humidity_code/graphs as {0}_to_{1}.png".format(photo_start, photo_end))
     print("=================================================================================")
     
+''' ================================================================================================================== '''
+''' =============================================== PART iii: IMPORTS ================================================ '''
+''' ================================================================================================================== '''
+
+''' The imports used to be at the very top of the program, so matplotlib (and 
+tkinter) and pandas were imported before the command-line arguments were even 
+looked at, which took a few seconds just to print the help or tell the user 
+they made a mistake. Now only "sys" and "os" are imported at the top. The rest 
+are imported by "import_modules" once the mode is known (see Part 9): batch 
+mode never imports tkinter, and "STATS" mode never imports matplotlib or 
+tkinter at all (see quickStats.py). The backend is still chosen before 
+matplotlib.pyplot is imported, like before. This was changed 10/18/2026. '''
+
+''' ================================================================================================================== '''
+
+def import_modules(batch_mode):
+    global matplotlib, platform, tk, file_not_found_error, plt, mdates, OrderedDict, time, datetime, warnings, pd, np, multiprocessing
+    global FileTailer, load_cached_file, SeriesStore, RollupSet, file_rollups, TimeBounds, LevelOfDetail, BlitManager, segment_files, segment_suffix
+    global load_file_window, difference_columns, StreamDifferences, add_derived, fahrenheit_to_celsius, measurement_dtype
+    global file_formatter, df_formatter, stat_bounds, statistics_placer, printing_stats, stat_rows
+    import matplotlib                     # I messed up the program playing with (installing) backend services and now I must manually set the backend this way. Whoops.
+    from sys import platform
+    if (batch_mode == True):              # Batch mode doesn't need a window, so use the Agg backend, which works on servers without a screen.
+        matplotlib.use("agg")
+        file_not_found_error = FileNotFoundError
+    elif (platform == "darwin"):          # This is the operating system MacOS uses. I'm checking to see if the program is being run on a MacBook, since it has its own backend.
+        matplotlib.use("macosx")          # Use the MACOSX backend if run on a MacBook.
+        file_not_found_error = FileNotFoundError
+    else:
+        if (sys.version_info[0] == 3):        # If the machine has Python 3 and above, import tkinter; if not, import Tkinter (they changed the name).
+            import tkinter as tk
+            file_not_found_error = FileNotFoundError
+        else:
+            import Tkinter as tk
+            file_not_found_error = IOError    # NOTE: "FileNotFoundError" is written as "IOError" on Python 2, so I define a variable for the error depending on the version.
+        matplotlib.use("tkagg")               # This is an interactive backend used with tkinter.
+    import matplotlib.pyplot as plt       # This creates the plots and their characteristics.
+    import matplotlib.dates as mdates     # This is used for plotting the x-ticks with datetimes.
+    from collections import OrderedDict   # This is necessary for ordering the dataframes chronologically.
+    import time                           # This is necessary for pausing the program before continuing its execution (see Part 8).
+    import datetime                       # This is necessary for determining whether the files are weather data or sensor data.
+    import warnings                       # This is used to disable warning messages, specifically FutureWarning and UserWarning messages.
+    warnings.simplefilter(action = "ignore", category = FutureWarning)
+    warnings.simplefilter(action = "ignore", category = UserWarning)
+    import pandas as pd                   # This creates the dataframes used for plotting and other functionalities.
+    import numpy as np                    # This allows me to perform complex calculations on Pandas objects.
+    import multiprocessing                # This is used for saving graphs on all the cores at once in batch mode (see Part 8).
+    from fileTailer import FileTailer     # This follows the data files and returns only the lines added since the last refresh (see Part 8).
+    from dataCache import load_cached_file # This quickly loads the data files into formatted dataframes, using a cache for files that haven't changed (see Part 2).
+    from seriesStore import SeriesStore   # This holds the data while the plot is updating so new lines can be added quickly (see Part 8).
+    from rollups import RollupSet, file_rollups   # These keep per-minute, per-hour, and per-day statistics of the data for the statistics and zoomed-out plots (see Parts 2 and 4).
+    from timeBounds import TimeBounds     # This keeps track of the first and last dates of the data as new lines are added (see Part 4).
+    from plotLayers import LevelOfDetail, BlitManager   # These plot only the points that can be seen at the current zoom and redraw only the lines when updating (see Parts 6 to 8).
+    from segmentStore import segment_files, segment_suffix   # This finds the segments of a segment folder that overlap the dates being plotted (see Part 1).
+    from offsetIndex import load_file_window   # This reads only the lines of a data file between the assigned dates (see Part 2).
+    from weatherAlign import difference_columns, StreamDifferences   # This compares each sensor with the weather data at the same times (see Part 7).
+    from psychrometrics import add_derived   # This calculates the absolute humidity, dew point, and vapor pressure deficit of new lines (see "new_line_formatter").
+    from compactTypes import fahrenheit_to_celsius, measurement_dtype   # These convert the weather temperatures and keep the data in small types (see "new_line_formatter").
+    from dataFormatter import file_formatter, df_formatter, stat_bounds, statistics_placer, printing_stats, stat_rows   # These format the data files and print the statistics (see dataFormatter.py).
+
 ''' ================================================================================================================== '''
 ''' ============================================= PART 1: GATHERING FILES ============================================ '''
 ''' ================================================================================================================== '''
@@ -380,38 +425,104 @@ def photo_saver(photo_start, photo_end):
 ''' This defines the files from command-line arguments in an efficient way: for
 each system argument, if the argument is a txt file, add it to the list "files";
 otherwise, tell the user that they should send the program txt files and exit. 
-If no files are given, the program will exit and tell the user its usage. ''' 
+If no files are given, the program will exit and tell the user its usage. If 
+the first argument is "BATCH," the program runs in batch mode (see Part 8), and 
+the next argument can be the length of the window for each graph. 
+
+10/18/2026 UPDATE: A segment folder (see segmentStore.py) can be given in place 
+of a data file. Only the segments that have data between the assigned dates 
+(see "load_window") are added to "files," so the rest are never read. The 
+folders are kept in "segment_folders" so new segments can be picked up in the 
+live loop (see Part 8). 
+
+10/18/2026 UPDATE: The arguments are now sorted out by "parse_arguments" before 
+anything big is imported (see Part iii), and "STATS" can be given in place of 
+"BATCH" to only print the statistics (see quickStats.py). The program itself 
+is run by "main" (see Part 9), so NEW_READER.py can be imported without 
+running it. ''' 
 
 ''' ================================================================================================================== '''
 
-files = []
-if (len(sys.argv) != 1):
-    if ((len(sys.argv) == 2) and (sys.argv[1] == "HELP")):
-        help_func()
-    for i in range(1, len(sys.argv)):        # I defined the range this way so that the i in the for loop and the i index for the system arguments matched.
-        if (sys.argv[i].endswith(".txt")):
-            files.append(sys.argv[i])
-        else:
-            print("Use the following format: python NEW_READER.py [datafile1].txt [datafile2].txt [datafile3].txt ...")
-            print("Can also be used like this: python NEW_READER.py path_to_datafiles/[filename]*")
-            print("If you need help in using this program or are running into issues, type \"python NEW_READER.py HELP\" for usage.")
-            sys.exit(1)
-else:
+# This function tells the user how to run the program and exits. It's used whenever the command-line arguments don't make sense.
+def usage_error():
     print("Use the following format: python NEW_READER.py [datafile1].txt [datafile2].txt [datafile3].txt ...")
     print("Can also be used like this: python NEW_READER.py path_to_datafiles/[filename]*")
     print("If you need help in using this program or are running into issues, type \"python NEW_READER.py HELP\" for usage.")
     sys.exit(1)
-    
-lastLine = [None] * len(files)   # Initialize a list of length len(files), all with the value None. This list is used for collecting the last lines of each data file 
-for i in range(len(files)):      # This for loop initizalizes lastLine to be the last lines of the data files before we do any updating
+
+''' This function sorts out the command-line arguments using only "sys" and 
+"os," so asking for help or making a mistake is answered right away instead of 
+after matplotlib and pandas are imported. It returns the mode ("HELP," "STATS," 
+"BATCH," or "LIVE"), the length of the window for each graph in batch mode, the 
+data files and segment folders in the order they were given, whether 
+"--profile" was given, and the metrics file given with it (see 
+stageProfiler.py). "--profile" can go anywhere in the arguments. '''
+def parse_arguments(arguments):
+    profiling, metrics_file, arguments = profile_option(arguments)
+    mode = "LIVE"
+    frequency = "1D"                             # Length of the window for each graph in batch mode (one graph per day unless another length is given)
+    first_file = 0                               # Index of the first data file in the arguments
+    if ((len(arguments) == 1) and (arguments[0] == "HELP")):
+        return ("HELP", frequency, [], profiling, metrics_file)
+    if ((len(arguments) > 0) and (arguments[0] in ["BATCH", "STATS"])):
+        mode = arguments[0]
+        first_file = 1
+        if ((mode == "BATCH") and (len(arguments) > 1) and (arguments[1].endswith(".txt") == False)):
+            frequency = arguments[1]
+            first_file = 2
+    if (len(arguments) <= first_file):
+        usage_error()
+    paths = []
+    for argument in arguments[first_file:]:
+        if (argument.endswith(".txt")):
+            if (os.path.isfile(argument) == False):                 # Make sure all the data files exist before we do any loading
+                print("Couldn't find file. Choose a file that is in the directory and has data in it.")
+                sys.exit(1)
+            paths.append(argument)
+        elif (os.path.isdir(argument) == True):
+            from segmentStore import segment_suffix                 # Only needed (and only imported) if a folder is given
+            if (argument.rstrip("/").endswith(segment_suffix) == False):
+                usage_error()
+            paths.append(argument)
+        else:
+            usage_error()
+    return (mode, frequency, paths, profiling, metrics_file)
+
+# This function turns the data files and segment folders from "parse_arguments" into the list "files" (only the segments with data between the assigned dates are included).
+def gather_files(paths):
+    global files, segment_folders, tailers, seen_segments, open_segments, closed_segments
     try:
-        with open(files[i], "r") as f:
-            lines = f.readlines()
-            lastLine[i] = lines[-1]
-    except file_not_found_error:
-        print("Couldn't find file. Choose a file that is in the directory and has data in it.")
+        pd.tseries.frequencies.to_offset(batch_frequency)
+    except ValueError:
+        print("The batch frequency must be a length of time like \"1D\" (one day) or \"6h\" (six hours).")
         sys.exit(1)
-    
+    files = []
+    segment_folders = []                         # Segment folders given instead of data files
+    seen_segments = set()                        # Every segment looked at so far, whether it was loaded or not (see Part 8)
+    open_segments = {}                           # The newest segment of each folder, which is the only one still being written to
+    closed_segments = set()                      # Segments that were replaced by a newer one and only need to be read one last time
+    window_low, window_high = load_window()
+    for path in paths:
+        if (os.path.isdir(path) == True):
+            segment_folders.append(path)
+            overlapping = segment_files(path, window_low, window_high)
+            if (len(overlapping) == 0):
+                print("No segments in {0} have data between the assigned dates.".format(path))
+                sys.exit(1)
+            files += overlapping
+            seen_segments.update([os.path.join(path, name) for name in os.listdir(path) if (name.endswith(".txt"))])
+            open_segments[path] = overlapping[-1]   # The segments are in order, so the last one is the newest
+        else:
+            files.append(path)
+    tailers = [None] * len(files)   # Initialize a list of length len(files), all with the value None. This list is used for following the new lines of each data file (see Part 2)
+
+# This function tells whether a file is a segment that's no longer being written to (every segment but the newest in its folder), so it doesn't have to be followed.
+def segment_closed(f):
+    for folder in open_segments:
+        if ((os.path.dirname(f) == os.path.dirname(open_segments[folder])) and (f != open_segments[folder])):
+            return True
+    return False
+
 ''' ================================================================================================================== '''
 ''' ================================================ PART 2: DATAFRAMES ============================================== '''
 ''' ================================================================================================================== '''
@@ -424,9 +535,12 @@ indices. In this case, I define an unsorted dictionary that simply takes all
 the data from each system argument (stored in the list "files") and makes 
 dataframes out of them based on which sensor took the data and whether the data 
 was from wttr or the sensors. It ends up becoming a dictionary of dataframes. 
+Each file's dataframe comes out of "load_cached_file" already formatted (see 
+Part 4).
 
 Some features of note here are the following:
-1) pd.read_csv([file], [separator], [header], [header names], [index indicator]) --- Reads data from txt files into a dataframe
+1) load_cached_file([file], [formatter]) --- Reads data from txt files into a formatted dataframe with the fast C engine of pd.read_csv, skipping and counting rows that are too long or incomplete (see dataLoader.py and dataCache.py)
+1a) load_file_window([file], [formatter], [start], [end]) --- Does the same, but only reads the lines between two dates (see offsetIndex.py)
 2) len(df.columns) --- Gets the number of columns in a dataframe
 3) "[string]{0}".format([int]) --- Will replace the number in curly brackets with whatever number is in the "format" function. For more than one number, use {0}, {1}, ...
 4) list(unsorted_df.keys()) --- Makes a list out of the keys in the dictionary
@@ -434,38 +548,65 @@ Some features of note here are the following:
 
 The if part of the if-else statement defines the weather data; the else part 
 defines the sensor data. Both parts contain if-else statements---if the dataframe 
-doesn't already exist, define it; if it does, add to it. '''
+doesn't already exist, define it; if it does, add to it. 
+
+10/18/2026 UPDATE: If any of the plotting dates are assigned, each file is 
+loaded with "load_file_window" instead, which uses an index of the file (built 
+the first time and extended when lines are added) to jump straight to the first 
+line it needs and stop after the last one, so the lines outside the dates (see 
+"load_window") are never parsed. Statistics without assigned dates then cover 
+only the loaded lines. A file with no lines between the dates is skipped.
+
+10/18/2026 UPDATE: The weather temperatures are converted to degrees Celsius 
+when each file is formatted (this used to be done in Part 4, see 
+"file_formatter"), and the rollups of each whole file (see rollups.py) are loaded from .reader_cache, or made and 
+saved there, so Part 4 only has to merge them. '''
 
 ''' ================================================================================================================== '''
 
-unsorted_df = {}
-for f in files:
-    try:
-        df = pd.read_csv(f, sep = "\r\n", header = None, engine = "python")          # Create a dataframe by reading the contents of the file
-        df = df[0].str.split(" ", expand = True)
-        while ((df.isnull().values.any() == True) and (df.shape[1] > 6)):            # This gets rid of any rows that are too long
-            df.drop(df.index[df.notnull().all(axis = 1)].tolist(), inplace = True)
-            df.dropna(axis = 1, how = "all", inplace = True)
-        df.dropna(axis = 0, inplace = True)                                          # This drops all the rows that aren't complete
-        old_file_formatter(df, f)                                                    # This formats any files that are in the old format to the new format
-        df.columns = [0, 1, 2, 3, 4]
-        if ("-" in str(df.iloc[0][0])):                                              # Denotes weather data
-            df.rename(columns = {0: "Date", 1: "Time",  2: "Relative Humidity", 3: "Temperature", 4: "Precipitation"}, inplace = True) 
-            if ("df{0}".format(0) not in list(unsorted_df.keys())):
-                unsorted_df["df{0}".format(0)] = df
+def load_dataframes():
+    global unsorted_df, rollup_parts
+    unsorted_df = {}
+    rollup_parts = {}   # The rollups of each file, by key (None for files that weren't loaded whole)
+    window_low, window_high = load_window()
+    for i, f in enumerate(files):
+        try:
+            with profiler.stage("ingest"):
+                if ((window_low is None) and (window_high is None)):
+                    df, n_malformed, end_offset = load_cached_file(f, file_formatter)    # Create a formatted dataframe from the contents of the file (from the cache if it's up to date)
+                else:
+                    df, n_malformed, end_offset = load_file_window(f, file_formatter, window_low, window_high)   # Only read the lines between the assigned dates
+            profiler.count("rows ingested", len(df))
+            tailers[i] = FileTailer(f, end_offset) if (segment_closed(f) == False) else None   # The live loop picks up right where loading stopped (segments that are done aren't followed)
+            if (n_malformed > 0):
+                print("Skipped {0} malformed line(s) in {1}".format(n_malformed, f))
+            if ((len(df) == 0) and ((window_low is not None) or (window_high is not None))):
+                print("No data between the assigned dates in {0}".format(f))
+                continue
+            if (len(df) == 0):
+                print("Couldn't find file. Choose a file that is in the directory and has data in it.")
+                sys.exit(1)
+            if ("Precipitation" in df.columns.tolist()):                                 # Denotes weather data
+                key = "df{0}".format(0)
             else:
-                unsorted_df["df{0}".format(0)] = pd.concat([unsorted_df["df{0}".format(0)], df])
-        else:
-            df.rename(columns = {0: "Port", 1: "Date",  2: "Time", 3: "Relative Humidity", 4: "Temperature"}, inplace = True)
-            df.drop(df[df["Relative Humidity"].astype(float) > 100].index, inplace = True)
-            if ("df{0}".format(int(df.iloc[0][0]) + 1) not in list(unsorted_df.keys())):
-                unsorted_df["df{0}".format(int(df.iloc[0][0]) + 1)] = df
+                key = "df{0}".format(int(df["Port"].iloc[0]) + 1)
+            if ((window_low is None) and (window_high is None)):
+                with profiler.stage("stats"):
+                    rollup_parts.setdefault(key, []).append(file_rollups(f, df, [column for column in df.columns.tolist() if (column != "Port")]))
             else:
-                unsorted_df["df{0}".format(int(df.iloc[0][0]) + 1)] = pd.concat([unsorted_df["df{0}".format(int(df.iloc[0][0]) + 1)], df])
-    except file_not_found_error:
-        print("Couldn't find file. Choose a file that is in the directory and has data in it.")
+                rollup_parts.setdefault(key, []).append(None)
+            if (key not in list(unsorted_df.keys())):
+                unsorted_df[key] = df
+            else:
+                with profiler.stage("ingest"):
+                    unsorted_df[key] = pd.concat([unsorted_df[key], df])
+        except file_not_found_error:
+            print("Couldn't find file. Choose a file that is in the directory and has data in it.")
+            sys.exit(1)
+    if (len(unsorted_df) == 0):
+        print("None of the files have data between the assigned dates.")
         sys.exit(1)
-        
+
 ''' ================================================================================================================== '''
 ''' ================================================ PART 3: ORDERING ================================================ '''
 ''' ================================================================================================================== '''
@@ -481,8 +622,10 @@ the sorted dictionary. '''
 
 ''' ================================================================================================================== '''
 
-sorted_df = OrderedDict(sorted(unsorted_df.items()))   # Sort the items in unsorted_df and create an OrderedDict out of them
-keys = list(sorted_df.keys())                          # List of sorted keys (used A LOT)
+def order_dataframes():
+    global sorted_df, keys
+    sorted_df = OrderedDict(sorted(unsorted_df.items()))   # Sort the items in unsorted_df and create an OrderedDict out of them
+    keys = list(sorted_df.keys())                          # List of sorted keys (used A LOT)
 
 ''' ================================================================================================================== '''
 ''' ============================================== PART 4: MORE SORTING ============================================== '''
@@ -501,6 +644,17 @@ are in chronological order. Lastly, I set the "Date and Time" column as the
 index of the dataframe. This is all done in the helper function "df_formatter," 
 which takes a dataframe as its input.
 
+10/18/2026 UPDATE: "df_formatter" is now called on each file's dataframe when 
+it's loaded in Part 2 (through "file_formatter"), and the formatted dataframes 
+are saved in a cache (see dataCache.py) so unchanged files don't have to be 
+formatted again the next time the program is run. So, all that's left to do 
+here is put the dataframes made from more than one file back in order.
+
+Also, as of 10/18/2026, I convert the weather temperatures to degrees Celsius 
+here instead of in Part 7 and put each dataframe into a store (see Part 8) and 
+a running-statistics tracker, which keeps the statistics up to date without 
+recalculating them from scratch every time new data comes in.
+
 After doing all this, I then define a new list called "date_list," which is a 
 pandas object that creates a list of datetime objects between a start and end 
 date at a given frequency (for this case, I used every second). I defined the 
@@ -508,17 +662,46 @@ start and end dates using functions called "start_func" and "end_func,"
 respectively, which take a list of keys and a dictionary and sorts finds the 
 oldest (former) or most recent (latter) dates in all the dataframes. The list 
 "date_list" denotes the x-bounds and the x-ticks on the plots. I do the same 
-with analogous functions for the statistics dates. '''
+with analogous functions for the statistics dates.
+
+10/18/2026 UPDATE: "date_list" had one entry for every second between the 
+start and end dates (over 2.5 million for a month) only so its length could be 
+used to space the x-ticks, so it's gone. The x-ticks are now placed by 
+matplotlib's AutoDateLocator in "temps_axis," which only needs the start and 
+end dates and picks round intervals (i.e. every 6 hours or every 2 days).
+
+10/18/2026 UPDATE: "start_func" and "end_func" turned every index into a list 
+to find the first and last dates, so they're replaced with "time_bounds" (see 
+timeBounds.py), which keeps the first and last dates of each dataframe as new 
+lines are added and finds the dates closest to the statistics dates with a 
+binary search (this used to be done by "stat_date_formatter").
+
+10/18/2026 UPDATE: The statistics are now kept by "rollups" (see rollups.py) 
+instead of running statistics. Each dataframe's rollups start from the rollups 
+of its files made in Part 2 (if every file was loaded whole), and are used both 
+for the statistics and for drawing the lines when zoomed out (see Parts 6 and 
+7). '''
 
 ''' ================================================================================================================== '''
 
-for i in range(len(keys)):
-    df_formatter(sorted_df[keys[i]])   # Format all the dataframes in the dictionary
-    
-start_date, end_date = date_assigner(start_date, end_date, assigned_start, assigned_end, keys, sorted_df)
-stat_start, stat_end = date_assigner(stat_start, stat_end, assign_stat_start, assign_stat_end, keys, sorted_df)
-
-date_list = pd.date_range(start_date, end_date, freq = "s")   # Pandas date range from start_date to end_date with a frequency of every second
+def sort_dataframes():
+    global stores, rollups, time_bounds, start_date, end_date, stat_start, stat_end
+    stores = {}         # This holds the data from each dataframe in arrays with extra room at the end so new lines can be added without copying everything (see seriesStore.py)
+    rollups = {}        # This keeps the per-minute, per-hour, and per-day statistics of each dataframe up to date as new lines are added (see rollups.py)
+    time_bounds = TimeBounds()   # This keeps track of the first and last dates of each dataframe (see timeBounds.py)
+    for i in range(len(keys)):
+        with profiler.stage("ingest"):
+            if (sorted_df[keys[i]].index.is_monotonic_increasing == False):   # The dataframes were formatted when they were loaded, but those made from more than one file must be put back in order
+                sorted_df[keys[i]].sort_index(kind = "stable", inplace = True)
+            stores[keys[i]] = SeriesStore.from_frame(sorted_df[keys[i]])
+            sorted_df[keys[i]] = stores[keys[i]].frame()
+        with profiler.stage("stats"):
+            prebuilt = rollup_parts[keys[i]] if (None not in rollup_parts[keys[i]]) else None
+            rollups[keys[i]] = RollupSet(stores[keys[i]], [column for column in sorted_df[keys[i]].columns.tolist() if (column != "Port")], prebuilt)
+        time_bounds.track(keys[i], stores[keys[i]])
+
+    start_date, end_date = date_assigner(start_date, end_date, assigned_start, assigned_end, time_bounds)
+    stat_start, stat_end = date_assigner(stat_start, stat_end, assign_stat_start, assign_stat_end, time_bounds)
 
 ''' ================================================================================================================== '''
 ''' ============================================ PART 5: REVISTING BOUNDS ============================================ '''
@@ -530,11 +713,13 @@ ones we defined using the functions from Part ii. '''
 
 ''' ================================================================================================================== '''
 
-bound_checker(lower_hum_bound, upper_hum_bound)
-bound_checker(lower_temp_bound, upper_temp_bound)
+def revisit_bounds():
+    global title_start_date, title_end_date, png_start_date, png_end_date, stat_title_start, stat_title_end
+    bound_checker(lower_hum_bound, upper_hum_bound)
+    bound_checker(lower_temp_bound, upper_temp_bound)
 
-title_start_date, title_end_date, png_start_date, png_end_date = bounds(start_date, end_date)
-stat_title_start, stat_title_end = stat_bounds(stat_start, stat_end)
+    title_start_date, title_end_date, png_start_date, png_end_date = bounds(start_date, end_date)
+    stat_title_start, stat_title_end = stat_bounds(stat_start, stat_end)
 
 ''' ================================================================================================================== '''
 ''' =========================================== PART 6: PLOTTING HUMIDITIES ========================================== '''
@@ -563,59 +748,73 @@ After defining the labels and axes, I configure a bunch of other things with
 the plots, including x- and y-labels, the x-ticks (which are defined as dates 
 at an interval given by the length of "date_list" divided by the number of 
 desired ticks (I end up getting one extra tick sometimes, but that is a 
-least-concern worry)), bounds for the x- and y-axes, a legend, and a plot 
+least-concern worry) (10/18/2026 UPDATE: at a round interval picked from the 
+range of dates so there are at most "n_desired_ticks" ticks)), bounds for the x- and y-axes, a legend, and a plot 
 title (all done with the helper function "hums_axis." For data-specific 
 configurations, I define things using the axis; for whole-plot configurations, 
 I define things using "plt."
 
+10/18/2026 UPDATE: Series with over 100,000 points made plotting and zooming 
+very slow, so the lines are now plotted through "lod" (see plotLayers.py), 
+which only plots the first, last, lowest, and highest point for each pixel 
+across the plot and picks them again whenever the plot is zoomed or panned. 
+The secondary axes for the absolute humidities and precipitation are made with 
+"twinx" since the lines are plotted with matplotlib directly instead of pandas.
+
 In addition to defining my graphs, I also define a new dataframe called 
 "stats," in which I display the mean and standard deviation of the humidity 
-and temperature of every data file included for a given range.  '''
-
-''' ================================================================================================================== '''
-
-# This is a dataframe used for displaying the mean and standard deviation of the humidities and temperatures of the weather data and the data from each sensor.
-columns = []
-for i in range(len(keys)):
-    if ("df{0}".format(0) in keys):
-        if ("Weather" not in columns):
-            columns.append("Weather")
-    if ("df{0}".format(int(sorted_df[keys[i]].iloc[0][0]) + 1) in keys):
-        if ("Sensor {0}".format(int(sorted_df[keys[i]].iloc[0][0]) + 1) not in columns):
-            columns.append("Sensor {0}".format(int(sorted_df[keys[i]].iloc[0][0]) + 1))
-stats = pd.DataFrame(index = ["Relative Humidity (%)", "Temperature (\u00b0C)"], columns = columns)
-
-abs_hum_definer = False                                   # This boolean helps to define the absolute-humidity axis, acting similarly to the "if (i == 0):" statement
-hums = plt.subplot(211)                                   # Define a subplot. "211" maps to "2 rows," "1 column," "1st subplot"
-for i in range(len(keys)):
-    if ("Port" in sorted_df[keys[i]].columns.tolist()):   # If we have sensor data...
-        sensor_checker = True
-        color = colors[i]
-        marker = markers[i]
-        graph_label = "Sensor {0}".format(int(sorted_df[keys[i]]["Port"][0]) + 1)
-        sorted_df[keys[i]]["Absolute Humidity"] = sorted_df[keys[i]]["Absolute Humidity"].astype(float)
-        if (abs_hum_definer == False):
-            ax_abs = sorted_df[keys[i]]["Absolute Humidity"].plot(rot = 45, marker = marker, secondary_y = True, color = color, lw = linewidth + 4, markersize = markersize + 3)
-            sorted_df[keys[i]]["Absolute Humidity"].plot(rot = 45, ax = ax_abs,  marker = marker, secondary_y = True, color = "blue", lw = linewidth, markersize = markersize)
-            abs_hum_definer = True
-        else:
-            sorted_df[keys[i]]["Absolute Humidity"].plot(rot = 45, ax = ax_abs, marker = marker, secondary_y = True, color = color, lw = linewidth + 4, markersize = markersize + 3)
-            sorted_df[keys[i]]["Absolute Humidity"].plot(rot = 45, ax = ax_abs,  marker = marker, secondary_y = True, color = "blue", lw = linewidth, markersize = markersize)
-        abs_axis(ax_abs)
-    else:                                                 # If we have weather data...
-        color = "red"
-        marker = "*"
-        graph_label = "CVille"
-    if (i == 0):                                          # This defines the axis regardless of whether only weather data or sensor data is fed to the program.
-        ax_hum = sorted_df[keys[i]]["Relative Humidity"].plot(rot = 45, color = color, marker = marker, label = graph_label, lw = linewidth, markersize = markersize)
-    else:
-        sorted_df[keys[i]]["Relative Humidity"].plot(rot = 45, color = color, marker = marker, label = graph_label, lw = linewidth, markersize = markersize)
-    line_plotter(ax_hum, optimal_high, optimal_low, start_date, end_date)
-    new_stat_start, new_stat_end = stat_date_formatter(stat_start, stat_end, sorted_df[keys[i]])
-    if (new_stat_start != new_stat_end):
-        statistics_placer(stats, 0, i, sorted_df[keys[i]]["Relative Humidity"], new_stat_start, new_stat_end)
+and temperature of every data file included for a given range. The minimum, 
+maximum, and number of points in the range are included, too.  '''
+
+''' ================================================================================================================== '''
 
-hums_axis(ax_hum, lower_hum_bound, upper_hum_bound, start_date, end_date, title_start_date, title_end_date)
+def plot_humidities():
+    global columns, stats, abs_hum_definer, ax_hum, ax_abs, lod, live_lines, optimal_lines, diff_plot
+    # This is a dataframe used for displaying the mean and standard deviation of the humidities and temperatures of the weather data and the data from each sensor.
+    columns = []
+    for i in range(len(keys)):
+        if ("df{0}".format(0) in keys):
+            if ("Weather" not in columns):
+                columns.append("Weather")
+        if ("df{0}".format(int(sorted_df[keys[i]].iloc[0][0]) + 1) in keys):
+            if ("Sensor {0}".format(int(sorted_df[keys[i]].iloc[0][0]) + 1) not in columns):
+                columns.append("Sensor {0}".format(int(sorted_df[keys[i]].iloc[0][0]) + 1))
+    stats = pd.DataFrame(index = stat_rows, columns = columns)
+
+    abs_hum_definer = False                                   # This boolean helps to define the absolute-humidity axis, acting similarly to the "if (i == 0):" statement
+    diff_plot = ((compare_weather == True) and (plot_differences == True) and ("df{0}".format(0) in keys) and (len(keys) > 1))   # Whether there's a third graph for the differences (see Part 7)
+    if (diff_plot == True):
+        plt.gcf().set_figheight(1.5 * plt.gcf().get_figheight())   # Make room for the third graph
+        plt.gcf().subplots_adjust(hspace = 0.4)
+    hums = plt.subplot(311 if (diff_plot == True) else 211)   # Define a subplot. "211" maps to "2 rows," "1 column," "1st subplot"
+    ax_hum = hums                                             # This defines the axis regardless of whether only weather data or sensor data is fed to the program.
+    lod = LevelOfDetail(plt.gcf())                            # This only plots the points that can be seen at the current zoom (see plotLayers.py)
+    live_lines = []                                           # Every line plotted, along with its key and column, so it can be updated in Part 8
+    for i in range(len(keys)):
+        times = sorted_df[keys[i]].index.values
+        if ("Port" in sorted_df[keys[i]].columns.tolist()):   # If we have sensor data...
+            sensor_checker = True
+            color = colors[i]
+            marker = markers[i]
+            graph_label = "Sensor {0}".format(int(sorted_df[keys[i]]["Port"][0]) + 1)
+            if (abs_hum_definer == False):
+                ax_abs = ax_hum.twinx()                       # The absolute humidities go on a secondary y-axis
+                abs_hum_definer = True
+            live_lines.append((keys[i], "Absolute Humidity", lod.plot(ax_abs, times, sorted_df[keys[i]]["Absolute Humidity"].to_numpy(), rollups[keys[i]].summary("Absolute Humidity"), marker = marker, color = color, lw = linewidth + 4, markersize = markersize + 3)))
+            live_lines.append((keys[i], "Absolute Humidity", lod.plot(ax_abs, times, sorted_df[keys[i]]["Absolute Humidity"].to_numpy(), rollups[keys[i]].summary("Absolute Humidity"), marker = marker, color = "blue", lw = linewidth, markersize = markersize)))
+            abs_axis(ax_abs)
+        else:                                                 # If we have weather data...
+            color = "red"
+            marker = "*"
+            graph_label = "CVille"
+        live_lines.append((keys[i], "Relative Humidity", lod.plot(ax_hum, times, sorted_df[keys[i]]["Relative Humidity"].to_numpy(), rollups[keys[i]].summary("Relative Humidity"), color = color, marker = marker, label = graph_label, lw = linewidth, markersize = markersize)))
+        with profiler.stage("stats"):
+            new_stat_start, new_stat_end = time_bounds.nearest(keys[i], stat_start, stat_end)
+            if (new_stat_start != new_stat_end):
+                statistics_placer(stats, 0, i, rollups[keys[i]].window("Relative Humidity", new_stat_start, new_stat_end))
+
+    optimal_lines = line_plotter(ax_hum, optimal_high, optimal_low, start_date, end_date)
+    hums_axis(ax_hum, lower_hum_bound, upper_hum_bound, start_date, end_date, title_start_date, title_end_date)
 
 ''' ================================================================================================================== '''
 ''' ========================================== PART 7: PLOTTING TEMPERATURES ========================================= '''
@@ -626,33 +825,83 @@ differences here are that 1) I don't need to define a separate axis for
 precipitation data, since I'm not including that data on the plot, and 2) I 
 must convert the wttr temperature data to degrees Celsius since they were 
 collected in degrees Fahrenheit. To do the latter, I apply a "lambda" 
-modification to each element in the columns containing the data. '''
+modification to each element in the columns containing the data. (As of 
+10/18/2026, this is done in "file_formatter," and the whole column is 
+converted at once with "fahrenheit_to_celsius" (see compactTypes.py).) 
+
+10/18/2026 UPDATE: If "compare_weather" is true and there's weather data, a 
+second dataframe called "differences" is printed with the statistics: the 
+inside-minus-outside differences of the relative humidity, temperature, and 
+absolute humidity of each sensor, matching each sensor measurement with the 
+closest weather measurement in time (see "difference_placer" and 
+weatherAlign.py). 
+
+10/18/2026 UPDATE: If "plot_differences" is true too, the differences are also 
+plotted on a third graph under the temperatures: the relative humidity (solid) 
+and temperature (dashed) differences of each sensor on the left axis and the 
+absolute humidity differences (blue) on the right, with a gray line at zero. 
+They're kept by "aligned" (see StreamDifferences in weatherAlign.py), which 
+only matches the newest sensor measurements again when lines are added in 
+Part 8. '''
 
 ''' ================================================================================================================== '''
 
-temps = plt.subplot(212)   # Second of two subplots. This displays below hums
-for i in range(len(keys)):
-    if ("Port" in sorted_df[keys[i]].columns.tolist()):
-        color = colors[i]
-        marker = markers[i]
-        graph_label = "Sensor {0}".format(int(sorted_df[keys[i]]["Port"][0]) + 1)
-    else:
-        color = "red"
-        marker = "*"
-        graph_label = "CVille"
-        sorted_df[keys[i]]["Temperature"] = sorted_df[keys[i]]["Temperature"].apply(lambda x: (int(x) - 32) / 1.8)
-        ax_precip = sorted_df[keys[i]]["Precipitation"].plot(rot = 45, marker = "*", secondary_y = True, color = "blue", lw = linewidth, markersize = markersize)
-        precip_axis(ax_precip)
-    if (i == 0):
-        ax_temp = sorted_df[keys[i]]["Temperature"].plot(rot = 45, color = color, marker = marker, label = graph_label, lw = linewidth, markersize = markersize)
-    else:
-        sorted_df[keys[i]]["Temperature"].plot(rot = 45, color = color, marker = marker, label = graph_label, lw = linewidth, markersize = markersize)
-    new_stat_start, new_stat_end = stat_date_formatter(stat_start, stat_end, sorted_df[keys[i]])
-    if (new_stat_start != new_stat_end):
-        statistics_placer(stats, 1, i, sorted_df[keys[i]]["Temperature"], new_stat_start, new_stat_end)
-        
-temps_axis(ax_temp, lower_temp_bound, upper_temp_bound, start_date, end_date, title_start_date, title_end_date, date_list, n_desired_ticks)
-    
+def plot_temperatures():
+    global ax_temp, ax_precip, precip_definer, differences, ax_diff, aligned, diff_lines
+    temps = plt.subplot(312 if (diff_plot == True) else 212)   # Second of two (or three) subplots. This displays below hums
+    ax_temp = temps
+    precip_definer = False     # This boolean tells Part 8 whether there's a precipitation axis
+    for i in range(len(keys)):
+        times = sorted_df[keys[i]].index.values
+        if ("Port" in sorted_df[keys[i]].columns.tolist()):
+            color = colors[i]
+            marker = markers[i]
+            graph_label = "Sensor {0}".format(int(sorted_df[keys[i]]["Port"][0]) + 1)
+        else:
+            color = "red"
+            marker = "*"
+            graph_label = "CVille"
+            ax_precip = ax_temp.twinx()                        # The precipitation goes on a secondary y-axis
+            precip_definer = True
+            live_lines.append((keys[i], "Precipitation", lod.plot(ax_precip, times, sorted_df[keys[i]]["Precipitation"].to_numpy(), rollups[keys[i]].summary("Precipitation"), marker = "*", color = "blue", lw = linewidth, markersize = markersize)))
+            precip_axis(ax_precip)
+        live_lines.append((keys[i], "Temperature", lod.plot(ax_temp, times, sorted_df[keys[i]]["Temperature"].to_numpy(), rollups[keys[i]].summary("Temperature"), color = color, marker = marker, label = graph_label, lw = linewidth, markersize = markersize)))
+        with profiler.stage("stats"):
+            new_stat_start, new_stat_end = time_bounds.nearest(keys[i], stat_start, stat_end)
+            if (new_stat_start != new_stat_end):
+                statistics_placer(stats, 1, i, rollups[keys[i]].window("Temperature", new_stat_start, new_stat_end))
+
+    temps_axis(ax_temp, lower_temp_bound, upper_temp_bound, start_date, end_date, title_start_date, title_end_date, n_desired_ticks)
+
+    differences = None   # This is a dataframe like "stats" for the differences between the sensors and the weather data (only if "compare_weather" is true)
+    aligned = {}         # This keeps the differences of each sensor up to date as new lines are added (see weatherAlign.py)
+    if ((compare_weather == True) and ("df{0}".format(0) in keys) and (len(keys) > 1)):
+        differences = pd.DataFrame(index = ["Relative Humidity Difference (%)", "Temperature Difference (\u00b0C)", "Absolute Humidity Difference (g/m\u00b3)", "Number of Matched Points"], columns = [column for column in columns if (column != "Weather")])
+        with profiler.stage("stats"):
+            for key in keys:
+                if (key != "df{0}".format(0)):
+                    aligned[key] = StreamDifferences(stores[key], stores["df{0}".format(0)], weather_tolerance)
+            difference_placer(differences)
+
+    ax_diff = None       # This is the axis for the differences between the sensors and the weather data (only if "plot_differences" is true)
+    diff_lines = []      # Every difference line plotted, along with its key and column, so it can be updated in Part 8
+    if (diff_plot == True):
+        ax_diff = plt.subplot(313)
+        ax_diff_abs = ax_diff.twinx()                          # The absolute humidities go on a secondary y-axis, like in Part 6
+        ax_diff.set_zorder(ax_diff_abs.get_zorder() + 1)       # Keep the legend in front of the absolute humidities
+        ax_diff.patch.set_visible(False)
+        ax_diff.axhline(0, color = "gray", lw = 1)             # No difference between inside and outside
+        for i in range(len(keys)):
+            if (keys[i] == "df{0}".format(0)):
+                continue
+            times = sorted_df[keys[i]].index.values
+            graph_label = "Sensor {0}".format(int(sorted_df[keys[i]]["Port"][0]) + 1)
+            diff_lines.append((keys[i], difference_columns["Relative Humidity"], lod.plot(ax_diff, times, aligned[keys[i]].column(difference_columns["Relative Humidity"]), color = colors[i], marker = markers[i], label = graph_label + " RH", lw = linewidth, markersize = markersize)))
+            diff_lines.append((keys[i], difference_columns["Temperature"], lod.plot(ax_diff, times, aligned[keys[i]].column(difference_columns["Temperature"]), color = colors[i], marker = markers[i], linestyle = "--", label = graph_label + " T", lw = linewidth, markersize = markersize)))
+            diff_lines.append((keys[i], difference_columns["Absolute Humidity"], lod.plot(ax_diff_abs, times, aligned[keys[i]].column(difference_columns["Absolute Humidity"]), color = "blue", marker = markers[i], lw = linewidth, markersize = markersize)))
+        abs_diff_axis(ax_diff_abs)
+        diffs_axis(ax_diff, ax_temp, start_date, end_date, title_start_date, title_end_date, n_desired_ticks)
+
 ''' ================================================================================================================== '''
 ''' ============================================ PART 8: DISPLAYING PLOTS ============================================ '''
 ''' ================================================================================================================== '''
@@ -660,118 +909,254 @@ temps_axis(ax_temp, lower_temp_bound, upper_temp_bound, start_date, end_date, ti
 ''' This section is used for continuously updating the plots with the updating 
 code. I first plot the data from the initial dataframes and make the plot show 
 in a nonblocking manner so code can be executed underneath it. I also pause the 
-code for one second before continuing the program. I then define a list called 
-"lastLine," which takes the value of the last line of each file. Next, I run an 
-infinite while loop, in which I clear the plots' axes so I can plot anew, and 
-open all the files given to the program from the command line. I then read each 
-line of the files, and since we're in an infinite while loop, it constantly 
-gathers any new data that was added to them. Next, I define the last line as a 
-dataframe, give it header names based on whether it was sensor or weather data, 
-and format it using "df_formatter." Lastly, I do all the things I did in Parts 
+code for one second before continuing the program. Next, I run an infinite 
+while loop, in which I ask the tailer of each file (defined in Part 1) for the 
+lines that were added since the last refresh. Only those new bytes are read, so 
+refreshing doesn't get slower as the files grow, and every new line is used 
+instead of only the last one. The new lines are turned into dataframes with 
+header names based on whether they were sensor or weather data and formatted 
+with "df_formatter" (all done in "new_line_formatter"). Then I clear the plots' 
+axes so I can plot anew. Lastly, I do all the things I did in Parts 
 6 and 7 with plotting and configuring the data. I then display the data on the 
-already created plot. 
+already created plot. (10/18/2026 UPDATE: The axes aren't cleared anymore. The 
+lines made in Parts 6 and 7 are kept in "live_lines" and given the updated data 
+with "lod.update," and the axes, ticks, titles, and optimal range are only redone 
+when the range of dates changes. If nothing but the lines changed, only the 
+lines are drawn again with "blit" (see plotLayers.py), so refreshing doesn't 
+get slower as the data grows. This also fixed the absolute humidity lines 
+piling up, since ax_abs was never cleared.) 
 
 The complications with all this are the following:
 1) I'm working with a VERY nested loop, so indentations are VERY important.
-2) I had to redefine end_date and this date_list (and the subsequent variables depending on them) since I'm adding more data. 
-3) I had to cast the values of the new dataframe as floats to use them. 
+2) I had to redefine end_date and this date_list (and the subsequent variables depending on them) since I'm adding more data. (10/18/2026 UPDATE: date_list is gone; see Part 4.) 
+3) I had to cast the values of the new dataframe as floats to use them. (10/18/2026 UPDATE: The stores in "stores" take care of this now, since their arrays already have the right types.)
 4) I'm working with different indices and keys for the appended dataframes since I'm looping over files, not keys in sorted_df.
 
-All in all, it works. And I'm glad it does. '''
+5) Adding new lines with pd.concat copied all the data every time, so I now keep the data in "stores," which leave extra room at the end of their arrays for new lines. The dataframes in sorted_df are views of the stores, so nothing is copied.
+6) The lines drawn by "blit" are left out when the figure is saved, so they're turned back into normal lines while the hourly picture is saved.
+7) New segments show up in segment folders as time goes on (i.e. every day or hour), so every refresh checks "segment_folders" for segments that aren't in "files" yet and starts following them from their first line. (10/18/2026 UPDATE: The segments already looked at are kept in a set, the manifest is only read when a new one shows up, and only the newest segment of each folder is followed, since the older ones aren't written to anymore. After weeks of hourly segments, a refresh used to check thousands of them.)
+
+All in all, it works. And I'm glad it does.
+
+10/18/2026 UPDATE: In batch mode ("python NEW_READER.py BATCH [frequency] 
+[files]"), nothing is shown and there's no live loop. Instead, the range of 
+dates is split into windows of length "batch_frequency" (one day by default), 
+and a graph is saved for every window that has data, with the same names as 
+"photo_saver" always gives them. Only the x-range, titles, and optimal range 
+change between windows, so the lines plotted in Parts 6 and 7 are reused (and 
+"lod" picks their points for each window). The graphs are saved by a pool of 
+processes, one for each core. The processes are started with "fork," so they 
+each get a copy of the figure as it is. The program exits once they're all 
+saved. 
+
+10/18/2026 UPDATE: With "--profile" (see Part 9), the time spent on each stage 
+of every refresh (reading the new lines, parsing and formatting them, updating 
+the rollups and statistics, updating the lines and axes, redrawing, and saving) 
+is kept by "profiler" (see stageProfiler.py), along with the rows ingested, 
+bytes read, and lines rejected. Loading and the first plot are the first cycle, 
+and each refresh is a cycle after that. The time it takes to draw the figure is 
+measured by "blit" (see plotLayers.py), since it happens during plt.pause. '''
 
 ''' ================================================================================================================== '''
 
-printing_stats(stats, stat_title_start, stat_title_end)   # This just prints the statistics dataframe to the screen with nice formatting
-photo_saver(png_start_date, png_end_date)                 # This saves the graph as a PNG
-plt.show(block = False)                                   # Plot the graph with nonblocking behavior so code can run while it's plotted
-try:
-    plt.pause(10)                                         # Pause the program for 10 seconds before continuing
-except KeyboardInterrupt:
-    print("\nKeyboardInterrupt")
-    sys.exit(1)
-    
-start_time = int(time.time())    # This gets the current time and will be used for saving a figure every hour
-
-while True:
+# This function saves the graph for one window of dates in batch mode. Only the x-range, titles, and optimal range change, so the lines plotted in Parts 6 and 7 are reused.
+def window_saver(window):
+    global optimal_lines
+    window_start, window_end = window
+    window_title_start, window_title_end, window_png_start, window_png_end = bounds(window_start, window_end)
+    for optimal_line in optimal_lines:
+        optimal_line.remove()
+    optimal_lines = line_plotter(ax_hum, optimal_high, optimal_low, window_start, window_end)
+    hums_axis(ax_hum, lower_hum_bound, upper_hum_bound, window_start, window_end, window_title_start, window_title_end)
+    temps_axis(ax_temp, lower_temp_bound, upper_temp_bound, window_start, window_end, window_title_start, window_title_end, n_desired_ticks)
+    if (ax_diff is not None):
+        diffs_axis(ax_diff, ax_temp, window_start, window_end, window_title_start, window_title_end, n_desired_ticks)
+    photo_saver(window_png_start, window_png_end)
+
+def display_plots():
+    global start_date, end_date, stat_start, stat_end, title_start_date, title_end_date, png_start_date, png_end_date, stat_title_start, stat_title_end, optimal_lines
+    if (batch_mode == True):
+        windows = []
+        for window_start in pd.date_range(pd.Timestamp(start_date).floor("D"), end_date, freq = batch_frequency):   # Windows line up with midnight so daily graphs are whole days
+            window_end = window_start + pd.tseries.frequencies.to_offset(batch_frequency)
+            if (time_bounds.covers(window_start, window_end) == True):                                              # Skip windows without any data
+                windows.append((window_start, window_end))
+        if ("fork" in multiprocessing.get_all_start_methods()):
+            with profiler.stage("save"):                                           # The processes time their own saving, but they can't give it back, so the time for all of them is taken here
+                with multiprocessing.get_context("fork").Pool(os.cpu_count()) as pool:   # Each process gets its own copy of the figure, so they can all save at once
+                    pool.map(window_saver, windows, chunksize = 1)
+        else:
+            for window in windows:                                                  # Without "fork," the processes can't share the figure, so save one at a time
+                window_saver(window)
+        print("Saved {0} graph(s)".format(len(windows)))
+        sys.exit(0)
+
+    printing_stats(stats, stat_title_start, stat_title_end)   # This just prints the statistics dataframe to the screen with nice formatting
+    if (differences is not None):
+        printing_differences(differences, stat_title_start, stat_title_end)
+    photo_saver(png_start_date, png_end_date)                 # This saves the graph as a PNG
+    plt.show(block = False)                                   # Plot the graph with nonblocking behavior so code can run while it's plotted
     try:
-        for i in range(len(files)):
-            with open(files[i], "r") as f:                             # Open the files...
-                lines = f.readlines()                                  # Read their lines...
-                if (lines[-1] != lastLine[i]):                         # If the last line is not equal to whatever was collected to be the last line from before...
-                    lastLine[i] = lines[-1]                            # ...set it equal to that line...
-                    split_line = lastLine[i].rstrip("\n").split(" ")   # ...format the line by eliminating the newline character and splitting between spaces...
-                    df = pd.DataFrame([split_line])                    # ...and create a new dataframe out of that line as a list
-                    try:
-                        if (len(df.columns) == 5):                     # If there are the appropriate number of columns... (there will no longer be six columns)
-                            if ("-" in str(df.iloc[0][0])):            # ...and we have weather data...
-                                df.columns = ["Date", "Time", "Relative Humidity", "Temperature", "Precipitation"]
-                                df["Temperature"] = df["Temperature"].apply(lambda x: (int(x) - 32) / 1.8)
-                                key = "df{0}".format(0)
-                            else:                                      # ...otherwise, we have sensor data
-                                df.columns = ["Port", "Date", "Time", "Relative Humidity", "Temperature"]
-                                key = "df{0}".format(int(df.iloc[0][0]) + 1)
-                            df_formatter(df)                           # Format the dataframe as before and then add it to the appropriate dataframe in sorted_df
-                            sorted_df[key] = pd.concat([sorted_df[key], df])
-                        else:                                          # If we don't have the appropriate number of columns (i.e. there was a timeout)...
-                            continue                                   # ...do nothing
-                    except ValueError:                                 # If there are NO columns, then we do nothing
-                        continue
-                else:                                                  # Likewise, if the last line of the file is nonexistent, do nothing
-                    continue
-        ax_hum.cla()                                                   # Now that we've made updates to sorted_df, we can replot by clearing the plots' axes
-        ax_temp.cla()
-        start_date, end_date = date_assigner(start_date, end_date, assigned_start, assigned_end, keys, sorted_df)         # Recalculate the dates if unassigned
-        stat_start, stat_end = date_assigner(stat_start, stat_end, assign_stat_start, assign_stat_end, keys, sorted_df)   # Same for the statistics dates
-        if (assigned_end == False):
-            end_date.strftime("%Y-%m-%d %H:%M:%S")                     # This is for formatting. I ran into an issue for some reason
-        date_list = pd.date_range(start_date, end_date, freq = "s")    # We must also recalculate the date range as well as our bounds
-        title_start_date, title_end_date, png_start_date, png_end_date = bounds(start_date, end_date)
-        if (update_stats == True):
-            stat_title_start, stat_title_end = stat_bounds(stat_start, stat_end)
-        for i in range(len(keys)):                                     # This part is basically Parts 6 and 7, just written a little differently
-            if ("Precipitation" in sorted_df[keys[i]].columns.tolist()):
-                ax_precip.cla()                                        # Clear the secondary precipitation axis, too (don't clear ax_abs, though)
-                color = "red"
-                marker = "*"
-                label = "CVille"
-                sorted_df[keys[i]]["Precipitation"] = sorted_df[keys[i]]["Precipitation"].astype(float)
-                sorted_df[keys[i]]["Precipitation"].plot(rot = 45, ax = ax_precip, marker = "*", secondary_y = True, color = "blue", lw = linewidth, markersize = markersize)
-                precip_axis(ax_precip)
-            else:
-                color = colors[i]
-                marker = markers[i]
-                label = "Sensor {0}".format(int(sorted_df[keys[i]]["Port"][0]) + 1)
-                sorted_df[keys[i]]["Absolute Humidity"] = sorted_df[keys[i]]["Absolute Humidity"].astype(float)
-                sorted_df[keys[i]]["Absolute Humidity"].plot(rot = 45, ax = ax_abs, marker = marker, secondary_y = True, color = color, lw = linewidth + 3, markersize = markersize + 3)
-                sorted_df[keys[i]]["Absolute Humidity"].plot(rot = 45, ax = ax_abs, marker = marker, secondary_y = True, color = "blue", lw = linewidth, markersize = markersize)
-                abs_axis(ax_abs)
-            sorted_df[keys[i]]["Relative Humidity"] = sorted_df[keys[i]]["Relative Humidity"].astype(float)
-            sorted_df[keys[i]]["Temperature"] = sorted_df[keys[i]]["Temperature"].astype(float)
-            sorted_df[keys[i]]["Relative Humidity"].plot(rot = 45, ax = ax_hum, color = color, marker = marker, label = label, lw = linewidth, markersize = markersize)
-            sorted_df[keys[i]]["Temperature"].plot(rot = 45, ax = ax_temp, color = color, marker = marker, label = label, lw = linewidth, markersize = markersize)
-            line_plotter(ax_hum, optimal_high, optimal_low, start_date, end_date)
-            if (update_stats == True):
-                new_stat_start, new_stat_end = stat_date_formatter(stat_start, stat_end, sorted_df[keys[i]])
-                if (new_stat_start != new_stat_end):
-                    statistics_placer(stats, 0, i, sorted_df[keys[i]]["Relative Humidity"], new_stat_start, new_stat_end)
-                    statistics_placer(stats, 1, i, sorted_df[keys[i]]["Temperature"], new_stat_start, new_stat_end)
-        hums_axis(ax_hum, lower_hum_bound, upper_hum_bound, start_date, end_date, title_start_date, title_end_date)
-        temps_axis(ax_temp, lower_temp_bound, upper_temp_bound, start_date, end_date, title_start_date, title_end_date, date_list, n_desired_ticks)
-        if (update_stats == True):
-            printing_stats(stats, stat_title_start, stat_title_end)
-        end_time = int(time.time())                                   # Current time after the loop runs
-        if ((end_time - start_time) > 3600):                          # Every hour (in seconds), save the plot
-            photo_saver(png_start_date, png_end_date)
-            start_time = end_time
-        plt.show(block = False)
-        plt.pause(5)
-        time.sleep(5)
+        plt.pause(10)                                         # Pause the program for 10 seconds before continuing
     except KeyboardInterrupt:
         print("\nKeyboardInterrupt")
         sys.exit(1)
+    profiler.end_cycle()                                      # Loading and the first plot are the first cycle when profiling
+
+    start_time = int(time.time())    # This gets the current time and will be used for saving a figure every hour
+    shown_dates = (start_date, end_date)   # The range of dates on the plot (the axes are only redone when this changes)
+    blit = BlitManager(plt.gcf())          # From here on, only the lines are drawn again when nothing else changes (see plotLayers.py)
+    for key, column, decimated in (live_lines + diff_lines):
+        blit.add(decimated.line)
+    blit.draw_idle()
+
+    while True:
+        try:
+            with profiler.stage("ingest"):
+                window_low, window_high = load_window()
+                for folder in segment_folders:                                 # Start following any new segments (i.e. when a new day starts)
+                    new_segments = [os.path.join(folder, name) for name in sorted(os.listdir(folder)) if ((name.endswith(".txt") == True) and (os.path.join(folder, name) not in seen_segments))]
+                    if (len(new_segments) == 0):                               # The manifest is only read when a new segment shows up
+                        continue
+                    seen_segments.update(new_segments)
+                    overlapping = set(segment_files(folder, window_low, window_high))
+                    for segment in new_segments:
+                        if (segment in overlapping):
+                            files.append(segment)
+                            tailers.append(FileTailer(segment, 0))
+                            if (segment > open_segments[folder]):             # The segments are named by date, so a later name is a newer segment
+                                closed_segments.add(open_segments[folder])     # The old newest segment is read one last time below and then let go
+                                open_segments[folder] = segment
+                for i in range(len(files)):
+                    if (tailers[i] is None):                                   # A segment that's done
+                        continue
+                    new_frames = new_line_formatter(tailers[i].read_new_lines())   # Only the lines added since the last refresh are read
+                    if (files[i] in closed_segments):
+                        tailers[i] = None
+                    for key in new_frames:
+                        if (key in sorted_df):                                 # Add them to the appropriate store and view the store as the dataframe in sorted_df
+                            stores[key].append(new_frames[key])
+                            sorted_df[key] = stores[key].frame()
+                            profiler.count("rows ingested", len(new_frames[key]))
+                            time_bounds.update(key)                            # The last date may have changed
+                            with profiler.stage("stats"):
+                                rollups[key].refresh()                         # Only the new rows go into the rollups (the lines use them too, so this is done even without statistics)
+            with profiler.stage("render"):
+                redraw = False                                             # Whether the whole figure must be drawn again (not just the lines)
+                for key, column, decimated in live_lines:                  # Now that we've made updates to sorted_df, we can give the lines the updated data
+                    if (lod.update(decimated, sorted_df[key].index.values, sorted_df[key][column].to_numpy()) == True):
+                        redraw = True                                      # The new data didn't fit in the axis's limits
+                for key in aligned:
+                    with profiler.stage("stats"):
+                        aligned[key].refresh()                             # Only the newest sensor measurements are matched again
+                for key, column, decimated in diff_lines:
+                    if (lod.update(decimated, sorted_df[key].index.values, aligned[key].column(column)) == True):
+                        redraw = True
+                if ((redraw == True) and (abs_hum_definer == True)):
+                    ax_abs.autoscale(axis = "y")                           # Let the secondary axes grow to fit the new data
+                    abs_axis(ax_abs)
+                if ((redraw == True) and (precip_definer == True)):
+                    ax_precip.autoscale(axis = "y")
+                    precip_axis(ax_precip)
+                start_date, end_date = date_assigner(start_date, end_date, assigned_start, assigned_end, time_bounds)         # Recalculate the dates if unassigned
+                stat_start, stat_end = date_assigner(stat_start, stat_end, assign_stat_start, assign_stat_end, time_bounds)   # Same for the statistics dates
+                if (assigned_end == False):
+                    end_date.strftime("%Y-%m-%d %H:%M:%S")                 # This is for formatting. I ran into an issue for some reason
+                if ((start_date, end_date) != shown_dates):                # Only redo the axes, ticks, and titles if the range of dates changed
+                    title_start_date, title_end_date, png_start_date, png_end_date = bounds(start_date, end_date)
+                    for optimal_line in optimal_lines:
+                        optimal_line.remove()
+                    optimal_lines = line_plotter(ax_hum, optimal_high, optimal_low, start_date, end_date)
+                    hums_axis(ax_hum, lower_hum_bound, upper_hum_bound, start_date, end_date, title_start_date, title_end_date)
+                    temps_axis(ax_temp, lower_temp_bound, upper_temp_bound, start_date, end_date, title_start_date, title_end_date, n_desired_ticks)
+                    if (ax_diff is not None):
+                        diffs_axis(ax_diff, ax_temp, start_date, end_date, title_start_date, title_end_date, n_desired_ticks)
+                    shown_dates = (start_date, end_date)
+                    redraw = True
+            if (update_stats == True):
+                with profiler.stage("stats"):
+                    stat_title_start, stat_title_end = stat_bounds(stat_start, stat_end)
+                    for i in range(len(keys)):
+                        new_stat_start, new_stat_end = time_bounds.nearest(keys[i], stat_start, stat_end)
+                        if (new_stat_start != new_stat_end):
+                            statistics_placer(stats, 0, i, rollups[keys[i]].window("Relative Humidity", new_stat_start, new_stat_end))
+                            statistics_placer(stats, 1, i, rollups[keys[i]].window("Temperature", new_stat_start, new_stat_end))
+                    if (differences is not None):
+                        difference_placer(differences)
+            if (redraw == True):
+                blit.draw_idle()                                           # Draw the whole figure (the lines are drawn on top of it by "blit")
+            else:
+                blit.update()                                              # Only draw the lines again
+            if (update_stats == True):
+                printing_stats(stats, stat_title_start, stat_title_end)
+                if (differences is not None):
+                    printing_differences(differences, stat_title_start, stat_title_end)
+            end_time = int(time.time())                                   # Current time after the loop runs
+            if ((end_time - start_time) > 3600):                          # Every hour (in seconds), save the plot
+                blit.set_animated(False)                                  # Animated lines are left out of saved figures
+                photo_saver(png_start_date, png_end_date)
+                blit.set_animated(True)
+                start_time = end_time
+            plt.show(block = False)
+            plt.pause(5)
+            time.sleep(5)
+            profiler.end_cycle()                                           # Each refresh is one cycle when profiling
+        except KeyboardInterrupt:
+            print("\nKeyboardInterrupt")
+            sys.exit(1)
+
+''' ================================================================================================================== '''
+''' ========================================== PART 9: RUNNING THE PROGRAM =========================================== '''
+''' ================================================================================================================== '''
+
+''' "main" runs the program for the given command-line arguments, importing 
+only what the mode needs: "HELP" and mistakes need nothing but "sys" and "os," 
+"STATS" hands the files to quickStats.py (which doesn't import matplotlib or 
+tkinter) with the statistics dates from Part i, and batch and live mode import 
+everything (see Part iii) and then go through Parts 1 to 8 in order. Running 
+"python NEW_READER.py ..." calls "main" with the arguments, but importing 
+NEW_READER.py from another script doesn't run anything, so its functions can 
+be used elsewhere. This was implemented 10/18/2026. 
+
+10/18/2026 UPDATE: If "--profile" is given, "profiler" is turned on before 
+anything else happens, so every mode but "HELP" can be profiled (in "STATS" 
+mode, the reading, parsing, formatting, and statistics of quickStats.py are 
+timed). The summary is printed when the program exits (i.e. with Ctrl-C in 
+live mode). '''
+
+''' ================================================================================================================== '''
+
+batch_mode = False       # Whether graphs are only saved, never shown (set by "main," see Part 8)
+batch_frequency = "1D"   # Length of the window for each graph in batch mode (set by "main")
+
+def main(arguments):
+    global batch_mode, batch_frequency
+    mode, batch_frequency, paths, profiling, metrics_file = parse_arguments(arguments)
+    if (mode == "HELP"):
+        help_func()
+    if (profiling == True):
+        profiler.enable(metrics_file)
+    if (mode == "STATS"):
+        from quickStats import print_stats   # Only the statistics are printed, so nothing for plotting is imported
+        print_stats(paths, stat_start if (assign_stat_start == True) else None, stat_end if (assign_stat_end == True) else None)
+        return
+    batch_mode = (mode == "BATCH")
+    import_modules(batch_mode)
+    gather_files(paths)
+    load_dataframes()
+    order_dataframes()
+    sort_dataframes()
+    revisit_bounds()
+    with profiler.stage("render"):
+        plot_humidities()
+        plot_temperatures()
+    display_plots()
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
 
 ''' ================================================================================================================== '''
-''' ============================================ PART 9: ACKNOWLEDGEMENTS ============================================ '''
+''' ============================================ PART 10: ACKNOWLEDGEMENTS =========================================== '''
 ''' ================================================================================================================== '''
 
 # Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
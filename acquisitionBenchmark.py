@@ -0,0 +1,218 @@
+import os                   # Used for finding the files and checking which ports sensorData.py has open
+import sys                  # Allows the user to use command line arguments
+import time                 # Used for timing the measurements
+import threading            # Lets the data files be watched while the measurements are being sent
+import subprocess           # Used for running sensorData.py
+import resource             # Used for measuring how much CPU time sensorData.py used
+import tempfile             # Used for making a folder for the data files
+import collections          # Used for remembering when each measurement was sent
+import numpy as np          # Used for the latency statistics
+from arduinoSimulator import SimulatedArduino   # Pretends to be the Arduino boards
+from fileTailer import FileTailer               # Reads the lines sensorData.py adds to the data files
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This script measures how well sensorData.py keeps up with the Arduino
+boards. It makes simulated boards with arduinoSimulator.py, runs sensorData.py
+on them (exactly as it would be run on the real boards, with every board
+writing to its own data file in a temporary folder), sends measurements from
+every board at the given rate for the given number of seconds, and then sends
+"Done!" so sensorData.py finishes. While that's happening, the data files are
+watched to see when each measurement shows up. At the end, the following are
+printed for each board and for all of them together:
+1) Samples/sec --- Number of measurements written to the data files per second
+2) Latency --- Time from a measurement being sent to it showing up in its data file (median, 95th percentile, and maximum)
+3) Dropped --- Number of real measurements (not glitches) that never showed up in the data file
+4) Overruns --- Number of measurements that couldn't be sent because sensorData.py wasn't reading fast enough (these are dropped too)
+
+The CPU time sensorData.py used is also printed, as a percentage of one core for
+each board. The latency includes the time measurements are held before being
+written (see "flush_records" and "flush_seconds" in sensorData.py), so it's
+usually a few seconds unless measurements come in fast enough to fill the
+batches. This only works on Linux and MacOS (see arduinoSimulator.py). This was
+implemented 10/18/2026.
+
+It's used with the following command (by default, 4 boards sending 10
+measurements per second for 30 seconds):
+
+python acquisitionBenchmark.py [number of boards] [measurements per second] [seconds] [framed (optional)] '''
+
+''' ================================================================================================================== '''
+''' ============================================== PART i: VARIABLES ================================================= '''
+''' ================================================================================================================== '''
+
+poll_time = 0.02       # Number of seconds between checks of the data files
+open_timeout = 15      # Number of seconds to wait for sensorData.py to open the ports
+done_timeout = 30      # Number of seconds to wait for sensorData.py to finish after "Done!" is sent
+
+''' ================================================================================================================== '''
+''' =========================================== PART 1: WATCHING THE DATA FILES ====================================== '''
+''' ================================================================================================================== '''
+
+''' The simulated boards send humidities that step by 0.01 from 40.00 to 59.99
+and then start over, so each line in a data file can be matched to the time its
+measurement was sent. The times are kept in a queue for each board and humidity,
+since the same humidity comes around again every 2000 measurements. '''
+
+''' ================================================================================================================== '''
+
+class FileWatcher:
+    def __init__(self, data_files):
+        self.tailers = [FileTailer(data_file, offset = 0) for data_file in data_files]
+        self.sent = [collections.defaultdict(collections.deque) for data_file in data_files]
+        self.latencies = [[] for data_file in data_files]
+        self.unmatched = [0 for data_file in data_files]
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+    def sending(self, board, humidity, sent_time):
+        with self.lock:
+            self.sent[board][humidity].append(sent_time)
+
+    # This function reads the new lines of every data file and matches them to the times their measurements were sent.
+    def check(self):
+        for board, tailer in enumerate(self.tailers):
+            lines = tailer.read_new_lines()
+            seen_time = time.time()
+            with self.lock:
+                for line in lines:
+                    humidity = line.split()[3]
+                    if (len(self.sent[board][humidity]) == 0):
+                        self.unmatched[board] += 1
+                        continue
+                    self.latencies[board].append(seen_time - self.sent[board][humidity].popleft())
+
+    def run(self):
+        while (self.stopped.is_set() == False):
+            self.check()
+            time.sleep(poll_time)
+        self.check()
+
+''' ================================================================================================================== '''
+''' ============================================ PART 2: RUNNING THE BENCHMARK ======================================= '''
+''' ================================================================================================================== '''
+
+# This function waits until the process has every pseudo-terminal open (sensorData.py clears anything sent before it opens a port). It returns False if it didn't happen in time.
+def wait_for_ports(process, paths):
+    fd_folder = "/proc/{0}/fd".format(process.pid)
+    end = time.monotonic() + open_timeout
+    while (time.monotonic() < end):
+        if (process.poll() is not None):
+            return False
+        if (os.path.isdir(fd_folder) == False):      # MacOS doesn't have /proc, so just give sensorData.py a few seconds
+            time.sleep(3)
+            return True
+        opened = set()
+        for fd in os.listdir(fd_folder):
+            try:
+                opened.add(os.readlink(os.path.join(fd_folder, fd)))
+            except OSError:
+                pass
+        if (set(paths) <= opened):
+            return True
+        time.sleep(0.1)
+    return False
+
+def benchmark(n_boards, rate, seconds, framed):
+    folder = tempfile.mkdtemp(prefix = "acquisition_benchmark_")
+    boards = [SimulatedArduino(framed, seed = i) for i in range(n_boards)]
+    data_files = [os.path.join(folder, "sensor{0}.txt".format(i)) for i in range(n_boards)]
+    arguments = []
+    for i, board in enumerate(boards):
+        arguments += ["{0}:{1}{2}".format(i, board.path, "@115200" if (framed == True) else ""), data_files[i]]
+    sensor_data = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sensorData.py")
+    cpu_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    process = subprocess.Popen([sys.executable, sensor_data] + arguments, stdout = subprocess.DEVNULL)
+    if (wait_for_ports(process, [board.path for board in boards]) == False):
+        print("sensorData.py didn't open the simulated boards.")
+        process.kill()
+        sys.exit(1)
+    watcher = FileWatcher(data_files)
+    watch_thread = threading.Thread(target = watcher.run, daemon = True)
+    watch_thread.start()
+
+    # Sending the measurements
+    for board in boards:
+        board.startup()
+    sent = [0 for board in boards]          # Number of measurements sent (including glitches)
+    real = [0 for board in boards]          # Number of those that weren't glitches and didn't overrun
+    start = time.monotonic()
+    next_time = start
+    while (time.monotonic() - start < seconds):
+        for i, board in enumerate(boards):
+            humidity = 40 + (sent[i] % 2000) / 100
+            sent_time = time.time()
+            if (board.measurement(humidity) is not None):
+                watcher.sending(i, "{0:.2f}".format(humidity), sent_time)
+                real[i] += 1
+            sent[i] += 1
+        next_time += 1 / rate
+        time.sleep(max(next_time - time.monotonic(), 0))
+    send_time = time.monotonic() - start
+    for board in boards:
+        board.done()
+
+    # Waiting for sensorData.py to finish
+    try:
+        process.wait(timeout = done_timeout)
+    except subprocess.TimeoutExpired:
+        print("sensorData.py didn't finish after \"Done!\" was sent, so it was stopped.")
+        process.terminate()
+        process.wait()
+    total_time = time.monotonic() - start
+    cpu_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    watcher.stopped.set()
+    watch_thread.join()
+    for board in boards:
+        board.close()
+    cpu_time = (cpu_after.ru_utime - cpu_before.ru_utime) + (cpu_after.ru_stime - cpu_before.ru_stime)
+
+    # Printing the results
+    print("{0} board(s), {1} measurement(s) per second each, {2} seconds{3}".format(n_boards, rate, seconds, " (framed)" if (framed == True) else ""))
+    print("Data files are in " + folder + "\n")
+    print("{0:>6} {1:>8} {2:>8} {3:>12} {4:>11} {5:>11} {6:>11} {7:>8} {8:>9}".format("Board", "Sent", "Written", "Samples/sec", "Median (s)", "95th (s)", "Max (s)", "Dropped", "Overruns"))
+    all_latencies = []
+    for i, board in enumerate(boards):
+        latencies = np.array(watcher.latencies[i])
+        all_latencies += watcher.latencies[i]
+        written = len(latencies) + watcher.unmatched[i]
+        print(latency_row(str(i), sent[i], written, send_time, latencies, max(real[i] - written, 0), board.overruns))
+    written = sum(len(latencies) for latencies in watcher.latencies) + sum(watcher.unmatched)
+    dropped = sum(max(real[i] - len(watcher.latencies[i]) - watcher.unmatched[i], 0) for i in range(n_boards))
+    print(latency_row("All", sum(sent), written, send_time, np.array(all_latencies), dropped, sum(board.overruns for board in boards)))
+    print("\nCPU used by sensorData.py: {0:.2f} seconds over {1:.1f} seconds ({2:.2f}% of one core per board)".format(cpu_time, total_time, 100 * cpu_time / total_time / n_boards))
+
+# This function makes one row of the results table.
+def latency_row(name, sent, written, send_time, latencies, dropped, overruns):
+    if (len(latencies) > 0):
+        median, high, highest = np.median(latencies), np.percentile(latencies, 95), np.max(latencies)
+    else:
+        median, high, highest = np.nan, np.nan, np.nan
+    return "{0:>6} {1:>8} {2:>8} {3:>12.1f} {4:>11.3f} {5:>11.3f} {6:>11.3f} {7:>8} {8:>9}".format(name, sent, written, written / send_time, median, high, highest, dropped, overruns)
+
+''' ================================================================================================================== '''
+''' ============================================ PART 3: COMMAND-LINE USE ============================================ '''
+''' ================================================================================================================== '''
+
+if __name__ == '__main__':
+    usage = "Use the following format: python acquisitionBenchmark.py [number of boards] [measurements per second] [seconds] [framed (optional)]\n"
+    arguments = [argument for argument in sys.argv[1:] if (argument != "framed")]
+    try:
+        n_boards = int(arguments[0]) if (len(arguments) > 0) else 4
+        rate = float(arguments[1]) if (len(arguments) > 1) else 10.0
+        seconds = float(arguments[2]) if (len(arguments) > 2) else 30.0
+    except ValueError:
+        print(usage)
+        sys.exit(1)
+    if ((n_boards < 1) or (rate <= 0) or (seconds <= 0) or (len(arguments) > 3)):
+        print(usage)
+        sys.exit(1)
+    benchmark(n_boards, rate, seconds, "framed" in sys.argv[1:])
+
+''' ================================================================================================================== '''
+''' ============================================ PART 4: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
@@ -2,9 +2,23 @@
 
 AHTxx aht10;
 
+// Set "framed" to true to send each measurement as one record ("$[SEQUENCE],[HUMIDITY],[TEMPERATURE]*[CHECKSUM]")
+// instead of the counter, humidity, and temperature on separate lines. The checksum is the XOR of the characters
+// between "$" and "*" written as two hex digits, so sensorData.py can tell when a record is garbled, and the sequence
+// number goes up by one for every record, so it can tell when records are missed. The baud rate given to sensorData.py
+// must match "framed_baud_rate" (i.e. "python sensorData.py 0@115200 sensor0.txt").
+const bool framed = false;
+const long framed_baud_rate = 115200;         // Baud rate used in framed mode
+const float framed_points_per_second = 5.0;   // Number of measurements per second in framed mode
+unsigned long sequence = 0;                   // Sequence number of the next record
+
 // This code initializes the sensor. It is run once.
 void setup() {
-     Serial.begin(9600);                        // Begin after 9600 ms
+     if (framed) {
+          Serial.begin(framed_baud_rate);       // Framed mode sends more data, so it talks faster
+     } else {
+          Serial.begin(9600);                   // Begin after 9600 ms
+     }
      delay(4800);
      Serial.println("Starting up...");          // Print on a new line. For checkpointing purposes
      while (aht10.begin() != true) {            // If the sensor isn't working...
@@ -18,9 +32,40 @@ void setup() {
 // This is for letting the Python script know what measurements to write to the data file.
 int counter = 0;
 
+// This sends one framed record with the sequence number, humidity, and temperature.
+void send_record(float humidity, float temperature) {
+     char humidity_text[12];
+     char temperature_text[12];
+     char payload[48];
+     dtostrf(humidity, 1, 2, humidity_text);            // Two decimal places, like Serial.println gives
+     dtostrf(temperature, 1, 2, temperature_text);
+     snprintf(payload, sizeof(payload), "%lu,%s,%s", sequence, humidity_text, temperature_text);
+     byte checksum = 0;
+     for (int i = 0; payload[i] != '\0'; i++) {
+          checksum ^= payload[i];
+     }
+     Serial.print('$');
+     Serial.print(payload);
+     Serial.print('*');
+     if (checksum < 16) {
+          Serial.print('0');                            // Always send two hex digits
+     }
+     Serial.println(checksum, HEX);
+     sequence++;
+}
+
 // This is the main code. It is run repeatedly.
 void loop() {
 
+     // In framed mode, send one record per measurement and skip the rest of the loop.
+     if (framed) {
+          float humidity = aht10.readHumidity(true);
+          float temperature = aht10.readTemperature(false);
+          send_record(humidity, temperature);
+          delay(int(1000.0 / framed_points_per_second));
+          return;
+     }
+
      // This is printed to the serial monitor for the Python script.
      Serial.println(counter);
 
@@ -0,0 +1,159 @@
+import os                   # Used for making the pseudo-terminals and writing to them
+import sys                  # Allows the user to use command line arguments
+import time                 # Used for sending the measurements at the right rate
+import random               # Used for making up measurements and glitches
+import tty                  # Used for making the pseudo-terminals act like serial ports (no echoing or changing of lines)
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This script pretends to be any number of Arduino boards running aht10.ino
+so sensorData.py can be tested (and timed, see acquisitionBenchmark.py) without
+real boards. Each simulated board is a pseudo-terminal (a "pty"), which is a
+file in /dev/pts that acts just like a serial port, so sensorData.py can open
+it the same way it opens /dev/ttyACM0. The simulated boards send exactly what
+aht10.ino sends: the startup messages ("Starting up...", "Sensor not running.",
+"AHT10 running"), then the counter, humidity, and temperature for every
+measurement, with the occasional "0.00" humidity or "-50.00" temperature when
+the sensor glitches, and "Done!" at the end. In framed mode, each measurement is
+sent as one framed record instead (see aht10.ino). This only works on Linux and
+MacOS, since Windows doesn't have pseudo-terminals. This was implemented
+10/18/2026.
+
+It's used with the following command (the paths of the pseudo-terminals and
+the command for sensorData.py are printed once they're made):
+
+python arduinoSimulator.py [number of boards] [measurements per second] [framed (optional)] '''
+
+''' ================================================================================================================== '''
+''' ============================================== PART i: VARIABLES ================================================= '''
+''' ================================================================================================================== '''
+
+glitch_rate = 0.01     # Fraction of measurements where the sensor glitches (sends "0.00" or "-50.00")
+not_running = 1        # Number of times each board says "Sensor not running." before it starts
+
+''' ================================================================================================================== '''
+''' ============================================ PART 1: SIMULATED BOARDS ============================================ '''
+''' ================================================================================================================== '''
+
+''' A SimulatedArduino is one pseudo-terminal. "path" is the file sensorData.py
+should open. "measurement" sends one measurement (or a glitch), returning the
+humidity that was sent, or None if it glitched and sensorData.py shouldn't
+write anything. Writing never waits: if sensorData.py falls so far behind that
+the pseudo-terminal fills up, the measurement is lost (like it would be on a
+real serial port) and counted in "overruns." '''
+
+''' ================================================================================================================== '''
+
+# This function makes a framed record the same way "send_record" does in aht10.ino.
+def frame_writer(sequence, humidity, temperature):
+    payload = "{0},{1:.2f},{2:.2f}".format(sequence, humidity, temperature)
+    checksum = 0
+    for character in payload.encode():
+        checksum ^= character
+    return "${0}*{1:02X}\r\n".format(payload, checksum)
+
+class SimulatedArduino:
+    def __init__(self, framed = False, seed = None):
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)                    # Serial ports don't echo or turn "\n" into "\r\n"
+        os.set_blocking(self.master, False)
+        self.path = os.ttyname(self.slave)
+        self.framed = framed
+        self.random = random.Random(seed)
+        self.counter = 0                          # Like "counter" in aht10.ino
+        self.sequence = 0                         # Like "sequence" in aht10.ino
+        self.overruns = 0
+
+    def send(self, text):
+        try:
+            written = os.write(self.master, text.encode())
+        except BlockingIOError:
+            written = 0
+        if (written < len(text)):
+            self.overruns += 1
+            return False
+        return True
+
+    def startup(self):
+        self.send("up..\r\n")                     # The end of a "Starting up..." sent before the port was opened
+        self.send("Starting up...\r\n")
+        for i in range(not_running):
+            self.send("Sensor not running.\r\n")
+        self.send("AHT10 running\r\n")
+
+    # This function sends one measurement. The humidity and temperature can be given (i.e. to tell the measurements apart); otherwise, they're made up.
+    def measurement(self, humidity = None, temperature = None):
+        if (humidity is None):
+            humidity = self.random.uniform(40, 60)
+        if (temperature is None):
+            temperature = self.random.uniform(20, 25)
+        glitch = (self.random.random() < glitch_rate)
+        if (glitch == True):
+            if (self.random.random() < 0.5):
+                humidity = 0.0
+            else:
+                temperature = -50.0
+        if (self.framed == True):
+            sent = self.send(frame_writer(self.sequence, humidity, temperature))
+            self.sequence += 1
+        else:
+            sent = self.send("{0}\r\n{1:.2f}\r\n{2:.2f}\r\n".format(self.counter, humidity, temperature))
+            self.counter += 2
+        if ((glitch == True) or (sent == False)):
+            return None
+        return "{0:.2f}".format(humidity)
+
+    def done(self):
+        self.send("Done!\r\n")
+
+    def close(self):
+        os.close(self.master)
+        os.close(self.slave)
+
+''' ================================================================================================================== '''
+''' =========================================== PART 2: COMMAND-LINE USE ============================================= '''
+''' ================================================================================================================== '''
+
+''' When run by itself, the script makes the boards, prints how to read them
+with sensorData.py, and sends measurements from all of them at the given rate
+until it's stopped with Ctrl-C. '''
+
+''' ================================================================================================================== '''
+
+if __name__ == '__main__':
+    usage = "Use the following format: python arduinoSimulator.py [number of boards] [measurements per second] [framed (optional)]\n"
+    try:
+        n_boards = int(sys.argv[1])
+        rate = float(sys.argv[2])
+    except (IndexError, ValueError):
+        print(usage)
+        sys.exit(1)
+    framed = ((len(sys.argv) > 3) and (sys.argv[3] == "framed"))
+    boards = [SimulatedArduino(framed) for i in range(n_boards)]
+    baudrate = "@115200" if (framed == True) else ""
+    print("Simulated boards: " + " ".join(board.path for board in boards))
+    print("Read them with: python sensorData.py " + " ".join("{0}:{1}{2} sensor{0}_sim.txt".format(i, board.path, baudrate) for i, board in enumerate(boards)))
+    input("Press Enter once sensorData.py is running...")
+    for board in boards:
+        board.startup()
+    next_time = time.monotonic()
+    try:
+        while True:
+            for board in boards:
+                board.measurement()
+            next_time += 1 / rate
+            time.sleep(max(next_time - time.monotonic(), 0))
+    except KeyboardInterrupt:
+        for board in boards:
+            board.done()
+        time.sleep(1)                             # Give sensorData.py a moment to read "Done!"
+        print("\nKeyboardInterrupt")
+        sys.exit(1)
+
+''' ================================================================================================================== '''
+''' ============================================ PART 3: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
@@ -0,0 +1,141 @@
+import numpy as np    # Used for parsing the dates and holding the data in compact arrays
+import pandas as pd   # Used for reading the dates that don't have the usual layout
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This module keeps the data NEW_READER.py holds in memory small and quick
+to make. Before, every date went through a string: the date and time columns
+were joined into new "YYYY-MM-DD HH:MM:SS" strings, which pd.to_datetime then
+had to figure out the layout of one by one. The measurements were float64, the
+port was a 64-bit integer (or a string, for new lines in the live loop), and
+the weather temperatures were converted one row at a time with a lambda. Now:
+1) Dates --- "parse_timestamps" reads the dates and times straight from their
+   characters, since sensorData.py and weatherData.py always write them the same
+   way ("YYYY-MM-DD" and "HH:MM:SS"). Every character is turned into a digit
+   for all the rows at once, the digits are checked, and the number of
+   nanoseconds since 1970 is calculated with whole-array arithmetic. Anything
+   that doesn't have that layout (or isn't a real date) is handed to
+   pd.to_datetime like before, so nothing that used to load stops loading.
+2) Measurements --- The measurements are float32 ("measurement_dtype"), which
+   has about 7 significant digits, far more than the sensors (2 decimal places)
+   or WTTR (whole numbers) give. Statistics are still added up in float64.
+3) Port --- The port is an 8-bit integer ("port_dtype").
+4) Fahrenheit --- "fahrenheit_to_celsius" converts a whole column at once.
+
+With the derived columns (see psychrometrics.py), a row takes 29 bytes instead
+of 56. This was implemented 10/18/2026.
+
+Some features of note here are the following:
+1) parse_timestamps([dates], [times]) --- Returns a DatetimeIndex (NaT where a date couldn't be read)
+2) fahrenheit_to_celsius([temperatures]) --- Converts temperatures (the whole degrees are used, like before)
+3) compact([dataframe]) --- Gives the columns of a formatted dataframe their compact types '''
+
+''' ================================================================================================================== '''
+''' ============================================== PART i: VARIABLES ================================================= '''
+''' ================================================================================================================== '''
+
+measurement_dtype = np.float32   # Type of the measurements (use np.float64 for the old behavior)
+port_dtype = np.int8             # Type of the port numbers
+date_layout = "YYYY-MM-DD"       # Layout of the dates ("-" is where the dashes go)
+time_layout = "HH:MM:SS"         # Layout of the times (":" is where the colons go)
+
+''' ================================================================================================================== '''
+''' ============================================== PART 1: PARSING DATES ============================================= '''
+''' ================================================================================================================== '''
+
+''' "characters" turns an array of strings into a 2D array of their bytes (one
+row per string) along with whether each string has exactly "width"
+characters. "days_from_civil" returns the number of days between 1970-01-01
+and each date (from Howard Hinnant's "chrono-compatible low-level date
+algorithms," which works for any date in the Gregorian calendar without
+looping over years). '''
+
+''' ================================================================================================================== '''
+
+def characters(strings, width):
+    try:
+        data = np.asarray(strings).astype("S{0}".format(width + 1))                # One extra character shows whether a string is too long
+    except UnicodeEncodeError:
+        return (None, None)
+    table = data.view(np.uint8).reshape(len(data), width + 1)
+    fits = (table[:, width] == 0) & (table[:, width - 1] != 0)
+    return (table[:, :width] - np.uint8(ord("0")), fits)                      # Digits become 0 to 9 (anything else ends up bigger than 9)
+
+def days_from_civil(year, month, day):
+    year = year - (month <= 2)
+    era = np.floor_divide(year, 400)
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+# This function returns whether each row of a table of characters has digits and separators where the layout has them.
+def matches(table, layout):
+    good = np.ones(len(table), dtype = bool)
+    for i, character in enumerate(layout):
+        if (character.isalpha() == True):
+            good &= (table[:, i] <= 9)
+        else:
+            good &= (table[:, i] == np.uint8((ord(character) - ord("0")) % 256))
+    return good
+
+# This function returns the number made from the digits in columns "first" to "last" (included) of each row.
+def number(table, first, last):
+    value = table[:, first].astype(np.int64)
+    for i in range(first + 1, last + 1):
+        value = value * 10 + table[:, i]
+    return value
+
+def parse_timestamps(dates, times):
+    dates = np.asarray(dates)
+    times = np.asarray(times)
+    stamps = np.full(len(dates), np.iinfo(np.int64).min, dtype = np.int64)   # NaT until a date is read
+    date_table, date_fits = characters(dates, len(date_layout))
+    time_table, time_fits = characters(times, len(time_layout))
+    if ((date_table is not None) and (time_table is not None)):
+        year, month, day = number(date_table, 0, 3), number(date_table, 5, 6), number(date_table, 8, 9)
+        hour, minute, second = number(time_table, 0, 1), number(time_table, 3, 4), number(time_table, 6, 7)
+        month_lengths = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+        leap = ((year % 4 == 0) & (year % 100 != 0)) | (year % 400 == 0)
+        good = date_fits & time_fits & matches(date_table, date_layout) & matches(time_table, time_layout)
+        good &= (month >= 1) & (month <= 12) & (hour < 24) & (minute < 60) & (second < 60)
+        good &= (day >= 1) & (day <= month_lengths[np.clip(month, 0, 12)] + (leap & (month == 2)))
+        seconds = days_from_civil(year, month, day) * 86400 + hour * 3600 + minute * 60 + second
+        stamps[good] = seconds[good] * 1000000000
+    else:
+        good = np.zeros(len(dates), dtype = bool)
+    if (good.all() == False):                                                  # Try the rest the old way, in case they're in some other layout pandas can read
+        rest = np.flatnonzero(good == False)
+        joined = pd.Series(dates[rest]).astype(str) + " " + pd.Series(times[rest]).astype(str)
+        stamps[rest] = pd.to_datetime(joined, errors = "coerce").values.astype("datetime64[ns]").view(np.int64)
+    return pd.DatetimeIndex(stamps.view("datetime64[ns]"))
+
+''' ================================================================================================================== '''
+''' ========================================== PART 2: TYPES AND CONVERSIONS ========================================= '''
+''' ================================================================================================================== '''
+
+''' "fahrenheit_to_celsius" does what "(int(x) - 32) / 1.8" did for each
+temperature, but for the whole column at once (int rounds toward zero, and so
+does np.trunc). "compact" changes the types of the columns of a formatted
+dataframe in place. '''
+
+''' ================================================================================================================== '''
+
+def fahrenheit_to_celsius(temperatures):
+    return ((np.trunc(np.asarray(temperatures, dtype = np.float64)) - 32) / 1.8).astype(measurement_dtype)
+
+def compact(dataframe):
+    for name in dataframe.columns.tolist():
+        if (name == "Port"):
+            dataframe[name] = dataframe[name].astype(np.int64).astype(port_dtype)
+        else:
+            dataframe[name] = dataframe[name].astype(measurement_dtype)
+    return dataframe
+
+''' ================================================================================================================== '''
+''' ============================================ PART 3: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
@@ -0,0 +1,165 @@
+import os                               # Used for finding the cache files and checking the size and modification time of the data files
+import hashlib                          # Used for checking that the part of a data file that was read hasn't changed
+import numpy as np                      # Used for saving and loading the cache files
+import pandas as pd                     # Used for rebuilding the dataframes from the cache files
+from dataLoader import load_data_file   # Used for parsing the parts of the data files that aren't cached yet
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This module keeps a cache of the formatted dataframes made from each data
+file so that NEW_READER.py doesn't have to parse and format the same files
+every time it's run (most of the files in data/2024 and data/2025 never
+change). The cache for a data file is saved in a folder called .reader_cache
+next to it as a numpy .npz file, which stores the datetime index and each
+column as its own binary array. Along with the data, the cache remembers the
+size and modification time of the data file, how far into it was read, and a
+hash of everything that was read.
+
+When a data file is loaded, one of three things happens:
+1) The size and modification time haven't changed, so the cached dataframe is
+used as is.
+2) The file got bigger and the bytes before where we stopped reading are the
+same as before (i.e. data was only appended to it), so only the new bytes are
+parsed and formatted and then added to the cached dataframe.
+3) Otherwise (i.e. a line was changed, even if the size stayed the same), the
+whole file is parsed and formatted again.
+
+The formatting itself is done by a function passed in by NEW_READER.py (the
+"formatter"), which takes the dataframe from load_data_file and the file name
+and returns the formatted dataframe. This was implemented 10/18/2026. 
+
+10/18/2026 UPDATE: Only the last 256 bytes that were read used to be checked, 
+and a file that was edited without changing its size passed as "appended to," 
+so the old dataframe was used again. Now the whole part of the file that was 
+read is hashed, and a file that didn't get bigger is always parsed again if its 
+modification time changed. rollups.py checks its saved rollups the same way. '''
+
+''' ================================================================================================================== '''
+''' ============================================== PART i: VARIABLES ================================================= '''
+''' ================================================================================================================== '''
+
+cache_folder = ".reader_cache"   # Name of the folder (next to the data files) where the caches are saved
+cache_version = 4                # Caches saved with a different version are ignored and rebuilt (2: weather in degrees Celsius and derived columns, see psychrometrics.py; 3: compact types, see compactTypes.py; 4: hash of the part that was read)
+signature_length = 256           # Number of bytes before the indexed size that must match for an index to be extended (see offsetIndex.py)
+hash_chunk = 1 << 20             # Number of bytes hashed at a time
+
+''' ================================================================================================================== '''
+''' ============================================== PART 1: HELPER FUNCTIONS ========================================== '''
+''' ================================================================================================================== '''
+
+# This function returns the path of the cache file for a data file.
+def cache_path(path):
+    folder, name = os.path.split(os.path.abspath(path))
+    return os.path.join(folder, cache_folder, name + ".npz")
+
+# This function returns the bytes of a data file right before the given offset, which are used to check that the file was only appended to.
+def signature(path, offset):
+    start = max(0, offset - signature_length)
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(offset - start)
+
+# This function returns a hash of the first "offset" bytes of a data file, which is used to check that the file was only appended to. A hash that was already started ("digest," of the first "start" bytes) can be given to add the rest of the bytes to it.
+def prefix_hash(path, offset, digest = None, start = 0):
+    if (digest is None):
+        digest = hashlib.blake2b(digest_size = 16)
+    with open(path, "rb") as f:
+        f.seek(start)
+        left = offset - start
+        while (left > 0):
+            chunk = f.read(min(hash_chunk, left))
+            if (len(chunk) == 0):
+                break
+            digest.update(chunk)
+            left -= len(chunk)
+    return digest
+
+# This function reads a cache file and returns its contents as a dictionary (or None if there isn't a usable cache).
+def read_cache(path):
+    try:
+        with np.load(cache_path(path), allow_pickle = False) as cached:
+            contents = {name: cached[name] for name in cached.files}
+    except (OSError, ValueError, KeyError):
+        return None
+    if (int(contents.get("version", -1)) != cache_version):
+        return None
+    return contents
+
+# This function turns the contents of a cache file back into a dataframe.
+def cache_to_frame(contents):
+    index = pd.DatetimeIndex(contents["index"].view("datetime64[ns]"), name = "Date and Time")
+    columns = [str(name) for name in contents["columns"]]
+    return pd.DataFrame({name: contents["column_{0}".format(i)] for i, name in enumerate(columns)}, index = index)
+
+# This function saves a dataframe and the information about its data file to the cache file. If the cache can't be written (i.e. the folder is read only), nothing happens.
+def write_cache(path, dataframe, stats, offset, n_malformed, digest = None):
+    if (digest is None):
+        digest = prefix_hash(path, offset)
+    arrays = {"version": np.array(cache_version),
+              "size": np.array(stats.st_size),
+              "mtime": np.array(stats.st_mtime_ns),
+              "offset": np.array(offset),
+              "n_malformed": np.array(n_malformed),
+              "prefix_hash": np.frombuffer(digest.digest(), dtype = np.uint8),
+              "index": dataframe.index.values.astype("datetime64[ns]").view(np.int64),
+              "columns": np.array([str(name) for name in dataframe.columns])}
+    for i, name in enumerate(dataframe.columns):
+        arrays["column_{0}".format(i)] = dataframe[name].to_numpy()
+    destination = cache_path(path)
+    temporary = destination + ".tmp.npz"
+    try:
+        os.makedirs(os.path.dirname(destination), exist_ok = True)
+        np.savez(temporary, **arrays)
+        os.replace(temporary, destination)   # Replacing the file all at once means a half-written cache is never read
+    except OSError:
+        pass
+
+# This function parses and formats a data file starting "offset" bytes into it. It returns None for the dataframe if there were no good lines.
+def parse_and_format(path, formatter, offset):
+    df, n_malformed, end_offset = load_data_file(path, offset)
+    if (len(df) == 0):
+        return (None, n_malformed, end_offset)
+    return (formatter(df, path), n_malformed, end_offset)
+
+''' ================================================================================================================== '''
+''' ================================================ PART 2: LOADING ================================================= '''
+''' ================================================================================================================== '''
+
+''' This function is used in place of load_data_file when the formatted
+dataframe is wanted. It returns the formatted dataframe (or an empty one if
+there was no data), the total number of malformed lines in the file, and the
+offset after the last complete line, just like load_data_file. '''
+
+''' ================================================================================================================== '''
+
+def load_cached_file(path, formatter):
+    stats = os.stat(path)
+    contents = read_cache(path)
+    if (contents is not None):
+        offset = int(contents["offset"])
+        if ((int(contents["size"]) == stats.st_size) and (int(contents["mtime"]) == stats.st_mtime_ns)):      # 1) Nothing changed
+            return (cache_to_frame(contents), int(contents["n_malformed"]), offset)
+        digest = prefix_hash(path, offset) if (stats.st_size > int(contents["size"])) else None                 # A file that didn't get bigger but changed is parsed again
+        if ((digest is not None) and (digest.digest() == contents["prefix_hash"].tobytes())):                    # 2) Appended to
+            cached = cache_to_frame(contents)
+            new, n_malformed, end_offset = parse_and_format(path, formatter, offset)
+            if (new is not None):
+                cached = pd.concat([cached, new[cached.columns]])
+                if (cached.index.is_monotonic_increasing == False):
+                    cached.sort_index(kind = "stable", inplace = True)
+            n_malformed += int(contents["n_malformed"])
+            write_cache(path, cached, stats, end_offset, n_malformed, prefix_hash(path, end_offset, digest, offset))   # Only the new bytes are added to the hash
+            return (cached, n_malformed, end_offset)
+    new, n_malformed, end_offset = parse_and_format(path, formatter, 0)                                       # 3) Start from scratch
+    if (new is None):
+        return (pd.DataFrame(), n_malformed, end_offset)
+    write_cache(path, new, stats, end_offset, n_malformed)
+    return (new, n_malformed, end_offset)
+
+''' ================================================================================================================== '''
+''' ============================================ PART 3: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
@@ -0,0 +1,122 @@
+import numpy as np   # Used for checking the type of the measurements and rounding the statistics
+from compactTypes import parse_timestamps, fahrenheit_to_celsius, compact, measurement_dtype   # These read the dates quickly and keep the data in small types (see "df_formatter")
+from psychrometrics import add_derived   # This calculates the absolute humidity, dew point, and vapor pressure deficit of the data (see "file_formatter")
+from stageProfiler import profiler       # Times the formatting when profiling (see stageProfiler.py)
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This module holds the functions that turn the dataframes from the data
+files into the formatted dataframes NEW_READER.py plots, and the ones that fill
+in and print its statistics table. They used to be in Part ii of NEW_READER.py,
+but they're needed by quickStats.py too, which prints the same statistics
+without NEW_READER.py's plotting (and without importing matplotlib or tkinter).
+Keeping them in one place means both programs clean the data the same way
+(i.e. the same old-format fixes, the same humidities over 100% removed, and the
+same conversion of the weather temperatures). They were moved here 10/18/2026.
+
+Some features of note here are the following:
+1) file_formatter([dataframe], [file]) --- Formats a dataframe made from (part of) a data file by load_data_file (see dataLoader.py)
+2) df_formatter([dataframe]) --- Turns the dates and times into the index and gives the columns their types
+3) stat_bounds([start], [end]) --- Returns the start and end dates the way they're written in the title of the statistics table
+4) statistics_placer([stats dataframe], [0 or 1], [column], [accumulator]) --- Fills in a column of the statistics table
+5) printing_stats([stats dataframe], [start], [end]) --- Prints the statistics table '''
+
+''' ================================================================================================================== '''
+''' ============================================== PART i: VARIABLES ================================================= '''
+''' ================================================================================================================== '''
+
+stat_rows = ["Relative Humidity (%)", "Temperature (\u00b0C)", "Relative Humidity Min/Max (%)", "Temperature Min/Max (\u00b0C)", "Number of Points"]   # Rows of the statistics table
+
+''' ================================================================================================================== '''
+''' =============================================== PART 1: FORMATTING =============================================== '''
+''' ================================================================================================================== '''
+
+''' This function is called to format data files that are in the old format. 
+For weather data, this means that a sixth column is included before the date 
+column; for sensor data, this means that an index is still included as the 
+first column and not the port number. The function is always called but 
+won't do anything if the file is already in the correct format. A caveat of 
+this function is that it will only work on specific old sensor-data files, 
+namely those that have an indication in their title about which port number 
+was used. If there is no indication, then it cannot be used on those files. 
+This function was implemented 6/25/2024. '''
+def old_file_formatter(dataframe, infile):
+    if ("-" in str(dataframe.iloc[0][1])):
+        if (len(dataframe.columns) == 6):                                                                                              # Old weather data
+            dataframe.drop(columns = dataframe.columns[0], axis = 1, inplace = True)
+        elif ((dataframe[0].astype(int).tolist()[len(dataframe[0].tolist()) - 1] - dataframe[0].astype(int).tolist()[0]) != 0):        # Old sensor data (good titles)
+            if ((("first" in str(infile)) or ("1st" in str(infile))) and (("sens" in str(infile)) or ("sensor" in str(infile)))):
+                dataframe[0] = dataframe[0].astype(int) - dataframe[0].astype(int)
+            elif ((("second" in str(infile)) or ("2nd" in str(infile))) and (("sens" in str(infile)) or ("sensor" in str(infile)))):
+                dataframe[0] = dataframe[0].astype(int) - dataframe[0].astype(int) + 1
+
+# This function formats and sorts the columns in a dataframe. I must include "inplace = True" if I want the modifications to save.
+def df_formatter(dataframe):
+    dataframe["Date"] = parse_timestamps(dataframe["Date"].to_numpy(), dataframe["Time"].to_numpy())   # Read the dates and times in "Date" and "Time" straight into Pandas datetime objects (NaT if they can't be read)
+    dataframe.rename(columns = {"Date": "Date and Time"}, inplace = True)                          # Rename column "Date" to "Date and Time"
+    dataframe.drop(dataframe[dataframe["Date and Time"].isnull() == True].index, inplace = True)   # Remove any NaT values
+    dataframe.drop("Time", axis = 1, inplace = True)                                               # Remove column "Time"
+    dataframe.sort_values(by = "Date and Time", inplace = True)                                    # Sort datetime objects chronologically
+    dataframe.set_index(["Date and Time"], inplace = True)                                         # Make column "Date and Time" the new index of the dataframe
+    dataframe.dropna(inplace = True)                                                               # Removes any row where NaN appears
+    compact(dataframe)                                                                             # Typecasts the measurements as float32 and the port as an 8-bit integer (see compactTypes.py)
+    
+''' This function does all the formatting for a dataframe made from one data 
+file: it fixes files in the old format, names the columns based on whether the 
+file is weather or sensor data, removes sensor humidities over 100%, and then 
+calls "df_formatter." It is passed to "load_cached_file," which only calls it 
+for data that isn't in the cache yet. This function was implemented 10/18/2026. 
+The weather temperatures are converted to degrees Celsius here, and then the 
+derived columns (absolute humidity, dew point, and vapor pressure deficit, see 
+psychrometrics.py) are added, so both are saved in the cache. When profiling, 
+its time is counted as the "format" stage (see stageProfiler.py). '''
+def file_formatter(dataframe, infile):
+    with profiler.stage("format"):
+        old_file_formatter(dataframe, infile)                                                                     # This formats any files that are in the old format to the new format
+        dataframe.columns = [0, 1, 2, 3, 4]
+        if ("-" in str(dataframe.iloc[0][0])):                                                                    # Denotes weather data
+            dataframe.rename(columns = {0: "Date", 1: "Time",  2: "Relative Humidity", 3: "Temperature", 4: "Precipitation"}, inplace = True)
+        else:
+            dataframe.rename(columns = {0: "Port", 1: "Date",  2: "Time", 3: "Relative Humidity", 4: "Temperature"}, inplace = True)
+            dataframe.drop(dataframe[dataframe["Relative Humidity"].astype(float) > 100].index, inplace = True)
+        df_formatter(dataframe)
+        if ("Precipitation" in dataframe.columns.tolist()):                                                      # The weather temperatures were collected in degrees Fahrenheit, so convert them to degrees Celsius
+            dataframe["Temperature"] = fahrenheit_to_celsius(dataframe["Temperature"])
+        add_derived(dataframe, (measurement_dtype == np.float32))
+        return dataframe
+
+''' ================================================================================================================== '''
+''' ============================================ PART 2: STATISTICS TABLE ============================================ '''
+''' ================================================================================================================== '''
+
+# This function defines the bounds to use for titling the displayed statistics.
+def stat_bounds(start, end):
+    title_start = str(start)[:10] + " at " + str(start)[(10 + 1):]
+    title_end = str(end)[:10] + " at " + str(end)[(10 + 1):]
+    return (title_start, title_end)
+
+''' This function defines the elements of the statistics dataframe printed to 
+the screen. "num" is 0 for humidities and 1 for temperatures, and "accumulator" 
+holds the statistics for the range (see rollups.py). The mean and standard 
+deviation go in the first two rows, the minimum and maximum go in the next two, 
+and the number of points goes in the last row. The minimum, maximum, and number 
+of points were added 10/18/2026. '''
+def statistics_placer(stat_df, num, index, accumulator):
+    column = stat_df.columns.tolist()[index]
+    stat_df.loc[stat_df.index.tolist()[num], column] = str(np.round(accumulator.average(), 4)) + " +/- " + str(np.round(accumulator.std(), 4))
+    stat_df.loc[stat_df.index.tolist()[num + 2], column] = str(np.round(accumulator.low(), 4)) + " / " + str(np.round(accumulator.high(), 4))
+    stat_df.loc[stat_df.index.tolist()[4], column] = str(accumulator.count)
+
+# This function simply plots the statistics dataframe. It's included for organizational purposes.
+def printing_stats(dataframe, title_start, title_end):
+    print("Mean and Standard Deviation from {0} to {1}".format(title_start, title_end))
+    print(dataframe)
+    print("=================================================================================")
+
+''' ================================================================================================================== '''
+''' ============================================ PART 3: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
@@ -0,0 +1,137 @@
+import io                    # Lets pandas read the bytes of a data file as if they were a file
+import numpy as np           # Used for finding the lines of a data file that have the wrong number of columns
+import pandas as pd          # Used for parsing the data files into dataframes
+from stageProfiler import profiler   # Times the reading and parsing when profiling (see stageProfiler.py)
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This module loads the data files written by sensorData.py and
+weatherData.py. NEW_READER.py used to read each file with the slow Python
+engine of pd.read_csv (one line per row), split every row into columns as
+strings, and then loop over the whole dataframe again and again to get rid of
+rows that were too long (i.e. "This query is already being processed" from
+WTTR). Here, the whole file is checked for bad lines at once, and only the good
+lines are handed to the fast C engine of pd.read_csv, which gives every column
+a fixed type right away. The number of bad lines is counted and returned so
+it can be reported to the user. This was implemented 10/18/2026.
+
+The two layouts we know about are the following:
+1) Sensor data --- [PORT] [DATE] [TIME] [RELATIVE HUMIDITY] [TEMPERATURE]
+2) Weather data --- [DATE] [TIME] [RELATIVE HUMIDITY] [TEMPERATURE] [PRECIPITATION]
+
+Files in the old format (with an index as the first column) are loaded the
+same way and are fixed afterwards by "old_file_formatter" in NEW_READER.py. '''
+
+''' ================================================================================================================== '''
+''' ============================================== PART 1: HELPER FUNCTIONS ========================================== '''
+''' ================================================================================================================== '''
+
+''' These functions figure out which lines of a file are good and what type
+each of their columns should be. A line is good if it has five columns (or six
+if most of the lines in the file have six, which means it's old weather data). '''
+
+''' ================================================================================================================== '''
+
+# This function returns the start and end (not including the newline) of every complete line in a buffer, as well as the number of spaces in each line.
+def line_spans(data):
+    newlines = np.flatnonzero(data == ord("\n"))
+    starts = np.concatenate(([0], newlines[:-1] + 1)) if (len(newlines) > 0) else np.zeros(0, dtype = np.int64)
+    ends = newlines
+    lengths = ends - starts
+    carriage = (lengths > 0) & (data[np.maximum(ends - 1, 0)] == ord("\r"))   # Don't count a "\r" at the end of a line as part of it
+    lengths = lengths - carriage
+    space_counts = np.concatenate(([0], np.cumsum(data == ord(" "), dtype = np.int64)))
+    spaces = space_counts[starts + lengths] - space_counts[starts]
+    return (starts, lengths, spaces)
+
+# This function decides what type each column should be based on a good line: integers in the first column (port or index), strings for dates and times, and floats for the measurements.
+def column_types(line):
+    types = {}
+    for i, token in enumerate(line.split(" ")):
+        if (("-" in token[1:]) or (":" in token)):
+            types[i] = str
+        elif ((i == 0) and token.isdigit()):
+            types[i] = np.int64
+        else:
+            types[i] = np.float64
+    return types
+
+''' ================================================================================================================== '''
+''' ================================================ PART 2: LOADING ================================================= '''
+''' ================================================================================================================== '''
+
+''' This function loads a data file (starting "offset" bytes into it) and
+returns a tuple of three things: a dataframe whose columns are labeled 0, 1,
+2, ... like the ones NEW_READER.py used to make, the number of lines that were
+skipped because they were malformed, and the byte offset just after the last
+complete line that was read. Only complete lines (ending in a newline) are
+read, since a line without one is still being written; the returned offset is
+where a FileTailer should pick up from. Blank lines aren't counted as
+malformed. If "end" is given, reading stops at that byte offset (used by
+offsetIndex.py to read only the lines between two dates).
+
+10/18/2026 UPDATE: The bytes are parsed by "parse_buffer," so that the time 
+spent parsing can be told apart from the time spent reading when profiling (see 
+stageProfiler.py). The bytes read and the malformed lines are counted, too. '''
+
+''' ================================================================================================================== '''
+
+def load_data_file(path, offset = 0, end = None):
+    with open(path, "rb") as f:
+        f.seek(offset)
+        if (end is None):
+            buffer = f.read()
+        else:
+            buffer = f.read(max(end - offset, 0))
+    profiler.count("bytes read", len(buffer))
+    with profiler.stage("parse"):
+        df, n_malformed, end_offset = parse_buffer(buffer, offset)
+    profiler.count("lines rejected", n_malformed)
+    return (df, n_malformed, end_offset)
+
+# This function parses the bytes read from a data file ("offset" bytes into it) and returns the same three things as "load_data_file."
+def parse_buffer(buffer, offset):
+    complete = buffer.rfind(b"\n") + 1                 # Everything after the last newline is still being written
+    data = np.frombuffer(buffer, dtype = np.uint8, count = complete)
+    starts, lengths, spaces = line_spans(data)
+    nonblank = lengths > 0
+    if (nonblank.any() == False):
+        return (pd.DataFrame(), 0, offset + complete)
+    n_spaces = 4                                       # Both layouts have five columns...
+    if (np.count_nonzero(spaces == 5) > np.count_nonzero(spaces == 4)):
+        n_spaces = 5                                   # ...unless the file is old weather data, which has six
+    good = nonblank & (spaces == n_spaces)
+    n_malformed = int(np.count_nonzero(nonblank & (good == False)))
+    if (good.any() == False):
+        return (pd.DataFrame(), n_malformed, offset + complete)
+    if (n_malformed == 0):
+        good_bytes = buffer[:complete]
+    else:
+        keep = np.repeat(good, np.diff(np.concatenate((starts, [complete]))))   # Keep every byte (including the newline) of each good line
+        good_bytes = data[keep].tobytes()
+    first = int(np.argmax(good))
+    types = column_types(buffer[starts[first]:(starts[first] + lengths[first])].decode(errors = "replace"))
+    names = list(range(n_spaces + 1))
+    try:
+        df = pd.read_csv(io.BytesIO(good_bytes), sep = " ", header = None, names = names, dtype = types, engine = "c")
+    except ValueError:                                 # A measurement couldn't be read as a number, so read as strings and convert what we can
+        df = pd.read_csv(io.BytesIO(good_bytes), sep = " ", header = None, names = names, dtype = str, engine = "c")
+        for column in types:
+            if (types[column] != str):
+                df[column] = pd.to_numeric(df[column], errors = "coerce")
+    incomplete = df.isnull().any(axis = 1)             # Rows with missing or unreadable values are malformed, too
+    if (incomplete.any() == True):
+        n_malformed += int(incomplete.sum())
+        df = df[incomplete == False].reset_index(drop = True)
+        for column in types:
+            if (types[column] == np.int64):
+                df[column] = df[column].astype(np.int64)
+    return (df, n_malformed, offset + complete)
+
+''' ================================================================================================================== '''
+''' ============================================ PART 3: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
@@ -0,0 +1,151 @@
+import time                 # Used for keeping track of when to fetch again and how old the cached weather data is
+import collections          # Used for remembering when the weather data last changed
+import statistics           # Used for finding the usual time between changes
+import requests             # Used for catching the errors from fetching
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This module decides when weatherData.py should ask WTTR for new weather
+data. Before, WTTR was asked every "rest_time" (10) seconds, even though the
+humidity, temperature, and precipitation it gives only change every several
+minutes, so almost every request got the same answer back (and WTTR getting
+over 1M requests a day is why it kept saying "Unknown location"). Now the last
+answer is kept (the "cache") and handed out until it's "ttl" seconds old, and
+WTTR is only asked again when a request is due. The time between requests
+works like this:
+1) Every time the answer comes back the same, the time between requests grows
+   by "backoff" times, up to "max_interval" seconds.
+2) Once the data has changed a few times, the usual time between changes is
+   known, and requests are never spaced out more than that time divided by
+   "resolution," so real changes are still caught soon after they happen.
+3) When the answer changes before the usual time between changes is known, the
+   time between requests goes back to "min_interval."
+4) When WTTR says "Unknown location" (too many requests), the program doesn't
+   stop for an hour anymore. It keeps handing out the cached data and asks again
+   after "limit_wait" seconds, doubling the wait every time it happens again (up
+   to "max_limit_wait" seconds).
+5) If the server sends an ETag or Last-Modified header, it's sent back with the
+   next request so the server can answer "304 Not Modified" without sending the
+   data again.
+
+This cuts the number of requests by an order of magnitude or more while the
+data file still gets a line every "rest_time" seconds. The URL can point to any
+server (i.e. weatherStub.py on this computer for testing). This was implemented
+10/18/2026. '''
+
+''' ================================================================================================================== '''
+''' =============================================== PART 1: FETCH SCHEDULER ========================================== '''
+''' ================================================================================================================== '''
+
+''' Some features of note here are the following:
+1) scheduler.get() --- Asks the server for new data if a request is due and returns the cached data (None if there isn't any from the last "ttl" seconds)
+2) scheduler.refresh() and scheduler.cached() --- The two halves of "get" (weatherData.py runs "refresh" on a pool of threads so several locations can be fetched at once)
+3) scheduler.due() --- Tells whether a request is due
+4) scheduler.requests --- Number of requests sent so far
+5) scheduler.interval --- Number of seconds until the next request (after the last one)
+
+"name" (i.e. the location) is put at the start of anything the scheduler prints. '''
+
+''' ================================================================================================================== '''
+
+class FetchScheduler:
+    def __init__(self, session, url, min_interval = 10, max_interval = 900, ttl = 1800, backoff = 1.5, resolution = 4, limit_wait = 60, max_limit_wait = 3600, timeout = 30, name = "WTTR"):
+        self.session = session
+        self.name = name
+        self.url = url
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.ttl = ttl
+        self.backoff = backoff
+        self.resolution = resolution
+        self.first_limit_wait = limit_wait
+        self.limit_wait = limit_wait                             # Number of seconds to wait the next time WTTR says "Unknown location"
+        self.max_limit_wait = max_limit_wait
+        self.timeout = timeout
+        self.text = None                                         # Last answer from the server (the cache)
+        self.fetched = None                                      # Time the cache was last confirmed
+        self.etag = None
+        self.last_modified = None
+        self.changes = collections.deque(maxlen = 8)             # Times of the last few changes
+        self.interval = min_interval
+        self.next_fetch = 0
+        self.requests = 0
+
+    def due(self):
+        return (time.monotonic() >= self.next_fetch)
+
+    # This function returns the usual number of seconds between changes (None if the data hasn't changed enough times to tell).
+    def change_gap(self):
+        if (len(self.changes) < 2):
+            return None
+        times = list(self.changes)
+        return statistics.median([times[i + 1] - times[i] for i in range(len(times) - 1)])
+
+    # This function picks the time of the next request after an answer comes back.
+    def schedule(self, changed, now):
+        gap = self.change_gap()
+        ceiling = self.max_interval
+        if (gap is not None):
+            ceiling = min(self.max_interval, max(self.min_interval, gap / self.resolution))
+        if ((changed == True) and (gap is None)):
+            self.interval = self.min_interval
+        elif (changed == True):
+            self.interval = ceiling
+        else:
+            self.interval = max(self.min_interval, min(self.interval * self.backoff, ceiling))
+        self.next_fetch = now + self.interval
+
+    def fetch(self):
+        headers = {}
+        if (self.etag is not None):
+            headers["If-None-Match"] = self.etag
+        if (self.last_modified is not None):
+            headers["If-Modified-Since"] = self.last_modified
+        self.requests += 1
+        res = self.session.get(self.url, headers = headers, timeout = self.timeout)
+        now = time.monotonic()
+        if ((res.status_code == 304) and (self.text is not None)):   # Nothing changed, so the server didn't send the data again
+            self.fetched = now
+            self.schedule(False, now)
+            return
+        if ("Unknown location" in res.text):
+            print("{0}: WTTR had too many requests. Let's let it reset. Asking again in {1} seconds.".format(self.name, self.limit_wait))
+            self.next_fetch = now + self.limit_wait
+            self.limit_wait = min(2 * self.limit_wait, self.max_limit_wait)
+            return
+        self.limit_wait = self.first_limit_wait
+        self.etag = res.headers.get("ETag")
+        self.last_modified = res.headers.get("Last-Modified")
+        changed = ((self.text is not None) and (res.text != self.text))
+        if (changed == True):
+            self.changes.append(now)
+        self.fetched = now                                       # Set before the text, since "cached" may be reading them from another thread
+        self.text = res.text
+        self.schedule(changed, now)
+
+    def refresh(self):
+        if (self.due() == True):
+            try:
+                self.fetch()
+            except requests.exceptions.RequestException as error:
+                print("{0}: Raising {1}".format(self.name, type(error).__name__))
+                self.next_fetch = time.monotonic() + 2 * self.min_interval
+                print("{0}: Asking again in {1} seconds.".format(self.name, 2 * self.min_interval))
+
+    def cached(self):
+        text, fetched = self.text, self.fetched
+        if ((text is None) or (time.monotonic() - fetched > self.ttl)):
+            return None
+        return text
+
+    def get(self):
+        self.refresh()
+        return self.cached()
+
+''' ================================================================================================================== '''
+''' ============================================ PART 2: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
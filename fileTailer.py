@@ -0,0 +1,103 @@
+import os   # Used for checking the size and identity (inode) of the data files being followed
+from stageProfiler import profiler   # Counts the bytes read when profiling (see stageProfiler.py)
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This module follows a data file that is being appended to by sensorData.py
+or weatherData.py, similarly to "tail -f." Before, NEW_READER.py reread every
+file from the beginning every 10 seconds just to look at its last line, which
+meant that refreshing got slower the longer we collected data and that any
+lines written between refreshes (other than the very last one) were lost. The
+FileTailer class instead remembers how far into the file it has read (a byte
+offset) and only reads the bytes that were added after that offset, so a
+refresh only costs as much as the new data. This was implemented 10/18/2026. '''
+
+''' ================================================================================================================== '''
+''' ================================================ PART 1: FILE TAILER ============================================= '''
+''' ================================================================================================================== '''
+
+''' Some features of note here are the following:
+1) Only complete lines (those ending in a newline) are returned. If the
+collector is in the middle of writing a line when we read, the partial line is
+held onto and finished on the next read.
+2) If the file becomes smaller than our offset (it was truncated) or is
+replaced by a different file with the same name (it was rotated), the tailer
+starts over from the beginning of the file.
+3) By default, the tailer starts at the end of the last complete line in the
+file, since NEW_READER.py has already loaded everything before that. '''
+
+''' ================================================================================================================== '''
+
+class FileTailer:
+    def __init__(self, path, offset = None):
+        self.path = path
+        self.partial = b""                               # Bytes of a line that hasn't been finished yet
+        self.inode = None                                # Identity of the file we're following (used for noticing rotation)
+        if (offset is None):
+            self.offset = self.last_complete_offset()    # Start after the last complete line in the file
+        else:
+            self.offset = offset
+        try:
+            self.inode = os.stat(self.path).st_ino
+        except OSError:
+            self.inode = None
+
+    # This function finds the byte offset just after the last newline in the file (or 0 if there isn't one).
+    def last_complete_offset(self):
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                end = f.tell()
+                position = end
+                while (position > 0):                     # Read backwards in blocks until we find a newline
+                    block_size = min(4096, position)
+                    position -= block_size
+                    f.seek(position)
+                    block = f.read(block_size)
+                    newline = block.rfind(b"\n")
+                    if (newline != -1):
+                        return position + newline + 1
+                return 0
+        except OSError:
+            return 0
+
+    # This function starts reading the file over from the beginning (used after truncation or rotation).
+    def reset(self, inode):
+        self.offset = 0
+        self.partial = b""
+        self.inode = inode
+
+    # This function returns a list of all the complete lines (as strings, without newlines) added since the last read.
+    def read_new_lines(self):
+        try:
+            stats = os.stat(self.path)
+        except OSError:                                   # The file may be missing for a moment while it's being rotated
+            return []
+        if ((self.inode is not None) and (stats.st_ino != self.inode)):
+            self.reset(stats.st_ino)                      # The file was replaced
+        elif (stats.st_size < self.offset):
+            self.reset(stats.st_ino)                      # The file was truncated
+        self.inode = stats.st_ino
+        if (stats.st_size == self.offset):
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            chunk = f.read()
+        self.offset += len(chunk)
+        profiler.count("bytes read", len(chunk))
+        chunk = self.partial + chunk
+        newline = chunk.rfind(b"\n")
+        if (newline == -1):                               # No complete line yet
+            self.partial = chunk
+            return []
+        self.partial = chunk[(newline + 1):]
+        lines = chunk[:newline].decode(errors = "replace").split("\n")
+        return [line.rstrip("\r") for line in lines if (line.strip() != "")]
+
+''' ================================================================================================================== '''
+''' ============================================ PART 2: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
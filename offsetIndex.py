@@ -0,0 +1,181 @@
+import os                                       # Used for finding the index files and checking the size of the data files
+import numpy as np                              # Used for finding the lines and searching the index
+import pandas as pd                             # Used for reading the dates of the lines in the index
+from dataLoader import load_data_file           # Used for parsing the lines between two dates
+from dataCache import cache_folder, signature   # The index is saved next to the cache and checked the same way
+from segmentStore import line_time              # Used for finding the date and time in a line
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This module lets NEW_READER.py read only the part of a data file between
+two dates. For every "index_every"th line of a data file, the index remembers
+the line's date and the byte offset where the line starts. With that, the line
+just before the start date (or the line just after the end date) can be found
+with a binary search, and the file can be read starting from one and stopping
+at the other, so none of the lines far outside the dates are ever parsed. The
+index of a data file is saved in .reader_cache next to it (like the cache in
+dataCache.py) as "[file name].index.npz," so it's only built once. If lines are
+added to the end of the file, only the new lines are looked at to extend the
+index. If the file was changed any other way, the index is built again. This
+was implemented 10/18/2026.
+
+This only works if the lines in the file are in chronological order, which
+they are for files written by sensorData.py and weatherData.py. If the dates in
+the index go backwards, the whole file is read instead. '''
+
+''' ================================================================================================================== '''
+''' ============================================== PART i: VARIABLES ================================================= '''
+''' ================================================================================================================== '''
+
+index_every = 1000      # One line in every this many goes into the index
+index_version = 1       # Indexes saved with a different version are ignored and rebuilt
+block_size = 1 << 24    # Number of bytes read at a time while building the index (16 MB)
+
+''' ================================================================================================================== '''
+''' ============================================== PART 1: BUILDING THE INDEX ======================================== '''
+''' ================================================================================================================== '''
+
+''' An index is a dictionary with the following:
+1) "times" and "offsets" --- The dates (as datetime64[ns] integers) and byte offsets of the lines in the index
+2) "lines" --- Number of lines looked at so far (so the next one to go in the index is known when it's extended)
+3) "size" --- Byte offset just after the last complete line looked at
+4) "signature" --- The bytes right before "size," used for checking that the file was only appended to '''
+
+''' ================================================================================================================== '''
+
+# This function returns the path of the index file for a data file.
+def index_path(path):
+    folder, name = os.path.split(os.path.abspath(path))
+    return os.path.join(folder, cache_folder, name + ".index.npz")
+
+def read_index(path):
+    try:
+        with np.load(index_path(path), allow_pickle = False) as saved:
+            index = {name: saved[name] for name in saved.files}
+    except (OSError, ValueError, KeyError):
+        return None
+    if (int(index.get("version", -1)) != index_version):
+        return None
+    return {"times": index["times"], "offsets": index["offsets"], "lines": int(index["lines"]), "size": int(index["size"]), "signature": index["signature"].tobytes()}
+
+# This function saves an index. If it can't be written (i.e. the folder is read only), nothing happens.
+def write_index(path, index):
+    destination = index_path(path)
+    temporary = destination + ".tmp.npz"
+    try:
+        os.makedirs(os.path.dirname(destination), exist_ok = True)
+        np.savez(temporary, version = np.array(index_version), times = index["times"], offsets = index["offsets"], lines = np.array(index["lines"]),
+                 size = np.array(index["size"]), signature = np.frombuffer(index["signature"], dtype = np.uint8))
+        os.replace(temporary, destination)
+    except OSError:
+        pass
+
+# This function looks at the lines of a data file from "index['size']" on and adds every "index_every"th one to the index.
+def extend_index(path, index):
+    times, offsets = [index["times"]], [index["offsets"]]
+    with open(path, "rb") as f:
+        f.seek(index["size"])
+        while True:
+            block = f.read(block_size)
+            complete = block.rfind(b"\n") + 1
+            if (complete == 0):
+                break
+            data = np.frombuffer(block, dtype = np.uint8, count = complete)
+            starts = np.concatenate(([0], np.flatnonzero(data == ord("\n"))[:-1] + 1))
+            numbers = index["lines"] + np.arange(len(starts))
+            new_times, new_offsets = [], []
+            for start in starts[numbers % index_every == 0]:                   # Only the lines that go into the index are looked at
+                stop = block.find(b"\n", start)
+                stamp = line_time(block[start:stop].decode(errors = "replace").strip())
+                if (stamp is None):
+                    continue
+                try:
+                    new_times.append(pd.Timestamp(stamp[0] + " " + stamp[1]).value)
+                except ValueError:
+                    continue
+                new_offsets.append(index["size"] + int(start))
+            times.append(np.array(new_times, dtype = np.int64))
+            offsets.append(np.array(new_offsets, dtype = np.int64))
+            index["lines"] += len(starts)
+            index["size"] += complete
+            if (complete < len(block)):                                         # The rest is a line that's still being written
+                break
+            f.seek(index["size"])
+    index["times"] = np.concatenate(times)
+    index["offsets"] = np.concatenate(offsets)
+    index["signature"] = signature(path, index["size"])
+    return index
+
+# This function returns the index of a data file, building or extending it (and saving it) if needed.
+def update_index(path):
+    index = read_index(path)
+    size = os.stat(path).st_size
+    if ((index is None) or (size < index["size"]) or (signature(path, index["size"]) != index["signature"])):
+        index = {"times": np.zeros(0, dtype = np.int64), "offsets": np.zeros(0, dtype = np.int64), "lines": 0, "size": 0, "signature": b""}
+    elif (size == index["size"]):
+        return index
+    index = extend_index(path, index)
+    write_index(path, index)
+    return index
+
+''' ================================================================================================================== '''
+''' ============================================== PART 2: USING THE INDEX =========================================== '''
+''' ================================================================================================================== '''
+
+''' "byte_range" returns where to start and stop reading a data file to get
+every line between "start" and "end" (either can be None to leave that side
+open). Reading starts at the last line in the index before "start" and stops at
+the first line in the index after "end" (None means the end of the file), so a
+few lines outside the dates are read, but never more than "index_every" on
+either side.
+
+"load_file_window" is used in place of load_cached_file (see dataCache.py)
+when NEW_READER.py has assigned dates. It returns the formatted dataframe of
+the lines between the dates, the number of malformed lines among them, and the
+byte offset a FileTailer should start following the file from. The extra lines 
+read outside the dates are dropped once they're formatted, so the dataframe 
+(and the statistics made from it when no statistics dates are assigned) covers 
+exactly the dates asked for. '''
+
+''' ================================================================================================================== '''
+
+def byte_range(index, start, end):
+    times, offsets = index["times"], index["offsets"]
+    if ((len(times) == 0) or (np.any(np.diff(times) < 0) == True)):             # The index can't be trusted if the lines aren't in order
+        return (0, None)
+    low, high = 0, None
+    if (start is not None):
+        position = int(np.searchsorted(times, pd.Timestamp(start).value, side = "left")) - 1
+        if (position >= 0):
+            low = int(offsets[position])
+    if (end is not None):
+        position = int(np.searchsorted(times, pd.Timestamp(end).value, side = "right"))
+        if (position < len(times)):
+            high = int(offsets[position])
+    return (low, high)
+
+def load_file_window(path, formatter, start, end):
+    index = update_index(path)
+    low, high = byte_range(index, start, end)
+    df, n_malformed, end_offset = load_data_file(path, low, high)
+    if (high is not None):
+        end_offset = index["size"]                                               # The lines after the end date aren't needed, so start following the file after them
+    if (len(df) == 0):
+        return (pd.DataFrame(), n_malformed, end_offset)
+    df = formatter(df, path)
+    keep = np.ones(len(df), dtype = bool)
+    if (start is not None):
+        keep &= (df.index >= pd.Timestamp(start))
+    if (end is not None):
+        keep &= (df.index <= pd.Timestamp(end))
+    if (keep.all() == False):                                                    # Drop the lines read outside the dates
+        df = df[keep]
+    return (df, n_malformed, end_offset)
+
+''' ================================================================================================================== '''
+''' ============================================ PART 3: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
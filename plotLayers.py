@@ -0,0 +1,261 @@
+import numpy as np                  # Used for picking which points to plot
+import matplotlib.dates as mdates   # Used for turning datetimes into the numbers matplotlib plots
+import time                         # Used for timing the redraws when profiling
+from stageProfiler import profiler  # Records how long the redraws take when profiling (see stageProfiler.py)
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This module helps NEW_READER.py plot series with lots of points. A sensor
+that has been running for a couple of weeks has well over 100,000 points, but
+the plot is only about a thousand pixels wide, so almost all of those points
+end up drawn on top of each other. Drawing them all made plotting and zooming
+very slow.
+
+Instead, the x-range that is showing is split into one bucket per pixel, and
+for each bucket, only the first, last, lowest, and highest points are plotted.
+This keeps every spike and dip that would have been visible, so the plot looks
+the same, but each line has at most a few thousand points. Whenever the x-range
+changes (i.e. when zooming or panning) or the window is resized, the points are
+picked again from the full series. This was implemented 10/18/2026.
+
+The live loop of NEW_READER.py used to clear the axes and plot every line again
+every refresh, so each refresh got slower as more lines and data piled up. Now
+the lines are made once and given the updated series with "update," and the
+lines are "animated" (see Part 3): the rest of the figure (axes, ticks, labels,
+legend) is drawn once and saved as a picture, and each refresh only pastes that
+picture back and draws the lines on top of it. The whole figure is only drawn
+again when the range of dates or the limits of an axis change.
+
+10/18/2026 UPDATE: A line can be given a "summary" (see rollups.py), which
+returns the lowest and highest values in each pixel from the per-minute,
+per-hour, or per-day rollups of the series. When the plot is zoomed out far
+enough for the summary to work, the points come from it instead of the full
+series, so zooming out over months of data doesn't look at every point. '''
+
+''' ================================================================================================================== '''
+''' ============================================ PART 1: PICKING THE POINTS =========================================== '''
+''' ================================================================================================================== '''
+
+''' This function returns the positions of the points to plot. "times" is a
+sorted array of datetime64[ns] values, "values" are the measurements, "low" and
+"high" are the ends of the x-range showing (as datetime64[ns] values), and
+"n_buckets" is the number of buckets (pixels) to split that range into. The
+points just outside the range on either side are kept so the lines run off the
+edges of the plot instead of stopping short. If there aren't many more points
+than buckets, every point in the range is kept. '''
+
+''' ================================================================================================================== '''
+
+def decimate_indices(times, values, low, high, n_buckets):
+    stamps = times.view(np.int64)
+    first = max(int(np.searchsorted(stamps, np.int64(low.astype("datetime64[ns]").astype(np.int64)), side = "left")) - 1, 0)
+    last = min(int(np.searchsorted(stamps, np.int64(high.astype("datetime64[ns]").astype(np.int64)), side = "right")) + 1, len(stamps))
+    n_buckets = max(int(n_buckets), 1)
+    if ((last - first) <= 4 * n_buckets):
+        return np.arange(first, last)
+    span = max(int(stamps[last - 1]) - int(stamps[first]), 1)
+    buckets = ((stamps[first:last] - stamps[first]).astype(np.float64) * (n_buckets / span)).astype(np.int64)
+    buckets = np.minimum(buckets, n_buckets - 1)
+    starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))   # The points are sorted, so each bucket is one run of points
+    ends = np.concatenate((starts[1:], [len(buckets)]))
+    segment = values[first:last]
+    filled = np.where(np.isnan(segment), np.inf, segment)
+    lows = np.minimum.reduceat(filled, starts)
+    highs = np.maximum.reduceat(np.where(np.isnan(segment), -np.inf, segment), starts)
+    run = np.repeat(np.arange(len(starts)), ends - starts)
+    low_positions = np.flatnonzero(filled == lows[run])
+    low_positions = low_positions[np.unique(run[low_positions], return_index = True)[1]]      # First lowest point in each bucket
+    high_positions = np.flatnonzero(np.where(np.isnan(segment), -np.inf, segment) == highs[run])
+    high_positions = high_positions[np.unique(run[high_positions], return_index = True)[1]]   # First highest point in each bucket
+    keep = np.unique(np.concatenate((starts, ends - 1, low_positions, high_positions)))
+    return keep + first
+
+''' ================================================================================================================== '''
+''' ========================================== PART 2: LEVEL-OF-DETAIL LINES ========================================= '''
+''' ================================================================================================================== '''
+
+''' A DecimatedLine is a matplotlib line that remembers the full series it
+came from. LevelOfDetail keeps track of all these lines, plots new ones with
+"plot," and picks their points again when an axis's x-range changes or the
+figure is resized. "update" gives a line the updated series (used in the live
+loop of NEW_READER.py) and "forget" removes an axis's lines from the plot.
+
+Some features of note here are the following:
+1) lod.plot([axis], [times], [values], [summary (optional)], [keyword arguments]) --- Works like axis.plot, but with a datetime64 array and the measurements
+2) lod.refresh_axis([axis]) --- Picks the points of an axis's lines again for the x-range showing
+3) lod.update([decimated line], [times], [values]) --- Gives a line the updated series, returning True if the axis's limits had to change
+4) lod.forget([axis]) --- Removes an axis's lines from the plot and stops keeping track of them '''
+
+''' ================================================================================================================== '''
+
+class DecimatedLine:
+    def __init__(self, line, times, values, summary = None):
+        self.line = line
+        self.summary = summary                               # Returns the points to plot from the rollups (None means always use the full series)
+        self.set_source(times, values)
+
+    def set_source(self, times, values):
+        self.times = np.asarray(times).astype("datetime64[ns]", copy = False)
+        self.values = np.asarray(values)                     # Kept in the store's own type (i.e. float32), so the whole series isn't copied on every refresh
+
+    # This function picks the points to plot for the x-range showing on the line's axis.
+    def refresh(self, n_buckets):
+        if (len(self.times) == 0):
+            self.line.set_data([], [])
+            return
+        low, high = self.line.axes.get_xlim()
+        low = np.datetime64(mdates.num2date(low).replace(tzinfo = None), "ns")
+        high = np.datetime64(mdates.num2date(high).replace(tzinfo = None), "ns")
+        if (self.summary is not None):
+            points = self.summary(low, high, n_buckets)
+            if (points is not None):                         # The pixels are wide enough to use the rollups
+                self.line.set_data(mdates.date2num(points[0]), points[1])
+                return
+        keep = decimate_indices(self.times, self.values, low, high, n_buckets)
+        self.line.set_data(mdates.date2num(self.times[keep]), self.values[keep].astype(np.float64))   # Only the points plotted are widened
+
+class LevelOfDetail:
+    def __init__(self, figure):
+        self.figure = figure
+        self.lines = {}                                      # Lines kept track of, by axis
+        self.connections = {}                                # Axes whose x-range changes we're listening for (and the IDs of the connections)
+        self.figure.canvas.mpl_connect("resize_event", lambda event: self.refresh_all())
+
+    # This function returns the number of buckets (pixels) across an axis.
+    def buckets(self, axis):
+        return max(int(axis.bbox.width), 100)
+
+    def plot(self, axis, times, values, summary = None, **kwargs):
+        axis.xaxis_date()
+        line = axis.plot([], [], **kwargs)[0]
+        decimated = DecimatedLine(line, times, values, summary)
+        self.lines.setdefault(axis, []).append(decimated)
+        if (axis not in self.connections):
+            self.connections[axis] = axis.callbacks.connect("xlim_changed", self.refresh_axis)
+        self.include(axis, decimated, 0)                     # Make sure the axis limits include the data before picking the points
+        decimated.refresh(self.buckets(axis))
+        return decimated
+
+    # This function makes sure an axis's data limits include the values of a line from position "first" on. It returns True if the limits had to change.
+    def include(self, axis, decimated, first):
+        values = decimated.values[first:]
+        if ((len(values) == 0) or (np.isnan(values).all() == True)):
+            return False
+        corners = np.array([[mdates.date2num(decimated.times[first]), np.nanmin(values)],
+                            [mdates.date2num(decimated.times[-1]), np.nanmax(values)]])
+        limits = axis.dataLim
+        if ((limits.y0 <= corners[0][1]) and (corners[1][1] <= limits.y1)):   # The x-range is set by hand, so only the y-limits matter
+            return False
+        axis.update_datalim(corners)
+        axis.autoscale_view()
+        return True
+
+    # This function gives a line the updated series and picks its points again. Only the new points are looked at to check the axis's limits.
+    def update(self, decimated, times, values):
+        seen = len(decimated.times)
+        decimated.set_source(times, values)
+        axis = decimated.line.axes
+        changed = self.include(axis, decimated, min(seen, len(decimated.times)))
+        decimated.refresh(self.buckets(axis))
+        return changed
+
+    def refresh_axis(self, axis):
+        for decimated in self.lines.get(axis, []):
+            decimated.refresh(self.buckets(axis))
+
+    def refresh_all(self):
+        for axis in self.lines:
+            self.refresh_axis(axis)
+
+    def forget(self, axis):
+        for decimated in self.lines.pop(axis, []):
+            if (decimated.line in axis.lines):               # The line is already gone if the axis was cleared
+                decimated.line.remove()
+        if (axis in self.connections):
+            axis.callbacks.disconnect(self.connections.pop(axis))
+
+''' ================================================================================================================== '''
+''' ================================================= PART 3: BLITTING =============================================== '''
+''' ================================================================================================================== '''
+
+''' A BlitManager redraws only the lines it's given instead of the whole
+figure. The lines are marked as "animated," which means matplotlib leaves them
+out when it draws the figure. Every time the figure is drawn, a picture of it
+(the "background") is saved and the lines are drawn on top. "update" then pastes
+the background back and draws only the lines, which is much faster than drawing
+all the axes, ticks, and labels again. If the backend can't do this (or nothing
+has been drawn yet), the whole figure is drawn instead.
+
+Animated lines also get left out of saved figures, so "set_animated(False)"
+must be used before saving the figure and "set_animated(True)" after.
+
+10/18/2026 UPDATE: The time each redraw takes is given to the profiler as the
+"redraw" stage (see stageProfiler.py). Blitting is done right away, so it's
+simply timed. The whole figure is only drawn once matplotlib gets around to it
+(i.e. during plt.pause), so for those, the time is from "draw_idle" being
+called to the figure being drawn.
+
+Some features of note here are the following:
+1) blit.add([line]) --- Starts redrawing a line with the manager
+2) blit.update() --- Redraws the lines (call after changing their data)
+3) blit.set_animated([boolean]) --- Turns the animation of all the lines on or off
+4) blit.draw_idle() --- Asks for the whole figure to be drawn (use in place of figure.canvas.draw_idle) '''
+
+''' ================================================================================================================== '''
+
+class BlitManager:
+    def __init__(self, figure):
+        self.figure = figure
+        self.artists = []
+        self.animated = bool(figure.canvas.supports_blit)   # Lines are only animated if the backend can blit (otherwise they'd never be drawn)
+        self.background = None
+        self.requested = None   # When the figure was asked to be drawn (None if it hasn't been since it was last drawn)
+        self.figure.canvas.mpl_connect("draw_event", self.on_draw)
+
+    def add(self, artist):
+        artist.set_animated(self.animated)
+        self.artists.append(artist)
+
+    def set_animated(self, animated):
+        self.animated = animated and bool(self.figure.canvas.supports_blit)
+        for artist in self.artists:
+            artist.set_animated(self.animated)
+        self.background = None
+
+    # This function saves the background whenever the whole figure is drawn (i.e. after zooming or resizing) and draws the lines on top of it.
+    def on_draw(self, event):
+        if (self.animated == True):
+            self.background = self.figure.canvas.copy_from_bbox(self.figure.bbox)
+            self.draw_artists()
+        if (self.requested is not None):
+            profiler.record("redraw", time.perf_counter() - self.requested)
+            self.requested = None
+
+    def draw_idle(self):
+        if (self.requested is None):
+            self.requested = time.perf_counter()
+        self.figure.canvas.draw_idle()
+
+    def draw_artists(self):
+        for artist in self.artists:
+            self.figure.draw_artist(artist)
+
+    def update(self):
+        canvas = self.figure.canvas
+        if ((self.background is None) or (self.animated == False)):
+            self.draw_idle()
+            return
+        started = time.perf_counter()
+        canvas.restore_region(self.background)
+        self.draw_artists()
+        canvas.blit(self.figure.bbox)
+        canvas.flush_events()
+        profiler.record("redraw", time.perf_counter() - started)
+
+''' ================================================================================================================== '''
+''' ============================================ PART 4: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
@@ -0,0 +1,104 @@
+import numpy as np   # Used for the calculations on arrays of measurements
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This module calculates the measurements that can be "derived" from the
+relative humidity and temperature: the absolute humidity, the dew point, and
+the vapor pressure deficit. All three come from the saturated vapor pressure
+(the most water vapor the air can hold at a temperature):
+
+1) Saturated vapor pressure (kPa): e_s = A * exp(B * t / (C + t))
+2) Vapor pressure of the air (kPa): e_a = h * e_s (h is the relative humidity as a decimal)
+3) Absolute humidity (g/m^3): (m / (R * T_K)) * 1000 * e_a (m is the molar mass of water, R is the gas constant, T_K is the temperature in Kelvin)
+4) Dew point (degrees Celsius): C * g / (B - g), where g = ln(h) + B * t / (C + t)
+5) Vapor pressure deficit (kPa): e_s - e_a
+
+"abs_hum_calc" in NEW_READER.py used to calculate only the absolute humidity,
+making a new full-length array for every step (and several copies casting
+columns to floats that already were). Here, everything is calculated in one
+pass: the measurements are handled "chunk_rows" at a time, every step writes
+into a few small arrays that are reused for every chunk (small enough to stay
+in the processor's cache), and the results go straight into the final columns.
+The exponential, which is the slow part, is only calculated once for all three.
+The results can be kept as float32 instead of float64 ("use_float32") to halve
+their memory.
+
+NEW_READER.py adds these columns to every dataframe (sensor and weather, after
+the weather temperatures are converted to degrees Celsius) when its files are
+formatted, so they're saved in the cache and reused for plotting, statistics,
+and comparisons instead of being calculated again. This was implemented
+10/18/2026.
+
+Some features of note here are the following:
+1) derive([relative humidities], [temperatures]) --- Returns a dictionary of the derived columns as numpy arrays
+2) add_derived([dataframe]) --- Adds the derived columns to a formatted dataframe '''
+
+''' ================================================================================================================== '''
+''' ============================================== PART i: VARIABLES ================================================= '''
+''' ================================================================================================================== '''
+
+A, B, C = 0.611, 17.502, 240.97   # Constants for the saturated vapor pressure, where [A] = kPa and [C] = degrees Celsius (B is dimensionless)
+m = 18.02                         # Molar mass of water, given in grams per mole
+R = 8.314                         # Universal gas constant, given in terms of Joules per mole-Kelvin
+chunk_rows = 16384                # Number of measurements handled at a time (each work array is then 128 kB)
+use_float32 = False               # If True, the derived columns are float32 instead of float64
+derived_columns = ["Absolute Humidity", "Dew Point", "Vapor Pressure Deficit"]
+
+''' ================================================================================================================== '''
+''' ============================================== PART 1: DERIVED METRICS =========================================== '''
+''' ================================================================================================================== '''
+
+''' "relative_humidity" is in percent and "temperature" is in degrees Celsius.
+A relative humidity of 0 gives a dew point of NaN. '''
+
+''' ================================================================================================================== '''
+
+def derive(relative_humidity, temperature, float32 = None, chunk_rows = chunk_rows):
+    if (float32 is None):
+        float32 = use_float32
+    dtype = np.float32 if (float32 == True) else np.float64
+    rh = np.asarray(relative_humidity)
+    t = np.asarray(temperature)
+    n = len(t)
+    results = {name: np.empty(n, dtype = dtype) for name in derived_columns}
+    abs_hum, dew_point, deficit = results["Absolute Humidity"], results["Dew Point"], results["Vapor Pressure Deficit"]
+    size = max(min(chunk_rows, n), 1)
+    h_work, ratio_work, sat_work = np.empty(size, dtype = dtype), np.empty(size, dtype = dtype), np.empty(size, dtype = dtype)
+    with np.errstate(divide = "ignore", invalid = "ignore"):
+        for first in range(0, n, chunk_rows):
+            last = min(first + chunk_rows, n)
+            k = last - first
+            h, ratio, sat = h_work[:k], ratio_work[:k], sat_work[:k]
+            t_chunk = t[first:last]
+            np.divide(rh[first:last], 100, out = h, casting = "unsafe")           # Relative humidity as a decimal
+            np.add(t_chunk, C, out = ratio, casting = "unsafe")
+            np.divide(t_chunk, ratio, out = ratio, casting = "unsafe")
+            np.multiply(ratio, B, out = ratio)                                    # B * t / (C + t)
+            np.exp(ratio, out = sat)
+            np.multiply(sat, A, out = sat)                                        # Saturated vapor pressure
+            air = deficit[first:last]
+            np.multiply(sat, h, out = air)                                        # Vapor pressure of the air (the deficit is finished below)
+            np.add(t_chunk, 273.15, out = abs_hum[first:last], casting = "unsafe")
+            np.divide(1000 * m / R, abs_hum[first:last], out = abs_hum[first:last])
+            np.multiply(abs_hum[first:last], air, out = abs_hum[first:last])      # Absolute humidity
+            np.subtract(sat, air, out = air)                                      # Vapor pressure deficit
+            np.log(h, out = dew_point[first:last])
+            np.add(dew_point[first:last], ratio, out = dew_point[first:last])     # g = ln(h) + B * t / (C + t)
+            np.subtract(B, dew_point[first:last], out = sat)
+            np.multiply(dew_point[first:last], C, out = dew_point[first:last])
+            np.divide(dew_point[first:last], sat, out = dew_point[first:last])    # Dew point
+    return results
+
+def add_derived(dataframe, float32 = None):
+    results = derive(dataframe["Relative Humidity"].to_numpy(), dataframe["Temperature"].to_numpy(), float32)
+    for name in derived_columns:
+        dataframe[name] = results[name]
+    return dataframe
+
+''' ================================================================================================================== '''
+''' ============================================ PART 2: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
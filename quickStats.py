@@ -0,0 +1,248 @@
+import os                                     # Used for checking that the data files and segment folders exist
+import sys                                    # Allows the user to use command line arguments
+import numpy as np                            # Used for picking out the measurements between the statistics dates
+import pandas as pd                           # Used for the dates and the statistics table
+from dataLoader import load_data_file         # Parses a part of a data file at a time
+from dataFormatter import file_formatter, stat_bounds, statistics_placer, printing_stats, stat_rows   # Formats the data and prints the table the same way NEW_READER.py does
+from runningStats import Accumulator          # Holds the statistics of the measurements read so far
+from offsetIndex import update_index, byte_range   # Used for skipping the lines before the assigned statistics dates
+from segmentStore import segment_files, segment_suffix   # Finds the segments of a segment folder that overlap the statistics dates
+from stageProfiler import profiler             # Times the reading and the statistics when profiling (see stageProfiler.py)
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This script prints the same statistics table as NEW_READER.py (the mean,
+standard deviation, minimum, maximum, and number of points of the humidities
+and temperatures of each source) and then exits, without plotting anything.
+NEW_READER.py loads every file into memory all at once and imports matplotlib
+and tkinter before it even starts, which is a lot of waiting (and memory) when
+only the numbers are wanted for huge files.
+
+Here, each file is read "chunk_bytes" at a time with load_data_file (see
+dataLoader.py), each chunk is formatted with "file_formatter" (see
+dataFormatter.py, so the same old-format fixes, humidities over 100%, and
+weather conversions apply), and the measurements between the statistics dates
+are added to an accumulator for each source (see runningStats.py). The chunk is
+then thrown away, so the memory used stays the same no matter how big the files
+are. If the statistics dates are assigned, the lines before them (and far after
+them) aren't read at all (see offsetIndex.py).
+
+The statistics dates work exactly like "stat_start" and "stat_end" in
+NEW_READER.py, including its quirks: the end date is moved to the first
+measurement at or after it (so one measurement after the end date can be
+counted), and a source with only one date in the range is left as NaN. This was
+implemented 10/18/2026.
+
+It's used with the following command (segment folders can be given in place of
+data files, like in NEW_READER.py):
+
+python quickStats.py [datafile1].txt [datafile2].txt ... '''
+
+''' ================================================================================================================== '''
+''' ============================================== PART i: VARIABLES ================================================= '''
+''' ================================================================================================================== '''
+
+# These two variables are simply shorthand for "True" and "False," like in NEW_READER.py.
+T = True
+F = False
+
+assign_stat_start = F                # Boolean that determines whether the user wants to specify the start date for calculating statistics
+assign_stat_end = F                  # Boolean that determines whether the user wants to specify the end date for calculating statistics
+stat_start = "2024-12-02 00:00:00"   # Assigned start date for statistics (ignored if assign_stat_start == False)
+stat_end = "2024-06-25 09:00:00"     # Assigned end date for statistics (ignored if assign_stat_end == False)
+chunk_bytes = 1 << 22                # Number of bytes of a data file read at a time (4 MB), which sets how much memory is used
+
+metrics = ["Relative Humidity", "Temperature"]   # Measurements in the statistics table (in the order of their rows)
+
+''' ================================================================================================================== '''
+''' =========================================== PART 1: STATISTICS BETWEEN DATES ===================================== '''
+''' ================================================================================================================== '''
+
+''' A WindowStats keeps the statistics of one source between the statistics
+dates ("start" and "end" as datetime64[ns] integers, or None for no limit)
+while its measurements come in a chunk at a time, in any order. To match
+NEW_READER.py, it also keeps the measurements at the first date after "end"
+(in case there isn't a measurement right at "end"), the first date at or after
+"start," and the last date of all, which decide the range NEW_READER.py would
+use. "result" returns the accumulator for a measurement (or None if
+NEW_READER.py would leave it as NaN). '''
+
+''' ================================================================================================================== '''
+
+class WindowStats:
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+        self.inside = {metric: Accumulator() for metric in metrics}   # Measurements between the dates (both included)
+        self.after = {metric: Accumulator() for metric in metrics}    # Measurements at "after_time"
+        self.after_time = None     # First date after "end"
+        self.end_seen = False      # Whether there's a measurement right at "end"
+        self.first_time = None     # First date at or after "start"
+        self.last_time = None      # Last date of all
+
+    def add(self, times, columns):
+        if (len(times) == 0):
+            return
+        self.last_time = int(times.max()) if (self.last_time is None) else max(self.last_time, int(times.max()))
+        keep = (times >= self.start) if (self.start is not None) else np.ones(len(times), dtype = bool)
+        if (keep.any() == True):
+            first = int(times[keep].min())
+            self.first_time = first if (self.first_time is None) else min(self.first_time, first)
+        if (self.end is not None):
+            self.end_seen = self.end_seen or bool((times == self.end).any())
+            later = times > self.end
+            if (later.any() == True):
+                earliest = int(times[later].min())
+                if ((self.after_time is None) or (earliest < self.after_time)):
+                    self.after_time = earliest
+                    self.after = {metric: Accumulator() for metric in metrics}
+                if (earliest == self.after_time):
+                    at = times == earliest
+                    for metric in metrics:
+                        self.after[metric] = self.after[metric].merge(Accumulator.from_values(columns[metric][at]))
+            keep &= (later == False)
+        for metric in metrics:
+            self.inside[metric] = self.inside[metric].merge(Accumulator.from_values(columns[metric][keep]))
+
+    def result(self, metric):
+        if (self.first_time is None):                                      # Nothing at or after "start"
+            return None
+        if ((self.end is None) or ((self.end_seen == False) and (self.after_time is None))):
+            last = self.last_time
+        else:
+            last = self.end if (self.end_seen == True) else self.after_time
+        if (self.first_time == last):
+            return None
+        if ((self.end is not None) and (self.end_seen == False) and (self.after_time is not None)):
+            return self.inside[metric].merge(self.after[metric])
+        return self.inside[metric]
+
+''' ================================================================================================================== '''
+''' ============================================= PART 2: READING THE FILES ========================================== '''
+''' ================================================================================================================== '''
+
+''' "read_range" returns where to start and stop reading a data file for the
+statistics dates (see "byte_range" in offsetIndex.py), reading one more indexed
+line past the end so the first measurement after the end date is always read.
+"stream_file" reads a data file a chunk at a time and adds the formatted
+chunks to the WindowStats of their source in "sources," returning the number of
+rows and the number of malformed lines. Which source a file belongs to is
+decided by its first chunk, like NEW_READER.py does with the first row. When 
+profiling ("python NEW_READER.py STATS --profile [files]"), reading each chunk 
+is timed as the "ingest" stage and adding it to the statistics as the "stats" 
+stage. '''
+
+''' ================================================================================================================== '''
+
+def read_range(path, start, end):
+    if ((start is None) and (end is None)):
+        return (0, None)
+    index = update_index(path)
+    low, high = byte_range(index, start, end)
+    if (high is not None):
+        later = np.flatnonzero(index["offsets"] > high)
+        high = int(index["offsets"][later[0]]) if (len(later) > 0) else None
+    return (low, high)
+
+def stream_file(path, sources, start, end):
+    offset, stop = read_range(path, start, end)
+    key = None
+    n_rows, n_malformed = 0, 0
+    while ((stop is None) or (offset < stop)):
+        limit = (offset + chunk_bytes) if (stop is None) else min(offset + chunk_bytes, stop)
+        with profiler.stage("ingest"):
+            df, bad, next_offset = load_data_file(path, offset, limit)
+        n_malformed += bad
+        if (next_offset == offset):                                       # No complete lines left
+            break
+        offset = next_offset
+        if (len(df) == 0):
+            continue
+        df = file_formatter(df, path)
+        if (len(df) == 0):
+            continue
+        if (key is None):
+            key = "df{0}".format(0) if ("Precipitation" in df.columns.tolist()) else "df{0}".format(int(df["Port"].iloc[0]) + 1)
+            sources.setdefault(key, WindowStats(start, end))
+        with profiler.stage("stats"):
+            times = df.index.values.astype("datetime64[ns]", copy = False).view(np.int64)
+            sources[key].add(times, {metric: df[metric].to_numpy() for metric in metrics})
+        profiler.count("rows ingested", len(df))
+        n_rows += len(df)
+    return (n_rows, n_malformed)
+
+''' ================================================================================================================== '''
+''' ================================================ PART 3: STATISTICS ============================================== '''
+''' ================================================================================================================== '''
+
+''' "print_stats" gathers the files like in Part 1 of NEW_READER.py, streams
+them one at a time, and then fills in the table and prints it. "start_date" and
+"end_date" are the assigned statistics dates (None if they aren't assigned).
+Without assigned dates, the title uses the first and last dates of all the
+data. It's also used by "python NEW_READER.py STATS [files]," with the
+statistics dates of NEW_READER.py. '''
+
+''' ================================================================================================================== '''
+
+# This function returns an assigned date as a datetime64[ns] integer, or exits if it isn't a date.
+def assigned_date(date):
+    try:
+        return pd.Timestamp(date).value
+    except ValueError:
+        print("Assigned dates must be strings in the form YYYY-MM-DD HH:mm:ss.")
+        sys.exit(1)
+
+def print_stats(paths, start_date = None, end_date = None):
+    usage = "Use the following format: python quickStats.py [datafile1].txt [datafile2].txt [datafile3].txt ...\n"
+    start = assigned_date(start_date) if (start_date is not None) else None
+    end = assigned_date(end_date) if (end_date is not None) else None
+    files = []
+    for argument in paths:
+        if ((argument.endswith(".txt") == True) and (os.path.isfile(argument) == True)):
+            files.append(argument)
+        elif ((argument.rstrip("/").endswith(segment_suffix)) and (os.path.isdir(argument) == True)):
+            files += segment_files(argument, None if (start is None) else pd.Timestamp(start), None if (end is None) else pd.Timestamp(end))
+        else:
+            print("Couldn't find {0}.".format(argument))
+            print(usage)
+            sys.exit(1)
+    if (len(files) == 0):
+        print(usage)
+        sys.exit(1)
+    sources = {}
+    for f in files:
+        n_rows, n_malformed = stream_file(f, sources, start, end)
+        if (n_malformed > 0):
+            print("Skipped {0} malformed line(s) in {1}".format(n_malformed, f))
+        if ((n_rows == 0) and ((start is not None) or (end is not None))):
+            print("No data between the assigned dates in {0}".format(f))
+        elif (n_rows == 0):
+            print("Couldn't find file. Choose a file that is in the directory and has data in it.")
+            sys.exit(1)
+    if (len(sources) == 0):
+        print("None of the files have data between the assigned dates.")
+        sys.exit(1)
+    keys = sorted(sources.keys())
+    title_start = start_date if (start is not None) else pd.Timestamp(min(sources[key].first_time for key in keys))
+    title_end = end_date if (end is not None) else pd.Timestamp(max(sources[key].last_time for key in keys))
+    if (pd.Timestamp(title_start) > pd.Timestamp(title_end)):
+        print("Assigned start date must occur before assigned end date.")
+        sys.exit(1)
+    stats = pd.DataFrame(index = stat_rows, columns = ["Weather" if (key == "df{0}".format(0)) else "Sensor {0}".format(key[2:]) for key in keys])
+    for i, key in enumerate(keys):
+        for num, metric in enumerate(metrics):
+            accumulator = sources[key].result(metric)
+            if (accumulator is not None):
+                statistics_placer(stats, num, i, accumulator)
+    printing_stats(stats, *stat_bounds(title_start, title_end))
+
+if __name__ == '__main__':
+    print_stats(sys.argv[1:], stat_start if (assign_stat_start == True) else None, stat_end if (assign_stat_end == True) else None)
+
+''' ================================================================================================================== '''
+''' ============================================ PART 4: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
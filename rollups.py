@@ -0,0 +1,321 @@
+import os                              # Used for finding the saved rollups
+import numpy as np                     # Used for the calculations on arrays of measurements
+import pandas as pd                    # Used for turning dates into timestamps
+from runningStats import Accumulator   # Holds the statistics for a range of dates
+from dataCache import cache_folder, prefix_hash   # The rollups are saved next to the cache and checked the same way
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This module keeps "rollups" of the data from each source: for every minute,
+hour, and day, the number of measurements, their mean, M2 (the sum of squared
+differences from the mean, which gives the standard deviation), minimum, and
+maximum. A month of 10-second data has about 260,000 measurements per metric,
+but only 43,200 minutes, 720 hours, and 30 days, so anything that only needs
+the rollups is hundreds of times faster than going through the measurements.
+They're used in two places in NEW_READER.py:
+1) Statistics --- The statistics for a range of dates are put together from the
+   days entirely inside the range, then the hours at the ends that aren't whole
+   days, then the minutes at the ends that aren't whole hours, and only the
+   measurements in the (at most two) minutes cut off by the ends are looked at.
+   The results are exactly the same as going through every measurement.
+2) Plotting --- When each pixel across the plot covers at least a minute, the
+   lines are drawn from the lowest and highest values of the coarsest rollup
+   that still has at least one bucket per pixel, instead of going through the
+   measurements (see "summary" in plotLayers.py). Zoomed in closer than that,
+   the measurements are used like before.
+
+The rollups are updated with only the new rows as the data grows (i.e. in the
+live loop), and the rollups of each data file are saved in .reader_cache next
+to it as "[file name].rollups.npz," so they're only made once and extended when
+lines are added. This was implemented 10/18/2026. '''
+
+''' ================================================================================================================== '''
+''' ============================================== PART i: VARIABLES ================================================= '''
+''' ================================================================================================================== '''
+
+resolutions = [("1min", 60), ("1h", 3600), ("1D", 86400)]   # Name and length (in seconds) of each rollup, finest first
+rollup_version = 3                                           # Rollups saved with a different version are ignored and rebuilt (2: made from float32 measurements; 3: checked against the data file)
+parts = ["counts", "means", "m2s", "minimums", "maximums"]   # Statistics kept for each bucket
+
+''' ================================================================================================================== '''
+''' ============================================== PART 1: HELPER FUNCTIONS ========================================== '''
+''' ================================================================================================================== '''
+
+''' "bucket_stats" turns sorted timestamps (as datetime64[ns] integers) and
+measurements into the statistics of each bucket of "length" nanoseconds, and
+"combine" merges buckets with the same start (i.e. the last bucket already
+rolled up and the first bucket of the new rows, or the buckets of two files from
+the same source). Both work on whole arrays at once. NaN measurements are
+skipped; a bucket without any has a count of 0. '''
+
+''' ================================================================================================================== '''
+
+def bucket_stats(times, values, length):
+    ids = times // length
+    starts = np.concatenate(([0], np.flatnonzero(ids[1:] != ids[:-1]) + 1))
+    valid = np.isnan(values) == False
+    counts = np.add.reduceat(valid.astype(np.int64), starts)
+    sums = np.add.reduceat(np.where(valid, values, 0.0), starts)
+    means = np.divide(sums, counts, out = np.zeros(len(counts)), where = (counts > 0))
+    run = np.repeat(np.arange(len(starts)), np.diff(np.concatenate((starts, [len(times)]))))
+    m2s = np.add.reduceat(np.where(valid, (values - means[run]) ** 2, 0.0), starts)
+    minimums = np.minimum.reduceat(np.where(valid, values, np.inf), starts)
+    maximums = np.maximum.reduceat(np.where(valid, values, -np.inf), starts)
+    return (ids[starts] * length, {"counts": counts, "means": means, "m2s": m2s, "minimums": minimums, "maximums": maximums})
+
+def combine(bucket_starts, stats):
+    order = np.argsort(bucket_starts, kind = "stable")
+    bucket_starts = bucket_starts[order]
+    stats = {part: stats[part][order] for part in parts}
+    starts = np.concatenate(([0], np.flatnonzero(bucket_starts[1:] != bucket_starts[:-1]) + 1))
+    if (len(starts) == len(bucket_starts)):                   # Nothing to merge
+        return (bucket_starts, stats)
+    counts = np.add.reduceat(stats["counts"], starts)
+    means = np.divide(np.add.reduceat(stats["counts"] * stats["means"], starts), counts, out = np.zeros(len(counts)), where = (counts > 0))
+    run = np.repeat(np.arange(len(starts)), np.diff(np.concatenate((starts, [len(bucket_starts)]))))
+    m2s = np.add.reduceat(stats["m2s"] + stats["counts"] * (stats["means"] - means[run]) ** 2, starts)
+    return (bucket_starts[starts], {"counts": counts, "means": means, "m2s": m2s,
+                                    "minimums": np.minimum.reduceat(stats["minimums"], starts), "maximums": np.maximum.reduceat(stats["maximums"], starts)})
+
+''' ================================================================================================================== '''
+''' ================================================= PART 2: ROLLUPS ================================================ '''
+''' ================================================================================================================== '''
+
+''' A Rollup holds the buckets of one length for every metric of a source.
+"add" takes new rows (sorted by date) and "merge" takes the buckets of another
+Rollup. Only the buckets from the first new one on are touched. '''
+
+''' ================================================================================================================== '''
+
+class Rollup:
+    def __init__(self, length, metrics):
+        self.length = length                                  # Length of each bucket in nanoseconds
+        self.metrics = list(metrics)
+        self.starts = np.zeros(0, dtype = np.int64)           # Start of each bucket (as datetime64[ns] integers)
+        self.stats = {metric: {part: np.zeros(0, dtype = (np.int64 if (part == "counts") else np.float64)) for part in parts} for metric in self.metrics}
+        self.rows = 0                                         # Number of rows rolled up so far
+
+    # This function adds buckets, merging the ones that start at the same time as buckets already there.
+    def extend(self, starts, stats):
+        keep = 0
+        if ((len(self.starts) > 0) and (len(starts) > 0)):
+            keep = int(np.searchsorted(self.starts, starts.min(), side = "left"))   # Only the buckets from the first new one on can change
+        merged = None
+        for metric in self.metrics:
+            joined_starts, joined = combine(np.concatenate((self.starts[keep:], starts)),
+                                            {part: np.concatenate((self.stats[metric][part][keep:], stats[metric][part])) for part in parts})
+            self.stats[metric] = {part: np.concatenate((self.stats[metric][part][:keep], joined[part])) for part in parts}
+            merged = joined_starts
+        self.starts = np.concatenate((self.starts[:keep], merged))
+
+    def add(self, times, columns):
+        if (len(times) == 0):
+            return
+        stats = {}
+        for metric in self.metrics:
+            starts, stats[metric] = bucket_stats(times, np.asarray(columns[metric], dtype = np.float64), self.length)
+        self.extend(starts, stats)
+        self.rows += len(times)
+
+    def merge(self, other):
+        self.extend(other.starts, other.stats)
+        self.rows += other.rows
+
+    # This function returns the positions of the buckets that start between "low" and "high" (both as datetime64[ns] integers; "high" not included).
+    def between(self, low, high):
+        return (int(np.searchsorted(self.starts, low, side = "left")), int(np.searchsorted(self.starts, high, side = "left")))
+
+''' ================================================================================================================== '''
+''' =============================================== PART 3: ROLLUP SETS ============================================== '''
+''' ================================================================================================================== '''
+
+''' A RollupSet keeps a Rollup of every length in "resolutions" for one
+SeriesStore (see seriesStore.py): "refresh" adds the rows that were added to
+the store since the last refresh (rebuilding everything if the store had to be
+sorted again), and "window" returns the accumulator (see runningStats.py) for a
+metric between two dates (both included). "summary" returns a function that plotLayers.py uses to draw a line
+from the rollups. Rollups made ahead of time for the rows already in the store
+(i.e. the saved rollups of the data files, see Part 4) can be given as
+"prebuilt." '''
+
+''' ================================================================================================================== '''
+
+class RollupSet:
+    def __init__(self, store, metrics, prebuilt = None):
+        self.store = store
+        self.metrics = list(metrics)
+        if ((prebuilt is not None) and (sum(rollup_list[0].rows for rollup_list in prebuilt) == len(store))):
+            self.rollups = [Rollup(length * 10 ** 9, self.metrics) for name, length in resolutions]
+            for rollup_list in prebuilt:                      # One list of rollups (one for each length) for each data file
+                for level in range(len(resolutions)):
+                    self.rollups[level].merge(rollup_list[level])
+            self.seen = len(store)
+            self.resorts = store.resorts
+        else:
+            self.rebuild()
+
+    def rebuild(self):
+        self.rollups = [Rollup(length * 10 ** 9, self.metrics) for name, length in resolutions]
+        self.seen = 0
+        self.resorts = self.store.resorts
+        self.refresh()
+
+    def refresh(self):
+        if (self.store.resorts != self.resorts):
+            self.rebuild()
+            return
+        if (len(self.store) == self.seen):
+            return
+        times = self.store.times()[self.seen:].view(np.int64)
+        columns = {metric: self.store.column(metric)[self.seen:] for metric in self.metrics}
+        for rollup in self.rollups:
+            rollup.add(times, columns)
+        self.seen = len(self.store)
+
+    # This function returns the accumulator for the measurements between "low" and "high" (both included, as datetime64[ns] integers), using the rollup at "level" and finer ones.
+    def cover(self, metric, low, high, level):
+        if (low > high):
+            return Accumulator()
+        if (level < 0):                                       # Finer than a minute, so use the measurements themselves
+            times = self.store.times()[:self.seen].view(np.int64)
+            first = int(np.searchsorted(times, low, side = "left"))
+            last = int(np.searchsorted(times, high, side = "right"))
+            return Accumulator.from_values(self.store.column(metric)[first:last])
+        rollup = self.rollups[level]
+        whole_start = -(-low // rollup.length) * rollup.length                 # Start of the first whole bucket in the range
+        whole_end = ((high + 1) // rollup.length) * rollup.length              # End of the last whole bucket in the range
+        if (whole_start >= whole_end):
+            return self.cover(metric, low, high, level - 1)
+        first, last = rollup.between(whole_start, whole_end)
+        stats = rollup.stats[metric]
+        middle = Accumulator.from_arrays(stats["counts"][first:last], stats["means"][first:last], stats["m2s"][first:last], stats["minimums"][first:last], stats["maximums"][first:last])
+        before = self.cover(metric, low, whole_start - 1, level - 1)
+        after = self.cover(metric, whole_end, high, level - 1)
+        return before.merge(middle).merge(after)
+
+    def window(self, metric, start, end):
+        return self.cover(metric, pd.Timestamp(start).value, pd.Timestamp(end).value, len(self.rollups) - 1)
+
+    # This function returns the times and values of a line drawn from the lowest and highest values in each pixel (None if the pixels are finer than the finest rollup).
+    def envelope(self, metric, low, high, n_pixels):
+        low, high = int(low.astype("datetime64[ns]").astype(np.int64)), int(high.astype("datetime64[ns]").astype(np.int64))
+        pixel = max((high - low) / max(int(n_pixels), 1), 1)
+        level = None
+        for i in range(len(self.rollups)):
+            if (self.rollups[i].length <= pixel):
+                level = i                                     # The coarsest rollup with at least one bucket per pixel
+        if (level is None):
+            return None
+        rollup = self.rollups[level]
+        first, last = rollup.between(low - int(pixel) - rollup.length, high + int(pixel) + 1)   # Keep the buckets just outside so the lines run off the edges
+        stats = rollup.stats[metric]
+        filled = stats["counts"][first:last] > 0
+        starts = rollup.starts[first:last][filled]
+        if (len(starts) == 0):
+            return (np.zeros(0, dtype = "datetime64[ns]"), np.zeros(0))
+        pixels = np.floor((starts - low) / pixel).astype(np.int64)
+        groups = np.concatenate(([0], np.flatnonzero(pixels[1:] != pixels[:-1]) + 1))
+        lows = np.minimum.reduceat(stats["minimums"][first:last][filled], groups)
+        highs = np.maximum.reduceat(stats["maximums"][first:last][filled], groups)
+        ends = np.concatenate((groups[1:], [len(starts)])) - 1
+        times = np.empty(2 * len(groups), dtype = np.int64)
+        times[0::2] = starts[groups]
+        times[1::2] = starts[ends] + rollup.length // 2
+        values = np.empty(2 * len(groups))
+        values[0::2] = lows
+        values[1::2] = highs
+        return (times.view("datetime64[ns]"), values)
+
+    def summary(self, metric):
+        return lambda low, high, n_pixels: self.envelope(metric, low, high, n_pixels)
+
+''' ================================================================================================================== '''
+''' ============================================= PART 4: SAVED ROLLUPS ============================================== '''
+''' ================================================================================================================== '''
+
+''' "file_rollups" returns the rollups (one for each length) of the formatted
+dataframe of a data file. They're saved in .reader_cache along with the number
+of rows they were made from, the date of the last of those rows, and the size, 
+modification time, and hash of the data file (like the cache, see dataCache.py).
+If the data file hasn't changed, the saved rollups are used as they are. If it 
+got bigger and the part that was there before is the same (i.e. lines were only 
+added to the file), only the new rows are rolled up. Otherwise (i.e. a 
+measurement was corrected in place), the rollups are made again. '''
+
+''' ================================================================================================================== '''
+
+def rollup_path(path):
+    folder, name = os.path.split(os.path.abspath(path))
+    return os.path.join(folder, cache_folder, name + ".rollups.npz")
+
+def read_rollups(path, metrics):
+    try:
+        with np.load(rollup_path(path), allow_pickle = False) as saved:
+            contents = {name: saved[name] for name in saved.files}
+    except (OSError, ValueError, KeyError):
+        return None
+    if ((int(contents.get("version", -1)) != rollup_version) or ([str(metric) for metric in contents.get("metrics", [])] != list(metrics))):   # Rollups saved by an older version may not have every part
+        return None
+    rollup_list = []
+    for name, length in resolutions:
+        rollup = Rollup(length * 10 ** 9, metrics)
+        rollup.starts = contents[name + "_starts"]
+        for i, metric in enumerate(metrics):
+            rollup.stats[metric] = {part: contents["{0}_{1}_{2}".format(name, i, part)] for part in parts}
+        rollup.rows = int(contents["rows"])
+        rollup_list.append(rollup)
+    return {"rollups": rollup_list, "rows": int(contents["rows"]), "last_time": int(contents["last_time"]),
+            "size": int(contents["size"]), "mtime": int(contents["mtime"]), "prefix_hash": contents["prefix_hash"].tobytes()}
+
+# This function saves the rollups of a data file. If they can't be written (i.e. the folder is read only), nothing happens.
+def write_rollups(path, rollup_list, rows, last_time, stats, digest):
+    arrays = {"version": np.array(rollup_version), "rows": np.array(rows), "last_time": np.array(last_time), "metrics": np.array(rollup_list[0].metrics),
+              "size": np.array(stats.st_size), "mtime": np.array(stats.st_mtime_ns), "prefix_hash": np.frombuffer(digest.digest(), dtype = np.uint8)}
+    for (name, length), rollup in zip(resolutions, rollup_list):
+        arrays[name + "_starts"] = rollup.starts
+        for i, metric in enumerate(rollup.metrics):
+            for part in parts:
+                arrays["{0}_{1}_{2}".format(name, i, part)] = rollup.stats[metric][part]
+    destination = rollup_path(path)
+    temporary = destination + ".tmp.npz"
+    try:
+        os.makedirs(os.path.dirname(destination), exist_ok = True)
+        np.savez(temporary, **arrays)
+        os.replace(temporary, destination)
+    except OSError:
+        pass
+
+def file_rollups(path, dataframe, metrics):
+    times = dataframe.index.values.astype("datetime64[ns]").view(np.int64)
+    if (len(times) == 0):
+        return [Rollup(length * 10 ** 9, metrics) for name, length in resolutions]
+    stats = os.stat(path)
+    saved = read_rollups(path, metrics)
+    rollup_list, rows, digest = [Rollup(length * 10 ** 9, metrics) for name, length in resolutions], 0, None
+    if ((saved is not None) and (saved["rows"] <= len(times)) and (saved["rows"] > 0) and (times[saved["rows"] - 1] == saved["last_time"])):
+        unchanged = ((saved["size"] == stats.st_size) and (saved["mtime"] == stats.st_mtime_ns))
+        if ((unchanged == False) and (stats.st_size > saved["size"])):                     # Lines may have been added
+            digest = prefix_hash(path, saved["size"])
+            if (digest.digest() != saved["prefix_hash"]):                                   # Something before them changed, so start over
+                digest = None
+        if ((unchanged == True) or (digest is not None)):
+            rollup_list, rows = saved["rollups"], saved["rows"]
+            if ((unchanged == True) and (rows == len(times))):
+                return rollup_list
+    columns = {metric: dataframe[metric].to_numpy()[rows:] for metric in metrics}
+    for rollup in rollup_list:
+        rollup.add(times[rows:], columns)
+    if (digest is None):
+        digest = prefix_hash(path, stats.st_size)
+    else:
+        digest = prefix_hash(path, stats.st_size, digest, saved["size"])                     # Only the new bytes are added to the hash
+    write_rollups(path, rollup_list, len(times), int(times[-1]), stats, digest)
+    return rollup_list
+
+''' ================================================================================================================== '''
+''' ============================================ PART 5: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
@@ -0,0 +1,87 @@
+import numpy as np   # Used for the calculations on arrays of measurements
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This module keeps the statistics (count, mean, standard deviation, minimum,
+and maximum) of the measurements from each source up to date as new data comes
+in. Before, NEW_READER.py recalculated the mean and standard deviation from
+every measurement in the statistics range every 10 seconds, so it got slower
+the more data there was. Now the statistics are kept in "accumulators," which
+can be updated with only the new measurements and merged with each other
+(using Welford's and Chan's formulas, which don't lose precision the way adding
+up squares does).
+
+The statistics for a range of dates (i.e. "stat_start" and "stat_end") are
+made by merging the accumulators of the rollups inside the range (see
+rollups.py). quickStats.py and weatherAlign.py use accumulators too. This was 
+implemented 10/18/2026. '''
+
+''' ================================================================================================================== '''
+''' ================================================ PART 1: ACCUMULATOR ============================================== '''
+''' ================================================================================================================== '''
+
+''' An accumulator holds the number of measurements, their mean, the sum of
+the squared differences from the mean (M2, which gives the variance), and
+their minimum and maximum. NaN values are skipped. The standard deviation is
+the sample standard deviation, like the one pandas gives. '''
+
+''' ================================================================================================================== '''
+
+class Accumulator:
+    def __init__(self, count = 0, mean = 0.0, m2 = 0.0, minimum = np.inf, maximum = -np.inf):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.minimum = minimum
+        self.maximum = maximum
+
+    @classmethod
+    def from_values(cls, values):
+        values = np.asarray(values, dtype = np.float64)
+        values = values[np.isnan(values) == False]
+        if (len(values) == 0):
+            return cls()
+        mean = values.mean()
+        return cls(len(values), mean, float(((values - mean) ** 2).sum()), values.min(), values.max())
+
+    # This function merges many accumulators (given as arrays of their parts) into one at once.
+    @classmethod
+    def from_arrays(cls, counts, means, m2s, minimums, maximums):
+        total = counts.sum()
+        if (total == 0):
+            return cls()
+        mean = (counts * means).sum() / total
+        m2 = m2s.sum() + (counts * (means - mean) ** 2).sum()
+        return cls(int(total), mean, m2, minimums.min(), maximums.max())
+
+    # This function returns a new accumulator with the measurements of both accumulators.
+    def merge(self, other):
+        if (other.count == 0):
+            return self
+        if (self.count == 0):
+            return other
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        mean = self.mean + delta * other.count / count
+        m2 = self.m2 + other.m2 + delta ** 2 * self.count * other.count / count
+        return Accumulator(count, mean, m2, min(self.minimum, other.minimum), max(self.maximum, other.maximum))
+
+    def average(self):
+        return self.mean if (self.count > 0) else np.nan
+
+    def std(self):
+        return np.sqrt(self.m2 / (self.count - 1)) if (self.count > 1) else np.nan
+
+    def low(self):
+        return self.minimum if (self.count > 0) else np.nan
+
+    def high(self):
+        return self.maximum if (self.count > 0) else np.nan
+
+''' ================================================================================================================== '''
+''' ============================================ PART 2: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
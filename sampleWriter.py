@@ -0,0 +1,109 @@
+import os     # Used for making sure the data reaches the disk (fsync)
+import time   # Used for keeping track of how long the data has been waiting to be written
+from stageProfiler import profiler   # Times the writing when profiling (see stageProfiler.py)
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This module writes the measurements from sensorData.py and weatherData.py
+to their data files. Before, every measurement opened the data file, wrote each
+value separately, and closed the file again, which is a lot of work for the
+computer when measurements come in quickly from many boards. A SampleWriter
+instead holds on to the lines it's given and writes them all at once (one
+open, one write, and one close for each data file) when either of the
+following happens:
+1) It's holding "max_records" lines.
+2) The oldest line it's holding has been waiting for "max_seconds" seconds.
+
+This means that if the program crashes, at most "max_seconds" seconds of
+measurements are lost. If "sync" is True, the data is also pushed all the way to
+the disk (with fsync) every time it's written, so it isn't lost if the computer
+loses power either (this is slower, so it's off by default). Setting
+"max_records" to 1 writes every line right away, like before. This was
+implemented 10/18/2026.
+
+The time limit only works if the writer gets a chance to check the time, so
+programs using it should wait with "writer.wait" instead of time.sleep (or call
+"writer.flush_due" regularly) and call "writer.close" before exiting. When 
+profiling (see stageProfiler.py), each write is timed as the "save" stage and 
+the lines written are counted. '''
+
+''' ================================================================================================================== '''
+''' ================================================= PART 1: SAMPLE WRITER ========================================== '''
+''' ================================================================================================================== '''
+
+''' Some features of note here are the following:
+1) writer.write([data file], [line]) --- Holds on to a line (which should end in "\n") for a data file
+2) writer.flush() --- Writes all the lines being held
+3) writer.flush_due() --- Writes all the lines being held if the oldest has waited long enough
+4) writer.time_left() --- Returns the number of seconds until the lines must be written (None if there are none)
+5) writer.wait([seconds]) --- Works like time.sleep, but writes the lines when they're due
+6) writer.close() --- Writes all the lines being held (use before exiting) '''
+
+''' ================================================================================================================== '''
+
+class SampleWriter:
+    def __init__(self, max_records = 50, max_seconds = 5.0, sync = False):
+        self.max_records = max(1, int(max_records))
+        self.max_seconds = max_seconds
+        self.sync = sync
+        self.buffers = {}    # Lines being held for each data file
+        self.count = 0       # Number of lines being held
+        self.oldest = None   # Time the oldest line being held was given to the writer
+
+    def write(self, path, line):
+        self.buffers.setdefault(path, []).append(line)
+        self.count += 1
+        if (self.oldest is None):
+            self.oldest = time.monotonic()
+        if (self.count >= self.max_records):
+            self.flush()
+        else:
+            self.flush_due()
+
+    def flush(self):
+        with profiler.stage("save"):
+            for path in self.buffers:
+                data_file = open(path, "a")
+                data_file.write("".join(self.buffers[path]))
+                if (self.sync == True):
+                    data_file.flush()
+                    os.fsync(data_file.fileno())
+                data_file.close()
+        profiler.count("rows written", self.count)
+        self.buffers = {}
+        self.count = 0
+        self.oldest = None
+
+    def time_left(self):
+        if (self.oldest is None):
+            return None
+        return max(0.0, self.oldest + self.max_seconds - time.monotonic())
+
+    def flush_due(self):
+        if ((self.oldest is not None) and (self.time_left() == 0)):
+            self.flush()
+
+    def wait(self, seconds):
+        end = time.monotonic() + seconds
+        while True:
+            left = end - time.monotonic()
+            if (left <= 0):
+                break
+            due = self.time_left()
+            if ((due is None) or (due >= left)):   # Nothing will be due before we're done waiting
+                time.sleep(left)
+                break
+            time.sleep(due)
+            self.flush()
+        self.flush_due()
+
+    def close(self):
+        self.flush()
+
+''' ================================================================================================================== '''
+''' ============================================ PART 2: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
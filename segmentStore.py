@@ -0,0 +1,239 @@
+import os                               # Used for making the segment folders and finding the segments
+import re                               # Used for finding the date and time in a line
+import sys                              # Allows the user to use command line arguments (for splitting files)
+import json                             # Used for reading and writing the manifests
+import datetime                         # Used for comparing the dates of the segments (pandas isn't needed, so the collectors don't have to import it)
+from sampleWriter import SampleWriter   # Writes the lines to the segments in batches
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This module stores data in "segments": instead of one data file that grows
+forever, the lines for each hour or day go into their own file, and a small
+manifest keeps the first and last dates of every segment. NEW_READER.py used to
+read every byte of every data file, even when "assigned_start" and
+"assigned_end" picked out one afternoon, so loading took longer the more data
+there was. With segments, only the ones whose dates overlap the dates being
+plotted are read, so loading takes about as long as the amount of data that's
+actually shown. This was implemented 10/18/2026.
+
+The segments for a data file go in a folder with the same name, but ending in
+".segments" instead of ".txt" (i.e. "sensor0_apr17.txt" becomes
+"sensor0_apr17.segments"). Inside, each segment is named after its day
+("2025-04-17.txt") or hour ("2025-04-17_14.txt") and has exactly the same lines
+a data file would, so everything that reads data files can read segments. The
+manifest ("manifest.json") looks like this:
+
+{"version": 1, "partition": "day", "segments": {"2025-04-17.txt": {"start": "2025-04-17 14:03:10", "end": "2025-04-17 23:59:58", "lines": 6321}}}
+
+The manifest is written after the lines, so if it's ever behind (or missing),
+a segment's dates are taken from its name instead.
+
+Existing data files can be split into segments with the following command
+(the data files aren't changed):
+
+python segmentStore.py [hour or day] [datafile].txt [datafile].txt ... '''
+
+''' ================================================================================================================== '''
+''' ============================================== PART i: VARIABLES ================================================= '''
+''' ================================================================================================================== '''
+
+segment_suffix = ".segments"      # Ending of the folder names
+manifest_name = "manifest.json"   # Name of the manifest in each folder
+manifest_version = 1              # Manifests with a different version are ignored (the names of the segments are used instead)
+date_pattern = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+''' ================================================================================================================== '''
+''' ============================================== PART 1: HELPER FUNCTIONS ========================================== '''
+''' ================================================================================================================== '''
+
+# This function returns the segment folder for a data file.
+def segment_folder(data_file):
+    if (data_file.endswith(".txt")):
+        data_file = data_file[:-4]
+    return data_file + segment_suffix
+
+# This function returns the date and time of a line (None if it doesn't have them). The date is the first column that looks like one, so old files with an index first work too.
+def line_time(line):
+    columns = line.split(" ", 4)
+    for i in range(len(columns) - 1):
+        if (date_pattern.match(columns[i]) is not None):
+            return (columns[i], columns[i + 1])
+    return None
+
+# This function returns the name of the segment a date and time belong in.
+def segment_name(day, cur_time, partition):
+    if (partition == "hour"):
+        return "{0}_{1}.txt".format(day, cur_time[:2])
+    return "{0}.txt".format(day)
+
+# This function returns the first and last dates a segment can have based on its name (None if the name isn't a segment name).
+def name_bounds(name):
+    stem = name[:-4]
+    try:
+        if ("_" in stem):
+            first = datetime.datetime.strptime(stem, "%Y-%m-%d_%H")
+            return (first, first + datetime.timedelta(hours = 1) - datetime.timedelta(microseconds = 1))
+        first = datetime.datetime.strptime(stem, "%Y-%m-%d")
+        return (first, first + datetime.timedelta(days = 1) - datetime.timedelta(microseconds = 1))
+    except ValueError:
+        return None
+
+# This function turns a date (a datetime, which includes pandas Timestamps, or a string like "2025-04-17 14:03:10") into something that can be compared with the dates of the segments.
+def as_datetime(date):
+    if (isinstance(date, datetime.datetime) == True):
+        return date
+    return datetime.datetime.fromisoformat(str(date))
+
+def read_manifest(folder):
+    try:
+        with open(os.path.join(folder, manifest_name)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (manifest.get("version") != manifest_version):
+        return None
+    return manifest
+
+# This function writes a manifest all at once, so a half-written manifest is never read.
+def write_manifest(folder, manifest):
+    destination = os.path.join(folder, manifest_name)
+    with open(destination + ".tmp", "w") as f:
+        json.dump(manifest, f, indent = 1, sort_keys = True)
+    os.replace(destination + ".tmp", destination)
+
+''' ================================================================================================================== '''
+''' ============================================= PART 2: WRITING SEGMENTS =========================================== '''
+''' ================================================================================================================== '''
+
+''' A SegmentWriter works just like a SampleWriter (see sampleWriter.py) and is
+given the same data file names, but it writes each line into the right segment
+of the data file's segment folder instead, and updates the manifests every time
+it writes. sensorData.py and weatherData.py use one instead of a SampleWriter
+when "segment_length" is set. "partition" is either "hour" or "day." '''
+
+''' ================================================================================================================== '''
+
+class SegmentWriter(SampleWriter):
+    def __init__(self, partition = "day", max_records = 50, max_seconds = 5.0, sync = False):
+        SampleWriter.__init__(self, max_records, max_seconds, sync)
+        self.partition = partition
+        self.manifests = {}   # Manifest of each folder written to
+        self.updates = {}     # New dates and line counts of the segments in each folder (not in the manifests yet)
+        self.last = {}        # Segment of the last line written for each data file (lines without a date go there too)
+
+    def write(self, path, line):
+        folder = segment_folder(path)
+        if (folder not in self.manifests):
+            os.makedirs(folder, exist_ok = True)
+            manifest = read_manifest(folder)
+            if (manifest is None):
+                manifest = {"version": manifest_version, "partition": self.partition, "segments": {}}
+            self.manifests[folder] = manifest
+        stamp = line_time(line)
+        if (stamp is None):
+            name = self.last.get(path, "undated.txt")
+        else:
+            name = segment_name(stamp[0], stamp[1], self.partition)
+            update = self.updates.setdefault(folder, {}).setdefault(name, [None, None, 0])
+            stamp = stamp[0] + " " + stamp[1]
+            if ((update[0] is None) or (stamp < update[0])):
+                update[0] = stamp
+            if ((update[1] is None) or (stamp > update[1])):
+                update[1] = stamp
+            update[2] += 1
+        self.last[path] = name
+        SampleWriter.write(self, os.path.join(folder, name), line)
+
+    # This function writes the lines and then brings the manifests up to date.
+    def flush(self):
+        SampleWriter.flush(self)
+        for folder in self.updates:
+            segments = self.manifests[folder]["segments"]
+            for name, (first, last, count) in self.updates[folder].items():
+                entry = segments.setdefault(name, {"start": first, "end": last, "lines": 0})
+                entry["start"] = min(entry["start"], first)
+                entry["end"] = max(entry["end"], last)
+                entry["lines"] += count
+            write_manifest(folder, self.manifests[folder])
+        self.updates = {}
+
+''' ================================================================================================================== '''
+''' ============================================= PART 3: READING SEGMENTS =========================================== '''
+''' ================================================================================================================== '''
+
+''' This function returns the paths of the segments in a folder (in order) that
+have data between "start" and "end" (both included). Either can be None to
+leave that side open. Segments that aren't in the manifest (or have names that
+aren't dates) are always included, just in case. '''
+
+''' ================================================================================================================== '''
+
+def segment_files(folder, start = None, end = None):
+    manifest = read_manifest(folder)
+    segments = manifest["segments"] if (manifest is not None) else {}
+    paths = []
+    for name in sorted(os.listdir(folder)):
+        if ((name.endswith(".txt") == False) or (os.path.isfile(os.path.join(folder, name)) == False)):
+            continue
+        if (name in segments):
+            first, last = as_datetime(segments[name]["start"]), as_datetime(segments[name]["end"])
+        elif (name_bounds(name) is not None):
+            first, last = name_bounds(name)
+        else:
+            first, last = None, None
+        if ((first is not None) and (((start is not None) and (last < as_datetime(start))) or ((end is not None) and (first > as_datetime(end))))):
+            continue
+        paths.append(os.path.join(folder, name))
+    return paths
+
+''' ================================================================================================================== '''
+''' ============================================ PART 4: SPLITTING FILES ============================================= '''
+''' ================================================================================================================== '''
+
+''' This function splits an existing data file into segments, reading it one
+line at a time so even huge files don't need much memory. Lines without a date
+(i.e. malformed ones) go into the same segment as the line before them, so
+NEW_READER.py still reports them. A file that already has a segment folder is
+skipped so nothing is written twice. It returns the number of lines split. '''
+
+''' ================================================================================================================== '''
+
+def split_file(data_file, partition):
+    folder = segment_folder(data_file)
+    if ((os.path.isdir(folder) == True) and (len(os.listdir(folder)) > 0)):
+        print("{0} already exists, so {1} was skipped.".format(folder, data_file))
+        return 0
+    writer = SegmentWriter(partition, max_records = 100000, max_seconds = float("inf"))
+    n_lines = 0
+    with open(data_file, "r", errors = "replace") as f:
+        for line in f:
+            if (line.strip() == ""):
+                continue
+            if (line.endswith("\n") == False):
+                line += "\n"
+            writer.write(data_file, line)
+            n_lines += 1
+    writer.close()
+    return n_lines
+
+if __name__ == '__main__':
+    usage = "Use the following format: python segmentStore.py [hour or day] [datafile].txt [datafile].txt ...\n"
+    if ((len(sys.argv) < 3) or (sys.argv[1] not in ["hour", "day"])):
+        print(usage)
+        sys.exit(1)
+    for data_file in sys.argv[2:]:
+        if ((data_file.endswith(".txt") == False) or (os.path.isfile(data_file) == False)):
+            print("Couldn't find {0}.".format(data_file))
+            continue
+        n_lines = split_file(data_file, sys.argv[1])
+        if (n_lines > 0):
+            manifest = read_manifest(segment_folder(data_file))
+            print("Split {0} line(s) of {1} into {2} segment(s) in {3}".format(n_lines, data_file, len(manifest["segments"]), segment_folder(data_file)))
+
+''' ================================================================================================================== '''
+''' ============================================ PART 5: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
@@ -3,6 +3,11 @@ import datetime             # Contains information about the date and time of ei
 from datetime import date   # Module in "datetime" that specifically accesses the date
 import sys                  # Allows the user to use command line arguments
 from sys import platform
+import selectors            # Lets one program wait on all the serial ports at once
+import time                 # Used for waiting before trying to open a serial port again
+import signal               # Lets the program write the data it is holding before it is stopped
+from sampleWriter import SampleWriter   # Writes the measurements from every port to the data files in batches
+from stageProfiler import profiler, profile_option   # Times reading, parsing, and writing when run with "--profile" (see stageProfiler.py)
 
 ''' ================================================================================================================== '''
 ''' ==================================================== OVERVIEW ==================================================== '''
@@ -13,7 +18,10 @@ information about the relative humidity and temperature in the production room
 at points in time. When the Arduino sends its data to the "server," this script
 (which is run with "python sensorData.py" after the Arduino code has finished 
 uploading) takes the data, splices it, and puts each value into a data file when
-the value arrives. '''
+the value arrives.
+
+As of 10/18/2026, one run of this script can read from any number of Arduino 
+boards at once (before, each board needed its own run of the script). '''
 
 ''' ================================================================================================================== '''
 ''' ========================================= PART 1: COMMAND-LINE ARGUMENTS ========================================= '''
@@ -29,27 +37,44 @@ UPDATE: I have since added a system argument for the COM port so that I can use
 multiple Arduino boards at the same time. Each board connects to a different USB
 port on the PC, which means they each have a different COM port. So, the user
 can indicate which board they want to use based on the COM port they feed the
-program. This update was added 5/17/2024. '''
+program. This update was added 5/17/2024.
+
+10/18/2026 UPDATE: More than one port can be given, each followed by its data 
+file (i.e. "python sensorData.py 0 sensor0.txt 1 sensor1.txt"). Ports can share 
+a data file, since each line starts with the port number. If a board isn't on 
+the usual COM port, the COM port can be given with the port number (i.e. 
+"0:/dev/ttyUSB0"). A different baud rate can be given after an "@" (i.e. 
+"0@115200" or "0:/dev/ttyUSB0@115200"), which is needed for framed mode (see 
+Part 2). 
+
+10/18/2026 UPDATE: "--profile" can be given anywhere (i.e. "python sensorData.py 
+--profile 0 sensor0.txt") to time reading the ports, handling the measurements, 
+and writing them, and to count the samples per second (see stageProfiler.py). 
+The summary is printed when the program exits. With "--profile=[metrics file]," 
+the times and counts of the last "profile_seconds" seconds are also added to 
+[metrics file] as a line of JSON every "profile_seconds" seconds. '''
 
 ''' ================================================================================================================== '''
 
-# Port
-try:
-    port_num = sys.argv[1]
-except IndexError:
-    print("Use the following format: python sensorData.py [integer] [datafile].txt\n")
+usage = "Use the following format: python sensorData.py [integer] [datafile].txt [integer] [datafile].txt ... (see Part 1 for other options)\n"
+profiling, metrics_file, arguments = profile_option(sys.argv[1:])
+if ((len(arguments) < 2) or (len(arguments) % 2 != 0)):
+    print(usage)
     sys.exit(1)
 
-# Sensor Data
-try:
-    if (sys.argv[2].endswith(".txt")):
-        file1 = sys.argv[2]
-    else:
-        print("Use the following format: python sensorData.py [integer] [datafile].txt\n")
+port_args = []                                   # List of (port number, COM port or None, baud rate or None, data file)
+for i in range(0, len(arguments), 2):
+    # Port
+    port_spec, _, port_baudrate = arguments[i].partition("@")
+    port_num, _, comport = port_spec.partition(":")
+    if ((port_num.isdigit() == False) or ((port_baudrate != "") and (port_baudrate.isdigit() == False))):
+        print(usage)
         sys.exit(1)
-except IndexError:
-    print("Use the following format: python sensorData.py [integer] [datafile].txt\n")
-    sys.exit(1)
+    # Sensor Data
+    if (arguments[i + 1].endswith(".txt") == False):
+        print(usage)
+        sys.exit(1)
+    port_args.append((port_num, comport if (comport != "") else None, int(port_baudrate) if (port_baudrate != "") else None, arguments[i + 1]))
 
 ''' ================================================================================================================== '''
 ''' ============================================ PART 2: DATA COLLECTION ============================================= '''
@@ -103,102 +128,270 @@ It's important to note that I open and close the data file each time I add a
 new set of measurements (hence why I use "a" instead of "w"). I did this in 
 case we need to stop data collection but didn't want to lose our data. By 
 continuously opening and closing the file, we save the data, preventing it 
-from being lost. '''
+from being lost.
+
+10/18/2026 UPDATE: Before, each board needed its own run of this script, each 
+sitting in its own loop waiting on its port. Now each port is a "SensorPort," 
+which keeps its own counter, tester, and the humidity waiting for its 
+temperature, so the ports can't mix each other's measurements up. "readserial" 
+uses a selector, which waits until any of the ports has something to read, so 
+one program can read from dozens of boards without using any more of the 
+computer while it waits. The humidity and temperature are now written together 
+as one line (through "writer," a SampleWriter every port shares) once the 
+temperature arrives. The writer holds on to the lines and writes them in 
+batches instead of opening and closing the data file for every measurement 
+(see sampleWriter.py), so the data files can be up to "flush_seconds" seconds 
+behind. If a port can't be opened or is lost (i.e. the board is 
+unplugged), the program keeps reading the other ports and tries to open it 
+again every "retry_time" seconds. When a board says "Done!", its port is closed, 
+and the program exits once every board is done.
+
+10/18/2026 UPDATE: aht10.ino can also run in "framed mode," where each 
+measurement is sent as one line with a sequence number and a checksum (i.e. 
+"$12,52.57,22.45*07") at a faster baud rate, so several measurements can be 
+taken per second. Lines starting with "$" are read by "handle_frame" instead of 
+with the counter: records with the wrong checksum are garbled and skipped, and 
+any jump in the sequence number means records were missed (garbled records 
+show up as missed, too). Both are counted and printed, which the counter can't 
+do. Since each port reads everything that 
+has arrived at once, many records are handled for each read. Note that the 
+data files only have times to the second, so several lines can have the same 
+time. 
+
+10/18/2026 UPDATE: Printing four lines for every framed record slowed the 
+program down at fast baud rates (and threw off the CPU time measured by 
+acquisitionBenchmark.py), so unless "verbose" is True (see Part 3), each port 
+only prints a summary every "summary_seconds" seconds: how many records it 
+wrote since the last summary, how many were garbled or missed so far, and the 
+latest measurement. '''
 
 ''' ================================================================================================================== '''
 
-def readserial(comport, baudrate, timestamp = False):
-    ser = serial.Serial(comport, baudrate, timeout = 0.1)  
-    counter = 0
-    tester = 0
+# This function checks a framed record ("$[SEQUENCE],[HUMIDITY],[TEMPERATURE]*[CHECKSUM]", see aht10.ino) and returns its sequence number, humidity, and temperature, or None if it's garbled.
+def frame_reader(data):
+    star = data.rfind("*")
+    if ((data.startswith("$") == False) or (star == -1)):
+        return None
+    payload = data[1:star]
+    checksum = 0
+    for character in payload.encode(errors = "replace"):   # The checksum is the XOR of the characters between "$" and "*"
+        checksum ^= character
+    try:
+        if (int(data[(star + 1):], 16) != checksum):
+            return None
+        sequence, humidity, temperature = payload.split(",")
+        float(humidity)
+        float(temperature)
+        return (int(sequence), humidity, temperature)
+    except ValueError:
+        return None
+
+class SensorPort:
+    def __init__(self, port_num, comport, data_file, baudrate, writer):
+        self.port_num = port_num
+        self.comport = comport
+        self.data_file = data_file
+        self.baudrate = baudrate
+        self.writer = writer    # The SampleWriter every port shares
+        self.ser = None
+        self.buffer = b""       # Part of a line that hasn't finished arriving
+        self.counter = 0
+        self.tester = 0
+        self.humidity = None    # The date, time, and humidity waiting for their temperature
+        self.sequence = None    # Sequence number of the last framed record
+        self.dropped = 0        # Number of framed records that never arrived
+        self.garbled = 0        # Number of framed records that arrived with the wrong checksum
+        self.records = 0        # Number of framed records written since the last summary
+        self.latest = None      # The date, time, humidity, and temperature of the last framed record written
+        self.last_summary = time.monotonic()
+
+    def open(self):
+        self.ser = serial.Serial(self.comport, self.baudrate, timeout = 0)   # A timeout of 0 means reading never waits (the selector does the waiting)
+        self.buffer = b""
+        self.humidity = None
+        self.sequence = None
+
+    def close(self):
+        if (self.ser is not None):
+            self.ser.close()
+            self.ser = None
+
+    # This function reads whatever has arrived on the port and returns the lines that are complete.
+    def read_lines(self):
+        self.buffer += self.ser.read(max(self.ser.in_waiting, 1))
+        lines = self.buffer.split(b"\n")
+        self.buffer = lines.pop()
+        return [line.decode(errors = "replace").strip() for line in lines]
+
+    # This function writes the measurements in a framed record to the data file, keeping count of the records that were garbled or missed.
+    def handle_frame(self, data):
+        record = frame_reader(data)
+        if (record is None):
+            self.garbled += 1
+            profiler.count("lines rejected")
+            if (verbose == True):
+                print("Sensor {0}: skipped a garbled record ({1} so far)".format(int(self.port_num) + 1, self.garbled))
+            self.summarize()
+            return True
+        sequence, humidity, temperature = record
+        if ((self.sequence is not None) and (sequence > self.sequence + 1)):   # A smaller sequence number means the board was reset
+            self.dropped += sequence - self.sequence - 1
+            profiler.count("records missed", sequence - self.sequence - 1)
+            if (verbose == True):
+                print("Sensor {0}: missed {1} record(s) ({2} so far)".format(int(self.port_num) + 1, sequence - self.sequence - 1, self.dropped))
+        self.sequence = sequence
+        if ((humidity == "0.00") or (temperature == "-50.00") or (humidity == "255.00")):   # The sensor didn't give a real measurement
+            return True
+        day = date.today()
+        cur_time = datetime.datetime.now().strftime("%H:%M:%S")
+        self.writer.write(self.data_file, "{0} {1} {2} {3} {4}\n".format(self.port_num, day, cur_time, humidity, temperature))
+        profiler.count("serial samples")
+        if (verbose == True):
+            print(str(day) + " " + str(cur_time))
+            print("Sensor {0}".format(int(self.port_num) + 1))
+            print("Humidity: " + humidity + "%")
+            print("Temperature: " + temperature + "\u00B0C\n\n")
+        self.records += 1
+        self.latest = (day, cur_time, humidity, temperature)
+        self.summarize()
+        return True
+
+    # This function prints the summary of the framed records every "summary_seconds" seconds (only when "verbose" is False, since every record is printed otherwise).
+    def summarize(self):
+        now = time.monotonic()
+        if ((verbose == True) or (now - self.last_summary < summary_seconds)):
+            return
+        print("Sensor {0}: {1} record(s) in the last {2:.0f} seconds ({3} garbled and {4} missed so far)".format(int(self.port_num) + 1, self.records, now - self.last_summary, self.garbled, self.dropped))
+        if (self.latest is not None):
+            day, cur_time, humidity, temperature = self.latest
+            print("Latest: " + str(day) + " " + str(cur_time) + ", Humidity: " + humidity + "%, Temperature: " + temperature + "\u00B0C\n")
+        self.records = 0
+        self.last_summary = now
+
+    # This function does what the while loop of "readserial" used to do for one piece of data. It returns False once the Arduino is done.
+    def handle(self, data):
+        if (data.startswith("$")):                                                # Framed records carry everything needed, so they don't wait for "AHT10 running"
+            return self.handle_frame(data)
+        if ((data == "Starting up...") or (data == "Sensor not running.") or (data == "AHT10 running")):
+            print(data)
+            if (data == "AHT10 running"):
+                self.tester = 1
+        elif ((data == "") or (data == "0.00") or (data == "-50.00") or (data == "..") or (data == "up..") or (data == "0")):
+            return True
+        elif (data == "Done!"):
+            print(data)
+            return False
+        elif (self.tester == 0):
+            return True
+        else:
+            try:
+                self.counter = int(data)
+            except ValueError:
+                if (self.counter % 2 == 0):
+                    day = date.today()
+                    cur_time = datetime.datetime.now().strftime("%H:%M:%S")   # Named "cur_time" for "current time" so it didn't conflict with time module
+                    self.humidity = (day, cur_time, data)
+                    print(str(day) + " " + str(cur_time))
+                    print("Sensor {0}".format(int(self.port_num) + 1))
+                    print("Humidity: " + data + "%")
+                elif (self.humidity is not None):                             # Only write the temperature if its humidity arrived
+                    day, cur_time, humidity = self.humidity
+                    self.writer.write(self.data_file, "{0} {1} {2} {3} {4}\n".format(self.port_num, day, cur_time, humidity, data))
+                    profiler.count("serial samples")
+                    print("Temperature: " + data + "\u00B0C\n\n")
+                    self.humidity = None
+                self.counter += 1
+        return True
+
+def readserial(ports, writer):
+    selector = selectors.DefaultSelector()
+    waiting = list(ports)                        # Ports that aren't open yet (or were lost)
+    next_try = 0
+    next_cycle = time.time() + profile_seconds   # When the profile metrics are next written (see Part 1)
     while True:
         try:
-            data = ser.readline().decode().strip()
-            if ((data == "Starting up...") or (data == "Sensor not running.") or (data == "AHT10 running")):
-                print(data)
-                if (data == "AHT10 running"):
-                    tester = 1
-            elif ((data == "") or (data == "0.00") or (data == "-50.00") or (data == "..") or (data == "up..") or (data == "0")):
-                continue
-            elif (data == "Done!"):
-                print(data)
+            if (time.time() >= next_cycle):
+                profiler.end_cycle()
+                next_cycle = time.time() + profile_seconds
+            if ((len(waiting) > 0) and (time.time() >= next_try)):
+                for port in list(waiting):
+                    try:
+                        port.open()
+                        selector.register(port.ser, selectors.EVENT_READ, port)
+                        waiting.remove(port)
+                    except (serial.SerialException, OSError) as error:
+                        print("Couldn't open {0} for sensor {1} ({2}). Trying again in {3} seconds.".format(port.comport, int(port.port_num) + 1, error, retry_time))
+                next_try = time.time() + retry_time
+            if ((len(selector.get_map()) == 0) and (len(waiting) == 0)):   # Every Arduino is done
+                writer.close()
                 sys.exit(1)
-            else:
-                if (tester == 0):
+            if (len(selector.get_map()) == 0):
+                writer.wait(max(next_try - time.time(), 0))
+                continue
+            timeout = 1
+            if (writer.time_left() is not None):
+                timeout = min(timeout, writer.time_left())               # Wake up in time to write the held measurements
+            for key, events in selector.select(timeout = timeout):
+                port = key.data
+                try:
+                    with profiler.stage("ingest"):
+                        lines = port.read_lines()
+                except (serial.SerialException, OSError) as error:     # The board was unplugged or reset
+                    print("Lost {0} for sensor {1} ({2}).".format(port.comport, int(port.port_num) + 1, error))
+                    selector.unregister(port.ser)
+                    port.close()
+                    waiting.append(port)
                     continue
-                else:
-                    if ((data == "") or (data == "0.00") or (data == "-50.00") or (data == "..") or (data == "up..") or (data == "0")):
-                        continue
-                    else:
-                        day = date.today()
-                        cur_time = datetime.datetime.now().strftime("%H:%M:%S")   # Named "cur_time" for "current time" so it didn't conflict with time module (if I included it)
-                        ''' This checks to see if the data from the Arduino 
-                        is an integer, indicating that it's a counter. If 
-                        that counter is even, a humidity measurement will 
-                        be written to the file; if that counter is odd, a 
-                        temperature measurement will be written to the 
-                        file. This code was implemented 5/17/2024. '''
-                        try:
-                            if (isinstance(int(data), int) == True):
-                                counter = int(data)
-                            else:
-                                print("Raising ValueError in try portion of try-except statement.")
-                                raise ValueError
-                        except ValueError:
-                            if (counter % 2 == 0):
-                                data_file = open(file1, "a")
-                                data_file.write(str(port_num))
-                                data_file.write(" ")
-                                data_file.write(str(day))
-                                data_file.write(" ")
-                                data_file.write(str(cur_time))
-                                data_file.write(" ")
-                                data_file.write(str(data))
-                                data_file.write(" ")
-                                print(str(day) + " " + str(cur_time))
-                                print("Sensor {0}".format(int(port_num) + 1))
-                                print("Humidity: " + data + "%")
-                            else:
-                                data_file.write(str(data))
-                                print("Temperature: " + data + "\u00B0C\n\n")
-                                data_file.write("\n")
-                                data_file.close()
-                            counter += 1
+                with profiler.stage("parse"):
+                    for data in lines:
+                        if (port.handle(data) == False):
+                            selector.unregister(port.ser)
+                            port.close()
+                            break
+            writer.flush_due()
         except KeyboardInterrupt:
+            writer.close()
             print("\nKeyboardInterrupt")
-            sys.exit(1)     
+            sys.exit(1)
 
 ''' ================================================================================================================== '''
 ''' ============================================== PART 3: SERIAL PORTS ============================================== '''
 ''' ================================================================================================================== '''
 
-# This tells the program where to look for the AHT10 program.
-if __name__ == '__main__':
+baudrate = 9600        # Lets the program synchronize with the Arduino (used unless a port is given its own, i.e. "0@115200" for framed mode)
+retry_time = 5         # Number of seconds to wait before trying to open a serial port again
+flush_records = 50     # The measurements are written to the data files once this many are waiting...
+flush_seconds = 5      # ...or once the oldest has waited this many seconds (at most this many seconds of data can be lost if the program crashes)
+use_fsync = False      # If True, the data is pushed all the way to the disk every time it's written (safer if the power goes out, but slower)
+segment_length = None  # Set to "hour" or "day" to write each data file as a folder of hourly or daily segments instead (see segmentStore.py)
+profile_seconds = 10   # With "--profile=[metrics file]," the metrics are written this often (see Part 1)
+verbose = False        # If True, every framed record is printed as it comes in; if False, each port prints a summary every "summary_seconds" seconds (see Part 2)
+summary_seconds = 10   # How often each port prints its summary of the framed records when "verbose" is False
+
+# This tells the program where to look for the AHT10 program if the COM port isn't given.
+def port_path(port_num):
     if (platform == "darwin"):
-        if (int(port_num) == 0):
-            readserial('/dev/cu.usbmodem1101', 9660, True)
-        elif (int(port_num) == 1):
-            readserial('/dev/cu.usbmodem1102', 9600, True)
-        elif (int(port_num) == 2):
-            readserial('/dev/cu.usbmodem1103', 9600, True)
-        elif (int(port_num) == 3):
-            readserial('/dev/cu.usbmodem1104', 9600, True)
-        else:
-            print("No COM port specified.")
-            sys.exit(1)
+        return "/dev/cu.usbmodem110{0}".format(int(port_num) + 1)
     else:
-        if (int(port_num) == 0):
-            # Format: readserial([COM port], [Baudrate], [Show timestamp])
-            readserial('/dev/ttyACM0', 9600, True)
-        elif (int(port_num) == 1):
-            readserial('/dev/ttyACM1', 9600, True)
-        elif (int(port_num) == 2):
-            readserial('/dev/ttyACM2', 9600, True)
-        elif (int(port_num) == 3):
-            readserial('/dev/ttyACM3', 9600, True)
-        else:
-            print("No COM port specified.")
-            sys.exit(1)
+        return "/dev/ttyACM{0}".format(int(port_num))
+
+if __name__ == '__main__':
+    signal.signal(signal.SIGTERM, signal.default_int_handler)   # Being stopped (i.e. with "kill") is handled like Ctrl-C, so the held measurements are written
+    if (profiling == True):
+        profiler.enable(metrics_file)
+    if (segment_length is None):
+        writer = SampleWriter(flush_records, flush_seconds, use_fsync)
+    else:
+        from segmentStore import SegmentWriter   # Writes the measurements into hourly or daily segments instead (only imported when "segment_length" is set)
+        writer = SegmentWriter(segment_length, flush_records, flush_seconds, use_fsync)
+    ports = []
+    for port_num, comport, port_baudrate, data_file in port_args:
+        if (comport is None):
+            comport = port_path(port_num)
+        if (port_baudrate is None):
+            port_baudrate = baudrate
+        ports.append(SensorPort(port_num, comport, data_file, port_baudrate, writer))
+    readserial(ports, writer)
 
 ''' ================================================================================================================== '''
 ''' ============================================ PART 4: ACKNOWLEDGEMENTS ============================================ '''
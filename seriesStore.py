@@ -0,0 +1,109 @@
+import numpy as np    # Used for the arrays that hold the data
+import pandas as pd   # Used for handing the data back as dataframes
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This module holds the data from one source (a sensor or the weather) while
+NEW_READER.py is updating. Before, every new line was added to its dataframe
+with pd.concat, which copies the whole dataframe every time, so each refresh
+took longer than the last and week-long runs slowed to a crawl. A SeriesStore
+instead keeps the timestamps and each column in numpy arrays with extra room
+at the end. New rows are written into that room, and only when it runs out are
+the arrays replaced with ones twice as big, so adding a row costs the same no
+matter how much data there already is. The dataframe handed back by "frame"
+looks at the same memory as the arrays (nothing is copied), so it can be used
+for plotting and statistics right away. This was implemented 10/18/2026. '''
+
+''' ================================================================================================================== '''
+''' ================================================ PART 1: SERIES STORE ============================================ '''
+''' ================================================================================================================== '''
+
+''' Some features of note here are the following:
+1) SeriesStore.from_frame([dataframe]) --- Makes a store out of a formatted dataframe (datetime index, one column per measurement)
+2) store.append([dataframe]) --- Adds the rows of a formatted dataframe with the same columns to the end of the store
+3) store.times() and store.column([name]) --- Return the filled parts of the arrays (views, not copies)
+4) store.frame() --- Returns a dataframe made from those views
+
+Rows are expected to arrive in chronological order. If some come in out of
+order, the store is sorted again so the index stays chronological. '''
+
+''' ================================================================================================================== '''
+
+class SeriesStore:
+    def __init__(self, columns, dtypes, capacity = 1024):
+        self.columns = list(columns)
+        self.size = 0                                                          # Number of rows that have been filled in
+        self.capacity = max(1, int(capacity))
+        self.time_array = np.empty(self.capacity, dtype = "datetime64[ns]")
+        self.arrays = [np.empty(self.capacity, dtype = dtype) for dtype in dtypes]
+        self.index_name = "Date and Time"
+        self.resorts = 0                                                       # Number of times the store had to be sorted again (anything that depends on the order of the rows must start over when this changes)
+
+    @classmethod
+    def from_frame(cls, dataframe):
+        store = cls(dataframe.columns, [dataframe[name].dtype for name in dataframe.columns], capacity = 2 * len(dataframe))
+        store.index_name = dataframe.index.name
+        store.append(dataframe)
+        return store
+
+    # This function makes sure there's room for "extra" more rows, doubling the size of the arrays as many times as needed.
+    def reserve(self, extra):
+        needed = self.size + extra
+        if (needed <= self.capacity):
+            return
+        capacity = self.capacity
+        while (capacity < needed):
+            capacity *= 2
+        new_times = np.empty(capacity, dtype = self.time_array.dtype)
+        new_times[:self.size] = self.time_array[:self.size]
+        self.time_array = new_times
+        for i in range(len(self.arrays)):
+            new_array = np.empty(capacity, dtype = self.arrays[i].dtype)
+            new_array[:self.size] = self.arrays[i][:self.size]
+            self.arrays[i] = new_array
+        self.capacity = capacity
+
+    # This function adds the rows of a formatted dataframe to the end of the store.
+    def append(self, dataframe):
+        n = len(dataframe)
+        if (n == 0):
+            return
+        self.reserve(n)
+        new_times = dataframe.index.values.astype("datetime64[ns]")
+        out_of_order = (self.size > 0) and (new_times[0] < self.time_array[self.size - 1])
+        self.time_array[self.size:(self.size + n)] = new_times
+        for i, name in enumerate(self.columns):
+            self.arrays[i][self.size:(self.size + n)] = dataframe[name].to_numpy().astype(self.arrays[i].dtype, copy = False)   # New lines may still have strings (i.e. the port)
+        self.size += n
+        if ((out_of_order == True) or (np.all(new_times[1:] >= new_times[:-1]) == False)):
+            self.sort()
+
+    # This function puts the rows back in chronological order (only needed if rows arrived out of order).
+    def sort(self):
+        self.resorts += 1
+        order = np.argsort(self.time_array[:self.size], kind = "stable")
+        self.time_array[:self.size] = self.time_array[:self.size][order]
+        for array in self.arrays:
+            array[:self.size] = array[:self.size][order]
+
+    def __len__(self):
+        return self.size
+
+    def times(self):
+        return self.time_array[:self.size]
+
+    def column(self, name):
+        return self.arrays[self.columns.index(name)][:self.size]
+
+    # This function returns a dataframe that shares its memory with the store.
+    def frame(self):
+        index = pd.DatetimeIndex(self.times(), name = self.index_name, copy = False)
+        return pd.DataFrame({name: self.arrays[i][:self.size] for i, name in enumerate(self.columns)}, index = index, copy = False)
+
+''' ================================================================================================================== '''
+''' ============================================ PART 2: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
@@ -0,0 +1,221 @@
+import time        # Used for timing the stages
+import json        # Used for writing the metrics of each cycle to the metrics file
+import atexit      # Used for printing the summary when the program exits (however it exits)
+import threading   # Used for keeping the stages of each thread apart (weatherData.py fetches on several threads)
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This module times the stages of NEW_READER.py, sensorData.py, and
+weatherData.py and counts what goes through them, so when the live plot falls
+behind (or a collector can't keep up) it's easy to see where the time goes
+instead of guessing. The stages are the following:
+1) ingest --- Getting the data in (reading the data files, the cache, new lines, and the serial ports, and adding the data to the dataframes)
+2) parse --- Turning the bytes of the data files into columns (see dataLoader.py and "new_line_formatter" in NEW_READER.py) or handling the measurements from the serial ports and WTTR
+3) format --- Formatting the columns (see dataFormatter.py)
+4) stats --- Keeping the rollups and statistics up to date (see rollups.py)
+5) render --- Plotting the lines and redoing the axes
+6) redraw --- Time from asking for the figure to be drawn to it being drawn (see plotLayers.py)
+7) save --- Saving the graphs and writing the data files (see sampleWriter.py)
+8) fetch --- Waiting for WTTR to answer (weatherData.py)
+
+Stages can be inside each other (i.e. "parse" happens inside "ingest"), so
+each stage has a total time, which includes the stages inside it, and a "self"
+time, which doesn't. The self times add up to the time spent in all the stages.
+The counters are the rows ingested, bytes read, lines rejected, and serial
+samples (and a few others, like the rows written to the data files), and the
+summary gives how many of each there were per second, too (i.e. serial samples
+per second).
+
+There's only one profiler ("profiler"), which every module shares, and it does
+nothing until "profiler.enable" is called, so the stages cost nothing when the
+programs aren't run with "--profile." With "--profile=[metrics file]," a line
+of JSON with the stages and counters of the last cycle (i.e. one refresh of the
+live plot) is added to the metrics file at the end of every cycle, so it can be
+read by another program while the first is still running. The summary is
+printed when the program exits. This was implemented 10/18/2026. '''
+
+''' ================================================================================================================== '''
+''' ================================================== PART 1: STAGES ================================================ '''
+''' ================================================================================================================== '''
+
+''' A Stage times one run of a stage with "with profiler.stage([name]):" and
+gives its time to the profiler when it's done, taking the time of the stages
+inside it out of its self time. "NoStage" is used in place of it when the
+profiler isn't enabled. '''
+
+''' ================================================================================================================== '''
+
+class Stage:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.started = None
+        self.inner = 0.0   # Time spent in the stages inside this one
+
+    def __enter__(self):
+        self.profiler.stack().append(self)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exception):
+        elapsed = time.perf_counter() - self.started
+        stack = self.profiler.stack()
+        stack.pop()
+        if (len(stack) > 0):
+            stack[-1].inner += elapsed
+        self.profiler.record(self.name, elapsed, elapsed - self.inner)
+        return False
+
+class NoStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        return False
+
+''' ================================================================================================================== '''
+''' ================================================= PART 2: PROFILER =============================================== '''
+''' ================================================================================================================== '''
+
+''' Some features of note here are the following:
+1) profiler.enable([metrics file]) --- Starts profiling (the metrics file can be None)
+2) with profiler.stage([name]): --- Times the code inside it as a stage
+3) profiler.record([name], [seconds]) --- Adds a time that was measured some other way (i.e. the redraw latency)
+4) profiler.count([name], [amount]) --- Adds to a counter
+5) profiler.end_cycle() --- Writes the metrics of the last cycle to the metrics file and starts a new cycle
+6) profiler.summary() --- Prints the stages and counters so far
+
+Each timing is a list of the number of calls, the total time, the self time,
+and the longest call (in seconds). '''
+
+''' ================================================================================================================== '''
+
+class StageProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.metrics_file = None
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.no_stage = NoStage()
+        self.reset()
+
+    def reset(self):
+        self.started = time.perf_counter()
+        self.cycle_started = self.started
+        self.cycles = 0
+        self.timings = {}          # Timings of each stage since profiling started
+        self.counters = {}         # Counters since profiling started
+        self.cycle_timings = {}    # Timings of each stage in this cycle
+        self.cycle_counters = {}   # Counters in this cycle
+
+    def enable(self, metrics_file = None):
+        if (self.enabled == False):
+            atexit.register(self.finish)
+        self.enabled = True
+        self.metrics_file = metrics_file
+        self.reset()
+
+    # This function returns the stages this thread is in (the innermost last).
+    def stack(self):
+        if (hasattr(self.local, "stack") == False):
+            self.local.stack = []
+        return self.local.stack
+
+    def stage(self, name):
+        if (self.enabled == False):
+            return self.no_stage
+        return Stage(self, name)
+
+    def record(self, name, seconds, own = None):
+        if (self.enabled == False):
+            return
+        if (own is None):
+            own = seconds
+        with self.lock:
+            for timings in [self.timings, self.cycle_timings]:
+                timing = timings.setdefault(name, [0, 0.0, 0.0, 0.0])
+                timing[0] += 1
+                timing[1] += seconds
+                timing[2] += own
+                timing[3] = max(timing[3], seconds)
+
+    def count(self, name, amount = 1):
+        if (self.enabled == False):
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+            self.cycle_counters[name] = self.cycle_counters.get(name, 0) + amount
+
+    def end_cycle(self):
+        if (self.enabled == False):
+            return
+        with self.lock:
+            now = time.perf_counter()
+            self.cycles += 1
+            metrics = {"cycle": self.cycles,
+                       "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+                       "seconds": round(now - self.cycle_started, 6),
+                       "stages": {name: {"calls": timing[0], "total_s": round(timing[1], 6), "self_s": round(timing[2], 6), "max_s": round(timing[3], 6)} for name, timing in self.cycle_timings.items()},
+                       "counters": dict(self.cycle_counters)}
+            self.cycle_started = now
+            self.cycle_timings = {}
+            self.cycle_counters = {}
+        if (self.metrics_file is not None):
+            try:
+                with open(self.metrics_file, "a") as f:
+                    f.write(json.dumps(metrics) + "\n")
+            except OSError as error:
+                print("Couldn't write the profile metrics to {0} ({1}). Only the summary will be printed.".format(self.metrics_file, error))
+                self.metrics_file = None
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        with self.lock:
+            timings = sorted(self.timings.items(), key = lambda item: item[1][2], reverse = True)   # The stages that took the most time first
+            counters = sorted(self.counters.items())
+        print("Profile of {0:.1f} seconds ({1} cycle(s))".format(elapsed, self.cycles))
+        print("{0:<10} {1:>8} {2:>11} {3:>10} {4:>7} {5:>10} {6:>10}".format("Stage", "Calls", "Total (s)", "Self (s)", "Self %", "Mean (ms)", "Max (ms)"))
+        for name, timing in timings:
+            print("{0:<10} {1:>8} {2:>11.3f} {3:>10.3f} {4:>7.1f} {5:>10.2f} {6:>10.2f}".format(name, timing[0], timing[1], timing[2], 100 * timing[2] / elapsed if (elapsed > 0) else 0.0, 1000 * timing[1] / timing[0], 1000 * timing[3]))
+        if (len(counters) > 0):
+            print("{0:<16} {1:>14} {2:>14}".format("Counter", "Total", "Per Second"))
+            for name, total in counters:
+                print("{0:<16} {1:>14} {2:>14.1f}".format(name, total, total / elapsed if (elapsed > 0) else 0.0))
+        print("=================================================================================")
+
+    # This function is run when the program exits: the last (unfinished) cycle is written and the summary is printed.
+    def finish(self):
+        if (self.enabled == False):
+            return
+        if ((len(self.cycle_timings) > 0) or (len(self.cycle_counters) > 0)):
+            self.end_cycle()
+        self.summary()
+
+profiler = StageProfiler()   # The profiler every module shares
+
+''' ================================================================================================================== '''
+''' =============================================== PART 3: THE OPTION =============================================== '''
+''' ================================================================================================================== '''
+
+# This function takes "--profile" (or "--profile=[metrics file]") out of the command-line arguments. It returns whether profiling was asked for, the metrics file (None if there isn't one), and the rest of the arguments.
+def profile_option(arguments):
+    profiling = False
+    metrics_file = None
+    rest = []
+    for argument in arguments:
+        if (argument == "--profile"):
+            profiling = True
+        elif (argument.startswith("--profile=")):
+            profiling = True
+            metrics_file = argument[len("--profile="):] if (argument != "--profile=") else None
+        else:
+            rest.append(argument)
+    return (profiling, metrics_file, rest)
+
+''' ================================================================================================================== '''
+''' ============================================ PART 4: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
@@ -0,0 +1,144 @@
+import os                   # Used for finding NEW_READER.py and the data files
+import sys                  # Allows the user to use command line arguments
+import json                 # Used for saving and reading the results of earlier runs
+import time                 # Used for timing each run
+import tempfile             # Used for making a folder for the graphs saved in batch mode
+import subprocess           # Used for running NEW_READER.py
+import numpy as np          # Used for the medians
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This script measures how long NEW_READER.py takes to start in each of its
+modes, so it's easy to see if a change makes it slower to start (i.e. an
+import added at the top of NEW_READER.py or one of the modules it uses). Each
+mode is run with "python -X importtime," which makes Python print how long
+every import took, and the following are printed for each mode:
+1) Imports (ms) --- Total time spent importing (the median over the runs)
+2) Total (ms) --- Time from starting Python to it exiting (the median over the runs)
+3) Modules --- Which of matplotlib, tkinter, pandas, and numpy were imported
+
+The modes are the following:
+1) HELP --- "python NEW_READER.py HELP"
+2) Usage --- "python NEW_READER.py" with no files, which prints how to use it
+3) STATS --- "python NEW_READER.py STATS [data file]" (see quickStats.py)
+4) BATCH --- "python NEW_READER.py BATCH [data file]," which saves graphs to a temporary folder
+5) LIVE --- "python NEW_READER.py [data file]," only if "LIVE" is given, since it needs a screen and never exits on its own (it's stopped after "live_seconds")
+
+HELP, Usage, and STATS shouldn't import matplotlib or tkinter; if they do, the
+mode is marked with "!". If a results file is given, the results of the last
+run are read from it, the change in the import time of each mode is printed
+too, and the new results are saved to it. This was implemented 10/18/2026.
+
+It's used with the following command (by default, 5 runs of each mode on
+examples/example_data/EXAMPLE_sensor_0.txt):
+
+python startupBenchmark.py [data file (optional)] [runs (optional)] [results file (optional)] [LIVE (optional)] '''
+
+''' ================================================================================================================== '''
+''' ============================================== PART i: VARIABLES ================================================= '''
+''' ================================================================================================================== '''
+
+reader = os.path.join(os.path.dirname(os.path.abspath(__file__)), "NEW_READER.py")   # The program being measured
+default_data_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "examples", "example_data", "EXAMPLE_sensor_0.txt")
+live_seconds = 20                                            # Number of seconds live mode runs before it's stopped
+watched_modules = ["matplotlib", "tkinter", "pandas", "numpy"]
+non_plotting_modes = ["HELP", "Usage", "STATS"]              # Modes that shouldn't import matplotlib or tkinter
+
+''' ================================================================================================================== '''
+''' ============================================ PART 1: MEASURING A MODE ============================================ '''
+''' ================================================================================================================== '''
+
+''' "import_times" reads what "-X importtime" printed and returns the total
+time spent importing (in milliseconds) along with the names of every module
+that was imported. Each line looks like "import time: [self] | [cumulative] |
+[module]," and modules imported by other modules have extra spaces before
+their names, so only the cumulative times of the modules without them are added
+up. "run_mode" runs NEW_READER.py once with the given arguments and returns the
+import time, the total time, and the imported modules. '''
+
+''' ================================================================================================================== '''
+
+def import_times(output):
+    total = 0
+    modules = set()
+    for line in output.splitlines():
+        if (line.startswith("import time:") == False):
+            continue
+        columns = line[len("import time:"):].split("|")
+        if ((len(columns) != 3) or (columns[0].strip().isdigit() == False)):   # The first line is the heading
+            continue
+        name = columns[2][1:]
+        modules.add(name.strip())
+        if (name.startswith(" ") == False):
+            total += int(columns[1])
+    return (total / 1000, modules)
+
+def run_mode(arguments, folder, timeout):
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-X", "importtime", reader] + arguments, cwd = folder, stdout = subprocess.DEVNULL, stderr = subprocess.PIPE, text = True)
+    try:
+        output = process.communicate(timeout = timeout)[1]
+    except subprocess.TimeoutExpired:                                           # Live mode never exits, so stop it
+        process.kill()
+        output = process.communicate()[1]
+    total_time = (time.perf_counter() - started) * 1000
+    import_time, modules = import_times(output)
+    return (import_time, total_time, modules)
+
+''' ================================================================================================================== '''
+''' ============================================== PART 2: THE BENCHMARK ============================================= '''
+''' ================================================================================================================== '''
+
+def benchmark(data_file, runs, results_file, live):
+    modes = [("HELP", ["HELP"]), ("Usage", []), ("STATS", ["STATS", data_file]), ("BATCH", ["BATCH", data_file])]
+    if (live == True):
+        modes.append(("LIVE", [data_file]))
+    previous = {}
+    if ((results_file is not None) and (os.path.isfile(results_file) == True)):
+        with open(results_file, "r") as f:
+            previous = json.load(f)
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        os.makedirs(os.path.join(folder, "graphs"))                             # NEW_READER.py saves its graphs in "graphs"
+        for name, arguments in modes:
+            timeout = live_seconds if (name == "LIVE") else None
+            measured = [run_mode(arguments, folder, timeout) for run in range(runs)]
+            imported = set.union(*[modules for import_time, total_time, modules in measured])
+            results[name] = {"imports_ms": float(np.median([m[0] for m in measured])),
+                             "total_ms": float(np.median([m[1] for m in measured])),
+                             "modules": [module for module in watched_modules if (module in imported)]}
+    print("Startup of NEW_READER.py ({0} run(s) of each mode with {1})\n".format(runs, data_file))
+    print("{0:<7} {1:>13} {2:>12} {3:>13}   {4}".format("Mode", "Imports (ms)", "Total (ms)", "Change (ms)", "Modules"))
+    for name in results:
+        result = results[name]
+        change = "{0:+.1f}".format(result["imports_ms"] - previous[name]["imports_ms"]) if (name in previous) else "---"
+        total = "{0:.1f}".format(result["total_ms"]) if (name != "LIVE") else "---"   # Live mode was stopped, so its total time means nothing
+        warning = " !" if ((name in non_plotting_modes) and (("matplotlib" in result["modules"]) or ("tkinter" in result["modules"]))) else ""
+        print("{0:<7} {1:>13.1f} {2:>12} {3:>13}   {4}{5}".format(name, result["imports_ms"], total, change, ", ".join(result["modules"]) if (len(result["modules"]) > 0) else "---", warning))
+    if (results_file is not None):
+        with open(results_file, "w") as f:
+            json.dump(results, f, indent = 2)
+        print("\nSaved the results to {0}".format(results_file))
+
+if __name__ == '__main__':
+    usage = "Use the following format: python startupBenchmark.py [data file (optional)] [runs (optional)] [results file (optional)] [LIVE (optional)]\n"
+    arguments = [argument for argument in sys.argv[1:] if (argument != "LIVE")]
+    data_file = os.path.abspath(arguments[0]) if (len(arguments) > 0) else default_data_file
+    try:
+        runs = int(arguments[1]) if (len(arguments) > 1) else 5
+    except ValueError:
+        print(usage)
+        sys.exit(1)
+    results_file = arguments[2] if (len(arguments) > 2) else None
+    if ((os.path.isfile(data_file) == False) or (runs < 1) or (len(arguments) > 3)):
+        print(usage)
+        sys.exit(1)
+    benchmark(data_file, runs, results_file, "LIVE" in sys.argv[1:])
+
+''' ================================================================================================================== '''
+''' ============================================ PART 3: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
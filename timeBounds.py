@@ -0,0 +1,79 @@
+import numpy as np    # Used for searching the sorted timestamps
+import pandas as pd   # Used for turning dates into timestamps
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This module keeps track of the first and last dates of every source (a
+sensor or the weather) in NEW_READER.py. Before, "start_func," "end_func," and
+"stat_date_formatter" turned the whole index of every dataframe into a Python
+list (sometimes several times for one comparison) to find its first and last
+dates, twice every refresh, which took longer and longer as the data grew. Now
+the first and last dates of each source are kept as new lines come in, and the
+dates closest to the statistics dates are found with a binary search on the
+(already sorted) timestamps in the source's SeriesStore (see seriesStore.py),
+so none of this depends on how much data there is. This was implemented
+10/18/2026. '''
+
+''' ================================================================================================================== '''
+''' ================================================= PART 1: TIME BOUNDS ============================================ '''
+''' ================================================================================================================== '''
+
+''' Some features of note here are the following:
+1) bounds.track([key], [store]) --- Starts keeping track of a source
+2) bounds.update([key]) --- Picks up the new first and last dates of a source after lines are added to its store
+3) bounds.start() and bounds.end() --- Return the first and last dates of all the sources together
+4) bounds.nearest([key], [start], [end]) --- Returns the dates of a source closest to the given ones (see below)
+5) bounds.covers([start], [end]) --- Tells whether any source has data between two dates (used for skipping empty windows in batch mode) '''
+
+''' ================================================================================================================== '''
+
+class TimeBounds:
+    def __init__(self):
+        self.stores = {}
+        self.firsts = {}   # First date of each source
+        self.lasts = {}    # Last date of each source
+
+    def track(self, key, store):
+        self.stores[key] = store
+        self.update(key)
+
+    # The stores are kept in chronological order, so the first and last dates are just the ends of the timestamps.
+    def update(self, key):
+        times = self.stores[key].times()
+        if (len(times) > 0):
+            self.firsts[key] = times[0]
+            self.lasts[key] = times[-1]
+
+    def start(self):
+        return pd.Timestamp(min(self.firsts.values()))
+
+    def end(self):
+        return pd.Timestamp(max(self.lasts.values()))
+
+    # This function returns the date of a source at a given date if there is one, otherwise the first date after it (or the last date if there isn't one after it).
+    def nearest_date(self, key, date):
+        times = self.stores[key].times()
+        position = int(np.searchsorted(times, np.datetime64(pd.Timestamp(date), "ns"), side = "left"))
+        return pd.Timestamp(times[min(position, len(times) - 1)])
+
+    # This function returns True if any of the sources has data between the given dates (both included).
+    def covers(self, start, end):
+        for key in self.stores:
+            times = self.stores[key].times()
+            first = np.searchsorted(times, np.datetime64(pd.Timestamp(start), "ns"), side = "left")
+            last = np.searchsorted(times, np.datetime64(pd.Timestamp(end), "ns"), side = "right")
+            if (last > first):
+                return True
+        return False
+
+    # This function corrects the dates for calculating statistics if they aren't dates of the source (this used to be "stat_date_formatter" in NEW_READER.py).
+    def nearest(self, key, start, end):
+        return (self.nearest_date(key, start), self.nearest_date(key, end))
+
+''' ================================================================================================================== '''
+''' ============================================ PART 2: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
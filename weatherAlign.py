@@ -0,0 +1,183 @@
+import numpy as np                     # Used for matching the measurements and calculating the differences
+import pandas as pd                    # Used for the dataframes and reading the tolerance
+from runningStats import Accumulator   # Holds the statistics of the differences
+from psychrometrics import derive      # Calculates the absolute humidities for dataframes that don't have them
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This module lines each sensor's measurements up with the weather data so
+the inside of the room can be compared with the outside. The sensors measure
+every second or so while the weather comes in every 10 seconds (or less often),
+so the timestamps almost never match exactly. Instead, each sensor measurement
+is matched with the weather measurement closest to it in time (or the last one
+before it, or the first one after it), as long as it's no more than
+"tolerance" away; otherwise it isn't matched. Both dataframes are already in
+chronological order, so the matches are found with a binary search of the
+weather timestamps (np.searchsorted) instead of pandas merging every row
+against every other one.
+
+For every matched sensor measurement, the inside-minus-outside differences of
+the relative humidity, the temperature, and the absolute humidity are
+calculated. The sensor rows are handled "chunk_rows" at a time, so no more than
+one chunk's worth of extra arrays are ever made, even for months of data.
+This was implemented 10/18/2026.
+
+Some features of note here are the following:
+1) align_streams([sensor dataframe], [weather dataframe], [tolerance]) --- Returns a dataframe with the differences for every sensor measurement (NaN where nothing matched), for plotting
+2) aligned_chunks([sensor dataframe], [weather dataframe], [tolerance]) --- The differences one chunk at a time (used by the above)
+3) StreamDifferences([sensor store], [weather store], [tolerance]) --- Keeps the differences of a sensor's SeriesStore up to date as new rows come in (used for the statistics and plot of the differences in NEW_READER.py)
+
+The weather temperatures must already be in degrees Celsius (NEW_READER.py
+converts them when the files are loaded). '''
+
+''' ================================================================================================================== '''
+''' ============================================== PART i: VARIABLES ================================================= '''
+''' ================================================================================================================== '''
+
+default_tolerance = "5min"   # Longest time between a sensor measurement and the weather measurement it's matched with
+chunk_rows = 100000          # Number of sensor measurements handled at a time
+difference_columns = {"Relative Humidity": "Relative Humidity Difference",   # Column of each difference (inside minus outside)
+                      "Temperature": "Temperature Difference",
+                      "Absolute Humidity": "Absolute Humidity Difference"}
+
+''' ================================================================================================================== '''
+''' ============================================== PART 1: HELPER FUNCTIONS ========================================== '''
+''' ================================================================================================================== '''
+
+''' "match_positions" returns the position in "weather_times" of the weather
+measurement matched with each of "times" (-1 where nothing is close enough).
+Both are datetime64[ns] integers in chronological order. "direction" is
+"nearest," "backward" (the last weather measurement at or before), or
+"forward" (the first one at or after). '''
+
+''' ================================================================================================================== '''
+
+def match_positions(times, weather_times, tolerance, direction = "nearest"):
+    after = np.searchsorted(weather_times, times, side = "left")                  # First weather measurement at or after each time
+    before = np.searchsorted(weather_times, times, side = "right") - 1            # Last weather measurement at or before each time
+    last = len(weather_times) - 1
+    gap_before = np.where(before >= 0, times - weather_times[np.clip(before, 0, last)], np.iinfo(np.int64).max)
+    gap_after = np.where(after <= last, weather_times[np.clip(after, 0, last)] - times, np.iinfo(np.int64).max)
+    if (direction == "backward"):
+        positions, gaps = before, gap_before
+    elif (direction == "forward"):
+        positions, gaps = after, gap_after
+    else:
+        closer = gap_after < gap_before
+        positions, gaps = np.where(closer, after, before), np.where(closer, gap_after, gap_before)
+    return np.where(gaps <= tolerance, positions, -1)
+
+''' ================================================================================================================== '''
+''' ================================================= PART 2: ALIGNMENT ============================================== '''
+''' ================================================================================================================== '''
+
+''' "aligned_chunks" goes through the sensor dataframe "chunk_rows" rows at a
+time and yields the position of the chunk's first row along with a dictionary
+of the differences (numpy arrays, NaN where nothing matched). The columns of
+both dataframes are only looked at through views. The absolute humidities come
+from the "Absolute Humidity" columns (see psychrometrics.py); if a dataframe
+doesn't have one, they're calculated for only the rows a chunk needs. '''
+
+''' ================================================================================================================== '''
+
+def aligned_chunks(sensor_df, weather_df, tolerance = default_tolerance, direction = "nearest", chunk_rows = chunk_rows):
+    tolerance = pd.Timedelta(tolerance).value
+    times = sensor_df.index.values.astype("datetime64[ns]", copy = False).view(np.int64)
+    weather_times = weather_df.index.values.astype("datetime64[ns]", copy = False).view(np.int64)
+    sensor_columns = {name: sensor_df[name].to_numpy() for name in difference_columns if (name in sensor_df.columns)}
+    weather_columns = {name: weather_df[name].to_numpy() for name in difference_columns if (name in weather_df.columns)}
+    for first in range(0, len(times), chunk_rows):
+        last = min(first + chunk_rows, len(times))
+        positions = match_positions(times[first:last], weather_times, tolerance, direction) if (len(weather_times) > 0) else np.full(last - first, -1)
+        matched = positions >= 0
+        inside = {name: sensor_columns[name][first:last] for name in sensor_columns}
+        if ("Absolute Humidity" not in inside):
+            inside["Absolute Humidity"] = derive(inside["Relative Humidity"], inside["Temperature"])["Absolute Humidity"]
+        outside = {name: weather_columns[name][positions[matched]] for name in weather_columns}
+        if ("Absolute Humidity" not in outside):
+            outside["Absolute Humidity"] = derive(outside["Relative Humidity"], outside["Temperature"])["Absolute Humidity"]
+        differences = {}
+        for name, column in difference_columns.items():
+            differences[column] = np.full(last - first, np.nan)
+            differences[column][matched] = np.asarray(inside[name], dtype = np.float64)[matched] - outside[name]
+        yield (first, differences)
+
+def align_streams(sensor_df, weather_df, tolerance = default_tolerance, direction = "nearest", chunk_rows = chunk_rows):
+    aligned = {column: np.empty(len(sensor_df)) for column in difference_columns.values()}
+    for first, differences in aligned_chunks(sensor_df, weather_df, tolerance, direction, chunk_rows):
+        for column in differences:
+            aligned[column][first:first + len(differences[column])] = differences[column]
+    return pd.DataFrame(aligned, index = sensor_df.index)
+
+''' ================================================================================================================== '''
+''' ============================================= PART 3: LIVE DIFFERENCES =========================================== '''
+''' ================================================================================================================== '''
+
+''' A StreamDifferences keeps the differences of one sensor's SeriesStore (see
+seriesStore.py) from the weather's, and is used like a RollupSet (see
+rollups.py): "refresh" brings the differences up to date after rows were added
+to either store, "column" returns a difference for every sensor row so far
+(NaN where nothing matched), and "window" returns the accumulator (see 
+runningStats.py) for a difference between two dates (both included). New weather measurements come after the ones that
+were already there, so they can only change the matches of the sensor rows at
+or after the last weather measurement of the previous refresh. Only those rows
+and the new ones are aligned again (with "align_streams"), so a refresh doesn't
+get slower as the data grows. If either store had to be sorted again, every row
+is aligned again. The differences are kept in arrays with extra room at the end,
+like the stores. '''
+
+''' ================================================================================================================== '''
+
+class StreamDifferences:
+    def __init__(self, sensor_store, weather_store, tolerance = default_tolerance, direction = "nearest"):
+        self.sensor_store = sensor_store
+        self.weather_store = weather_store
+        self.tolerance = tolerance
+        self.direction = direction
+        self.rebuild()
+
+    def rebuild(self):
+        self.arrays = {column: np.empty(0) for column in difference_columns.values()}
+        self.seen = 0                 # Number of sensor rows that have differences
+        self.weather_last = None      # Time of the last weather measurement at the previous refresh
+        self.resorts = (self.sensor_store.resorts, self.weather_store.resorts)
+        self.refresh()
+
+    def refresh(self):
+        if ((self.sensor_store.resorts, self.weather_store.resorts) != self.resorts):
+            self.rebuild()
+            return
+        size = len(self.sensor_store)
+        first = self.seen
+        if (self.weather_last is not None):          # The rows whose matches may have changed
+            first = min(first, int(np.searchsorted(self.sensor_store.times(), self.weather_last, side = "left")))
+        if (size > len(self.arrays[difference_columns["Relative Humidity"]])):   # Make room for the new rows, doubling the size of the arrays
+            capacity = max(2 * len(self.arrays[difference_columns["Relative Humidity"]]), size)
+            for column in self.arrays:
+                new_array = np.empty(capacity)
+                new_array[:first] = self.arrays[column][:first]
+                self.arrays[column] = new_array
+        if (first < size):
+            aligned = align_streams(self.sensor_store.frame().iloc[first:size], self.weather_store.frame(), self.tolerance, self.direction)
+            for column in self.arrays:
+                self.arrays[column][first:size] = aligned[column].to_numpy()
+        self.seen = size
+        if (len(self.weather_store) > 0):
+            self.weather_last = self.weather_store.times()[-1]
+
+    def column(self, name):
+        return self.arrays[name][:self.seen]
+
+    def window(self, name, start, end):
+        times = self.sensor_store.times()[:self.seen]
+        first = int(np.searchsorted(times, np.datetime64(pd.Timestamp(start), "ns"), side = "left"))
+        last = int(np.searchsorted(times, np.datetime64(pd.Timestamp(end), "ns"), side = "right"))
+        return Accumulator.from_values(self.column(name)[first:last])
+
+''' ================================================================================================================== '''
+''' ============================================ PART 4: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.
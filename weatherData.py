@@ -2,7 +2,12 @@ import datetime             # Contains information about the date and time of ei
 from datetime import date   # Module in "datetime" that specifically accesses the date
 import sys                  # Allows the user to use command line arguments
 import requests             # Allows the user to get information from a url
-import time                 # Necessary for addressing requests.exceptions.ConnectionErrors
+import time                 # Necessary for addressing requests.exceptions.ConnectionErrors (and for keeping the time between lines steady)
+import signal               # Lets the program write the data it is holding before it is stopped
+from concurrent.futures import ThreadPoolExecutor, wait   # Lets several locations be fetched at once
+from sampleWriter import SampleWriter   # Writes the weather data to the data file in batches
+from fetchScheduler import FetchScheduler   # Decides when to ask WTTR for new weather data
+from stageProfiler import profiler, profile_option   # Times fetching and writing when run with "--profile" (see stageProfiler.py)
 
 ''' ================================================================================================================== '''
 ''' ==================================================== OVERVIEW ==================================================== '''
@@ -10,7 +15,11 @@ import time                 # Necessary for addressing requests.exceptions.Conne
 
 ''' This script solely collects weather data using WTTR. Since it kept timing 
 out, we thought it was a good idea to decouple the weather-data collection 
-from the sensor-data collection. '''
+from the sensor-data collection. 
+
+As of 10/18/2026, WTTR isn't asked for new data every "rest_time" seconds 
+anymore (see Part 3 and fetchScheduler.py), and weather data can be collected 
+for several locations at once, each written to its own data file. '''
 
 ''' ================================================================================================================== '''
 ''' ================================================ PART i: VARIABLES =============================================== '''
@@ -22,26 +31,53 @@ access in case they need to be changed. '''
 ''' ================================================================================================================== '''
 
 rest_time = 10                                           # This variable tells us how often we want to get weather data. 
-url = "http://wttr.in/Charlottesville?u&format=%h+%t+%p"   # This is the URL from which we're fetching data.
+max_rest_time = 900                                      # Longest time (in seconds) to go without asking WTTR for new data
+cache_time = 1800                                        # Weather data older than this many seconds isn't written (i.e. if WTTR can't be reached)
+server = "http://wttr.in"                                # This is the website from which we're fetching data...
+location = "Charlottesville"                             # ...for this location (unless others are given)...
+url = "{0}/{1}?u&format=%h+%t+%p"                        # ...using this URL (the server and location are put in place of {0} and {1}).
+max_fetchers = 4                                         # Most locations to fetch at the same time
+fetch_wait = 5                                           # Longest time (in seconds) to wait for new requests to come back before writing the lines
+flush_records = 10                                       # The weather data is written to the data file once this many lines are waiting...
+flush_seconds = 30                                       # ...or once the oldest has waited this many seconds (at most this many seconds of data can be lost if the program crashes)
+use_fsync = False                                        # If True, the data is pushed all the way to the disk every time it's written (safer if the power goes out, but slower)
+segment_length = None                                    # Set to "hour" or "day" to write each data file as a folder of hourly or daily segments instead (see segmentStore.py)
 
 ''' ================================================================================================================== '''
 ''' ========================================= PART 1: COMMAND-LINE ARGUMENTS ========================================= '''
 ''' ================================================================================================================== '''
 
 ''' Similar to sensorData.py, this section of the code lets you specify your 
-data file and makes sure that it's viable. '''
+data file and makes sure that it's viable.
+
+10/18/2026 UPDATE: Weather data can be collected for more than one location. 
+Each data file can be given its location before a ":" (i.e. "Richmond:
+weather_richmond.txt"); data files without one get "location." A different 
+server can be given at the end (i.e. "http://localhost:8000" to test with 
+weatherStub.py instead of the real WTTR). 
+
+10/18/2026 UPDATE: "--profile" can be given anywhere to time fetching the 
+weather data, turning it into lines, and writing them (see stageProfiler.py). 
+The summary is printed when the program exits. With "--profile=[metrics file]," 
+the times and counts of each pass (one every "rest_time" seconds) are also added 
+to [metrics file] as a line of JSON. '''
 
 ''' ================================================================================================================== '''
 
-try:
-    if (sys.argv[1].endswith(".txt")):
-        file1 = sys.argv[1]
-    else:
-        print("Use the following format: python weatherData.py [datafile].txt\n")
-        sys.exit(1)
-except IndexError:
-    print("Use the following format: python weatherData.py [datafile].txt\n")
+usage = "Use the following format: python weatherData.py [location:][datafile].txt [location:][datafile].txt ... [server (optional)] (the locations are optional)\n"
+profiling, metrics_file, arguments = profile_option(sys.argv[1:])
+if ((len(arguments) > 0) and (arguments[-1].startswith("http"))):
+    server = arguments.pop().rstrip("/")
+if (len(arguments) == 0):
+    print(usage)
     sys.exit(1)
+streams = []                                             # List of (location, data file)
+for argument in arguments:
+    if (argument.endswith(".txt") == False):
+        print(usage)
+        sys.exit(1)
+    stream_location, _, data_file = argument.rpartition(":")
+    streams.append((stream_location if (stream_location != "") else location, data_file))
 
 ''' ================================================================================================================== '''
 ''' ====================================== PART 2: FETCHING DATA FROM WEBSITES ======================================= '''
@@ -66,14 +102,20 @@ defines a prefix for which the adapter is to be used (any website with this
 prefix will use the adapter. This code was implemented 4/30/2024.
 
 UPDATE 5/3/2024: I added the retry line because my code timed out after about 
-three days, which is longer than before, but not optimal. ''' 
+three days, which is longer than before, but not optimal. 
+
+10/18/2026 UPDATE: Every location shares the session, so the adapter keeps up 
+to "max_fetchers" connections open to the server (instead of opening a new one 
+for every request), and the retry policy applies to every location's requests. 
+The adapter is now used for "https://" too. ''' 
 
 ''' ================================================================================================================== '''
 
 sess = requests.Session()
 retry = requests.packages.urllib3.util.retry.Retry(total = 5, backoff_factor = 0.1, status_forcelist = [500, 502, 503, 504])
-adapter = requests.adapters.HTTPAdapter(max_retries = retry)
+adapter = requests.adapters.HTTPAdapter(pool_connections = max_fetchers, pool_maxsize = max_fetchers, max_retries = retry)
 sess.mount("http://", adapter)
+sess.mount("https://", adapter)
 
 ''' ================================================================================================================== '''
 ''' ============================================ PART 3: DATA COLLECTION ============================================= '''
@@ -94,48 +136,84 @@ from being lost.
 
 UPDATE: As of 6/24/2024, WTTR apparently received over 1M requests in one day, 
 causing it to lose data storage. So, I implemented an if statement that will 
-cause the program to sleep for an hour to let it reset. '''
-
-''' ================================================================================================================== '''
-
+cause the program to sleep for an hour to let it reset.
+
+10/18/2026 UPDATE: The data file isn't opened and closed for every line 
+anymore. Instead, the lines are given to "writer" (see sampleWriter.py), which 
+writes them in batches of "flush_records" lines or after "flush_seconds" 
+seconds, whichever comes first. The program waits with "writer.wait" instead of 
+time.sleep so the lines are still written on time while it rests.
+
+10/18/2026 UPDATE: WTTR is now asked for new data by "scheduler" (see 
+fetchScheduler.py), which keeps the last answer and only asks again when the 
+data is likely to have changed (anywhere from every "rest_time" seconds to every 
+"max_rest_time" seconds, depending on how often it has been changing). A line 
+is still written every "rest_time" seconds using the kept answer. When WTTR says
+"Unknown location" or can't be reached, the scheduler waits before asking again 
+instead of the whole program sleeping for an hour, and the kept answer is 
+written until it's "cache_time" seconds old.
+
+10/18/2026 UPDATE: Every location has its own scheduler. The requests that are 
+due are handed to a pool of "max_fetchers" threads, and the program doesn't wait
+for them to come back (for more than "fetch_wait" seconds): every "rest_time" 
+seconds, a line is written for each location from whatever its scheduler has 
+kept. So adding locations (or a slow 
+answer from the server) doesn't stretch the time between lines. A location isn't
+asked again while its last request is still going. '''
+
+''' ================================================================================================================== '''
+
+signal.signal(signal.SIGTERM, signal.default_int_handler)   # Being stopped (i.e. with "kill") is handled like Ctrl-C, so the waiting lines are written
+if (profiling == True):
+    profiler.enable(metrics_file)
+if (segment_length is None):
+    writer = SampleWriter(flush_records, flush_seconds, use_fsync)
+else:
+    from segmentStore import SegmentWriter   # Writes the weather data into hourly or daily segments instead (only imported when "segment_length" is set)
+    writer = SegmentWriter(segment_length, flush_records, flush_seconds, use_fsync)
+schedulers = {}                                          # One scheduler for each location (locations can share a data file)
+for stream_location, data_file in streams:
+    if (stream_location not in schedulers):
+        schedulers[stream_location] = FetchScheduler(sess, url.format(server, stream_location), rest_time, max_rest_time, cache_time, name = stream_location)
+pool = ThreadPoolExecutor(max_workers = max_fetchers)
+fetching = {}                                            # Requests that are still going, by location
 while True:
     try:
+        tick = time.monotonic()
+        submitted = []
+        for stream_location in schedulers:
+            if (((stream_location not in fetching) or (fetching[stream_location].done() == True)) and (schedulers[stream_location].due() == True)):
+                fetching[stream_location] = pool.submit(schedulers[stream_location].refresh)
+                submitted.append(fetching[stream_location])
+        with profiler.stage("fetch"):                                                   # Only the time spent waiting for the requests (they're sent on the pool's threads)
+            wait(submitted, timeout = min(fetch_wait, rest_time))
+        profiler.count("requests sent", len(submitted))
         day = date.today()
         cur_time = datetime.datetime.now().strftime("%H:%M:%S")                          # Named "cur_time" for "current time" so it didn't conflict with time module
-        try:
-            res = sess.get(url)
-            converted_string = res.text.translate({ord(i): None for i in "%+FC\xb0mm"})   # Replaces all these delimiters with ""
-            if ("Unknown location" in converted_string):
-                print("WTTR had too many requests. Let's let it reset. Check back in an hour.")
-                time.sleep(3600)
-                print("Ready after an hour of rest.")
-                print("\n")
+        print(str(day) + " " + str(cur_time))
+        for stream_location, data_file in streams:
+            scheduler = schedulers[stream_location]
+            text = scheduler.cached()
+            if (text is None):
+                print("Weather ({0}): no data from the last {1} seconds. Nothing was written.".format(stream_location, cache_time))
                 continue
-            weather_data = open(file1, "a")
-            weather_data.write(str(day))
-            weather_data.write(" ")
-            weather_data.write(str(cur_time))
-            weather_data.write(" ")
-            weather_data.write(str(converted_string))
-            weather_data.write("\n")
-            weather_data.close()
-            print(str(day) + " " + str(cur_time))
-            print("Weather")
+            with profiler.stage("parse"):
+                converted_string = text.translate({ord(i): None for i in "%+FC\xb0mm"})   # Replaces all these delimiters with ""
+            writer.write(data_file, str(day) + " " + str(cur_time) + " " + str(converted_string) + "\n")
+            profiler.count("rows ingested")
+            print("Weather ({0}, {1} requests so far, asking every {2:.0f} seconds)".format(stream_location, scheduler.requests, scheduler.interval))
             print("Humidity (%), Temperature (\u00B0F), Precipitation (mm/3hr)")
             print(converted_string)
-            print("\n")
-        except requests.exceptions.ConnectionError:
-            print("Raising requests.exceptions.ConnectionError")
-            time.sleep(2 * rest_time)
-            print("Ready after {0} seconds of rest.".format(2 * rest_time))
-            print("\n")
-            continue
+        print("\n")
+        writer.wait(max(tick + rest_time - time.monotonic(), 0))                         # Inside the try so the waiting lines are written if the program is stopped
+        profiler.end_cycle()
     except KeyboardInterrupt:
+        writer.close()
+        pool.shutdown(wait = False, cancel_futures = True)
         print("\nKeyboardInterrupt")
         sys.exit(1)
         print("Done!")
         sys.exit(1)
-    time.sleep(rest_time)
         
 ''' ================================================================================================================== '''
 ''' ============================================ PART 4: ACKNOWLEDGEMENTS ============================================ '''
@@ -0,0 +1,105 @@
+import sys                  # Allows the user to use command line arguments
+import time                 # Used for deciding when the made-up weather changes
+import zlib                 # Used for giving every location its own made-up weather
+import random               # Used for making up the weather
+import hashlib              # Used for making the ETag header
+import threading            # Used for counting the requests from several connections at once
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer   # Used for running the server
+
+''' ================================================================================================================== '''
+''' ==================================================== OVERVIEW ==================================================== '''
+''' ================================================================================================================== '''
+
+''' This script is a stand-in for WTTR that runs on this computer, so
+weatherData.py can be tested without sending requests to the real WTTR (and
+without internet). It answers requests like "http://localhost:8000/[location]"
+with made-up weather in the same format WTTR uses for weatherData.py (i.e.
+"63% +45°F 0.0mm"). Every location has its own weather, and it changes every
+"change_time" seconds, so how often weatherData.py notices changes can be
+checked. It sends an ETag header and answers "304 Not Modified" when the
+weather hasn't changed since the ETag was sent. Every request is printed with a
+running count, and after "limit" requests (if given), it answers "Unknown
+location" like WTTR does when it gets too many requests. This was implemented
+10/18/2026.
+
+It's used with the following command:
+
+python weatherStub.py [port] [seconds between changes] [number of requests before "Unknown location" (optional)]
+
+weatherData.py is then pointed at it by giving the server after the data files
+(weatherData.py adds the location and the rest of the URL itself):
+
+python weatherData.py Charlottesville:[file].txt http://localhost:[port] '''
+
+''' ================================================================================================================== '''
+''' ================================================ PART 1: THE SERVER ============================================== '''
+''' ================================================================================================================== '''
+
+change_time = 300      # Number of seconds between changes of the made-up weather
+limit = None           # Number of requests before answering "Unknown location" (None for never)
+count = 0              # Number of requests so far
+count_lock = threading.Lock()
+
+# This function makes up the weather for a location during the current "change_time" period.
+def weather(location):
+    period = int(time.time() // change_time)
+    generator = random.Random(zlib.crc32(location.encode()) + period)
+    return "{0}% {1:+d}°F {2:.1f}mm".format(generator.randint(20, 95), generator.randint(-10, 100), generator.choice([0.0, 0.0, 0.0, 0.1, 0.4, 1.2]))
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"                                      # Lets clients keep the connection open between requests
+
+    def do_GET(self):
+        global count
+        with count_lock:
+            count += 1
+            number = count
+        location = self.path.split("?")[0].strip("/")
+        body = weather(location)
+        if ((limit is not None) and (number > limit)):
+            body = "Unknown location; please try ~{0}".format(location)
+        etag = '"{0}"'.format(hashlib.md5(body.encode()).hexdigest())
+        if (self.headers.get("If-None-Match") == etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        data = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        print("Request {0}: {1} ({2})".format(count, self.path, args[1] if (len(args) > 1) else ""))
+
+''' ================================================================================================================== '''
+''' =========================================== PART 2: COMMAND-LINE USE ============================================= '''
+''' ================================================================================================================== '''
+
+if __name__ == '__main__':
+    usage = "Use the following format: python weatherStub.py [port] [seconds between changes] [number of requests before \"Unknown location\" (optional)]\n"
+    try:
+        port = int(sys.argv[1])
+        change_time = float(sys.argv[2])
+        if (len(sys.argv) > 3):
+            limit = int(sys.argv[3])
+    except (IndexError, ValueError):
+        print(usage)
+        sys.exit(1)
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    print("Serving made-up weather at http://127.0.0.1:{0}/[location]".format(port))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n{0} request(s) in total".format(count))
+        sys.exit(1)
+
+''' ================================================================================================================== '''
+''' ============================================ PART 3: ACKNOWLEDGEMENTS ============================================ '''
+''' ================================================================================================================== '''
+
+# Code written by Christian Guinto-Brody for Professor Chris Neu's research group.